@@ -0,0 +1,850 @@
+"""
+YouTube Diet 분석 파이프라인 (Streamlit 없이 import 가능)
+텍스트 정제 → 이미지 OCR → 벡터 점수 → 상황 가중치 → 다양성 점수 → 진단 → GPT 처방
+
+    from analysis import analyze
+    result = analyze(titles=[...], context={"watch_time": "잠들기 전"}, client=OpenAI(max_retries=0))
+
+Streamlit 앱(app_final_v2.py)은 STEP 2/3에서 아래 함수들을 단계별로 호출하고,
+batch_cli.py는 analyze()로 JSONL 피드를 한꺼번에 처리합니다.
+"""
+import base64
+import io
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+from PIL import Image
+
+from embedding_cache import normalize_title
+from embeddings import (embed_texts, embed_texts_concurrent, as_backend,
+                        OpenAIEmbeddingBackend, HashingEmbeddingBackend)
+from anchors import load_or_build_anchors, load_or_build_exemplars
+from scoring import NUTRIENTS, prepare_anchor_matrix, classify_vectors, classify_vectors_knn, accumulate
+from keywords import keyword_hits, dominant_nutrient, keyword_boosts, keyword_boost_weights
+from image_prep import decode_screenshot, encode_screenshot, prepare_screenshot, read_image_bytes
+from paste_parser import MIN_CONFIDENCE as PASTE_MIN_CONFIDENCE, classify_line, parse_pasted_text, to_title_strings
+from screenshot_dedupe import content_digest, dedupe_screenshots
+from title_dedupe import collapse_titles
+from youtube_search import search_videos
+import tracing
+
+CHAT_MODEL = "gpt-4o"
+CHAT_RETRIES = 2            # 클라이언트는 SDK 재시도 없이(max_retries=0) 만들고, 요청 단위로 여기서만 재시도
+# 긴 붙여넣기 GPT 정제: 줄 단위로 겹치게 나눠서 동시에 요청 (자르지 않음)
+CLEAN_CHUNK_CHARS = 4000
+CLEAN_CHUNK_OVERLAP_LINES = 8
+CLEAN_CONCURRENCY = 8
+CLEAN_MAX_TOKENS = 4000
+CLEAN_MAX_SPLIT_DEPTH = 6   # 응답이 계속 잘려도 이 깊이 이상은 나누지 않고 원래 줄을 그대로 씀
+# 스크린샷 OCR: 묶음(기본 1장)마다 따로 요청해서 동시에 보냄
+OCR_GROUP_SIZE = 1
+OCR_CONCURRENCY = 10
+OCR_RETRIES = CHAT_RETRIES  # 묶음 단위 재시도
+OCR_MAX_TOKENS = 1500       # 이미지 1장당 응답 토큰
+LOCAL_OCR_MIN_CONFIDENCE = 0.6   # 로컬 OCR 결과를 그대로 쓰는 최소 신뢰도 (낮으면 vision)
+
+TEXT_CLEANING_PROMPT = """
+You are a YouTube Page Text Cleaner.
+The user has pasted the raw text dump from YouTube Home/History.
+
+Task:
+1. Extract ONLY the video titles. Remove 'Views', 'Time', 'Channel Name', 'Menu items'.
+2. **CRITICAL:** Identify the 'Shorts' section. If a title belongs to the Shorts section (usually appears after the word 'Shorts' or has no duration/timestamp), **APPEND '[Shorts]' to the end of the title.**
+(Example: "Funny Cat Video [Shorts]", "How to cook steak")
+
+Return the titles as a simple list separated by commas.
+"""
+
+IMAGE_EXTRACT_PROMPT = """
+You are an advanced AI OCR assistant specialized in YouTube UI analysis.
+
+Task:
+1. Read the screen screenshots and extract ALL video titles accurately.
+2. Do NOT pick only keywords. Extract the FULL title sentences.
+3. Ignore UI texts like 'Home', 'Shorts', 'Subscriptions', 'Views', 'Time'.
+
+CRITICAL - Shorts Detection:
+- If a video is under a header explicitly named "Shorts",
+- OR if the thumbnail has a vertical aspect ratio (9:16) AND has the red "Shorts" logo,
+- THEN append "[Shorts]" to the end of the title.
+- OTHERWISE, do NOT append "[Shorts]".
+
+Output Format:
+Return a simple list of strings separated by commas.
+Example: "How to cook steak, Funny Cat [Shorts], Global Economy News, ..."
+"""
+
+NUTRIENT_MAP = {
+    "Carbs": "Fun/Entertainment (Comedy, Variety)",
+    "Protein": "Knowledge/Learning (Lecture, News)",
+    "Fats": "Rest/Healing (ASMR, Music)",
+    "Vitamins": "Diversity/Art (Travel, Culture)"
+}
+
+
+def encode_image(image_file):
+    return base64.b64encode(read_image_bytes(image_file)).decode('utf-8')
+
+
+def get_embedding(text, client):
+    text = text.replace("\n", " ")
+    return as_backend(client).embed([text])[0]
+
+
+def cosine_similarity(a, b):
+    return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+
+
+def filter_invalid_titles(titles):
+    invalid_patterns = [
+        "YouTube", "YouTube Music", "YouTube Kids", "YouTube 스튜디오",
+        "YouTube Premium", "YouTube TV", "YouTube Shorts",
+        "홈", "Shorts", "구독", "나중에 볼 동영상", "좋아요 표시한 동영상",
+        "재생목록", "오프라인 저장", "다운로드", "구매 항목", "영화",
+        "실시간", "게임", "스포츠", "학습", "팟캐스트",
+        "설정", "신고 기록", "고객센터", "의견 보내기", "정보",
+        "보도자료", "저작권", "문의하기", "크리에이터", "광고", "개발자",
+        "약관", "개인정보처리방침", "정책 및 안전", "YouTube 작동 원리",
+        "새로운 기능 테스트", "더보기", "간략히",
+        "구독", "구독중", "알림", "모두", "맞춤설정", "없음",
+        "좋아요", "싫어요", "공유", "오프라인 저장", "클립", "저장",
+        "신고", "스크립트 표시", "댓글",
+        "조회수", "업로드", "실시간 스트리밍", "최근 업로드",
+        "인기 업로드", "처음부터 재생", "믹스", "관련 동영상",
+        "탐색", "라이브러리", "기록", "내 동영상", "시청 기록",
+        "B tv", "tv"
+    ]
+    
+    filtered_titles = []
+    for title in titles:
+        if len(title) < 5 or len(title) > 200:
+            continue
+        
+        is_invalid = False
+        title_lower = title.lower()
+        for pattern in invalid_patterns:
+            if pattern.lower() in title_lower and len(title) < 20:
+                is_invalid = True
+                break
+        
+        if 'http' in title_lower or 'www.' in title_lower:
+            is_invalid = True
+            
+        if title.strip().isdigit():
+            is_invalid = True
+            
+        if not is_invalid:
+            filtered_titles.append(title)
+    
+    return filtered_titles
+
+
+def apply_context_weights(base_scores, user_context):
+    weighted_scores = base_scores.copy()
+    
+    # 1. 시청 시간대별 가중치 (기존 유지)
+    watch_time_weights = {
+        "잠들기 전": {"Carbs": 0.9, "Protein": 0.8, "Fats": 1.3, "Vitamins": 1.0},
+        "식사하면서": {"Carbs": 1.3, "Protein": 0.7, "Fats": 0.9, "Vitamins": 1.1}, # 밥친구는 보통 예능
+        "이동 중": {"Carbs": 1.2, "Protein": 1.0, "Fats": 0.8, "Vitamins": 1.0},
+        "일/공부 중": {"Carbs": 0.6, "Protein": 1.1, "Fats": 1.3, "Vitamins": 1.0} # 노동요(Fats)
+    }
+    
+    watch_time = user_context.get('watch_time', "식사하면서")
+    time_weight = watch_time_weights.get(watch_time, {})
+    
+    for nutrient in weighted_scores:
+        weighted_scores[nutrient] *= time_weight.get(nutrient, 1.0)
+    
+    # 2. [수정] 쇼츠 과다 시청 여부 (shorts_heavy) 반영
+    # 쇼츠를 많이 본다고 답했으면, Carbs(재미) 성향이 높다고 판단하여 가중치 부여
+    if user_context.get('shorts_heavy', False):
+        weighted_scores['Carbs'] *= 1.2
+        weighted_scores['Protein'] *= 0.9  # 숏폼러들은 긴 호흡의 학습을 힘들어하는 경향 보정
+
+    # 3. [수정] 프리미엄 유저 (is_premium) 반영
+    # 프리미엄 유저는 '백그라운드 재생'으로 음악(Fats) 점수가 과하게 잡혔을 수 있음.
+    # 이미 앞단(벡터계산)에서 보정했지만, 여기서 한 번 더 밸런스를 잡아줌.
+    if user_context.get('is_premium', False):
+        # 음악 청취로 인한 Fats 거품을 살짝 걷어냄 (정상화)
+        weighted_scores['Fats'] *= 0.9
+    
+    # 4. 백분율 재계산
+    total = sum(weighted_scores.values())
+    if total > 0:
+        for nutrient in weighted_scores:
+            weighted_scores[nutrient] = int((weighted_scores[nutrient] / total) * 100)
+            
+    return weighted_scores
+
+
+def calculate_entropy_score(scores):
+    """
+    [수정된 로직] 
+    기존 엔트로피 방식 대신 '이상적인 비율(25%)과의 거리'를 계산합니다.
+    편식이 심할수록 점수가 급격히 낮아집니다.
+    """
+    # 1. 값들을 리스트로 변환
+    values = list(scores.values())
+    total = sum(values)
+    
+    if total == 0: return 0
+    
+    # 2. 백분율로 정규화 (합을 100%로 맞춤)
+    percents = [(v / total) * 100 for v in values]
+    
+    # 3. 이상적인 비율 (4개 항목이니 각각 25%)
+    ideal = 25.0
+    
+    # 4. 편차(Distance) 계산: |내 점수 - 25| 의 합계
+    # 예: 53%라면 |53 - 25| = 28만큼 벌점
+    diffs = [abs(p - ideal) for p in percents]
+    total_diff = sum(diffs)
+    
+    # 5. 점수 환산
+    # 이론상 최악의 경우(100, 0, 0, 0)일 때 편차 합은 150입니다.
+    # (|75| + |-25| + |-25| + |-25| = 150)
+    # 따라서 150을 기준으로 감점합니다.
+    
+    penalty = (total_diff / 150.0) * 100
+    final_score = 100 - penalty
+    
+    return int(max(0, final_score))
+
+
+def diagnose_pattern(weighted_scores, user_context):
+    # 가장 높은 점수의 영양소 찾기
+    max_nutrient = max(weighted_scores, key=weighted_scores.get)
+    max_value = weighted_scores[max_nutrient]
+    
+    # 진단명 사전
+    diagnoses = {
+        "Carbs": {
+            "high": "숏폼 도파민 중독증", 
+            "medium": "알고리즘 표류 증후군", 
+            "context": {
+                "잠들기 전": "야간 자극 과다 증후군", 
+                "식사하면서": "먹방 의존증"
+            }
+        },
+        "Protein": {
+            "high": "정보 과부하 증후군", 
+            "medium": "학습 강박증", 
+            "context": {
+                "일/공부 중": "워커홀릭 정보 섭취증"
+            }
+        },
+        "Fats": {
+            "high": "디지털 수면제 의존증", 
+            "medium": "현실 도피 증후군", 
+            "context": {
+                "잠들기 전": "수면 유도 과의존증"
+            }
+        },
+        "Vitamins": {
+            "high": "정보 편식 개선 중", 
+            "medium": "균형 잡힌 디지털 식단", 
+            "context": {}
+        }
+    }
+    
+    watch_time = user_context.get('watch_time')
+    
+    # 점수 레벨 판별
+    if max_value > 55: level = "high"
+    elif max_value > 35: level = "medium"
+    else: return "디지털 영양 불균형"
+    
+    # [수정됨] 숏폼 과다 시청자 -> '만성...' 대신 기존 '숏폼 도파민 중독증'으로 이름 통합
+    # (쇼츠 많이 봄 체크 시, 점수 상관없이 이 진단명 우선 적용)
+    if max_nutrient == "Carbs" and user_context.get('shorts_heavy', False):
+        return "숏폼 도파민 중독증"
+
+    # 컨텍스트 기반 특수 진단 (시간대별 습관 반영)
+    # 예: 잠들기 전 + 재미 위주 = 야간 자극 과다 증후군
+    if watch_time in diagnoses[max_nutrient].get("context", {}):
+        return diagnoses[max_nutrient]["context"][watch_time]
+        
+    # 기본 진단 반환 (점수 레벨에 따름)
+    return diagnoses[max_nutrient].get(level, "디지털 편식증")
+
+
+def generate_personalized_recommendations(weighted_scores, user_context):
+    recommendations = []
+
+    if not weighted_scores: return []
+    
+    min_nutrient = min(weighted_scores, key=weighted_scores.get)
+    max_nutrient = max(weighted_scores, key=weighted_scores.get)
+    
+    nutrient_korean = {"Carbs": "재미/오락", "Protein": "지식/학습", "Fats": "휴식/힐링", "Vitamins": "다양성/시야확장"}
+    nutrient_content = {
+        "Carbs": ["코미디 쇼", "게임 방송", "예능 프로그램", "챌린지 영상"],
+        "Protein": ["온라인 강의", "TED 강연", "다큐멘터리", "전문가 인터뷰"],
+        "Fats": ["ASMR", "명상 가이드", "자연 영상", "수면 음악"],
+        "Vitamins": ["외국 문화", "예술 작품", "철학 강의", "새로운 취미"]
+    }
+    
+    if weighted_scores[min_nutrient] < 15:
+        recommendations.append(f"💊 {nutrient_korean[min_nutrient]} 콘텐츠가 매우 부족합니다. {', '.join(nutrient_content[min_nutrient][:2])} 같은 영상을 추가해보세요.")
+    if weighted_scores[max_nutrient] > 50:
+        recommendations.append(f"⚠️ {nutrient_korean[max_nutrient]} 콘텐츠에 과도하게 편중되어 있습니다.")
+    
+    watch_time = user_context.get('watch_time')
+    if watch_time == "잠들기 전" and weighted_scores["Carbs"] > 30:
+        recommendations.append("🌙 잠들기 전 자극적인 콘텐츠는 수면을 방해할 수 있습니다.")
+    
+    try:
+        daily_val = str(user_context.get('daily_hours', 2))
+        import re
+        nums = re.findall(r'\d+', daily_val)
+        daily_hours = int(nums[0]) if nums else 0
+        
+        if daily_hours >= 4:
+            recommendations.append(f"⏰ 하루 {daily_hours}시간 시청은 눈 건강에 해롭습니다. 디지털 디톡스가 필요합니다.")
+    except:
+        pass
+
+    if not recommendations:
+        recommendations.append("✨")
+    
+    return recommendations[:3]
+
+
+# --- [헬퍼 1] 쇼츠 여부 판별 ---
+def is_likely_shorts(title):
+    """제목에 #Shorts가 있거나, 짐작가는 패턴이 있으면 True"""
+    t = title.lower()
+    if "#shorts" in t or "#쇼츠" in t or "shorts" in t:
+        return True
+    return False
+
+
+# --- [헬퍼 2] 룰 기반 점수 보정 (치트키) ---
+def apply_keyword_boost(title, is_premium=False):
+    """
+    AI가 헷갈려하는 영상들을 강제로 올바른 영양소로 분류합니다.
+    키워드 표(keywords.py)를 한 번에 훑어서 적중 수가 가장 많은 영양소를 고릅니다. (동점이면 기존 우선순위)
+    """
+    forced_cat = dominant_nutrient(keyword_hits(title))
+    if forced_cat is None:
+        return None, 1.0
+    return forced_cat, keyword_boosts(is_premium)[forced_cat]
+
+
+# --- [메인] 벡터 점수 계산 (수정됨: user_context 추가) ---
+def calculate_vector_scores(user_texts, client, user_context=None, cache=None, anchors=None, exemplars=None,
+                            make_async_client=None, on_progress=None, counts=None):
+
+    # 사용자 설정 가져오기
+    is_premium = False
+    if user_context:
+        is_premium = user_context.get('is_premium', False)
+    
+    # 1. 기준점 임베딩 (미리 만들어 둔 아티팩트 사용, 4×D 정규화 행렬)
+    #    - anchors: 기준 문장 또는 예시 제목 중심점 → nearest-centroid
+    #    - exemplars: {"matrix", "labels"} 를 주면 예시 제목 k-NN 투표로 분류
+    anchor_matrix = anchors
+    if anchor_matrix is None and exemplars is None:
+        anchor_matrix = prepare_anchor_matrix(*load_or_build_anchors(client))
+
+    # counts: 제목별로 피드에 나온 횟수 (merge_title_counts에서 거의 같은 제목을 합친 결과), 없으면 1
+    pairs = [(t, c) for t, c in zip(user_texts, counts or [1] * len(user_texts)) if t.strip()]
+    texts = [t for t, _ in pairs]
+
+    # 2. 텍스트 분석
+    # [A] 쇼츠 디버프 × 나온 횟수
+    weights = np.array([(0.4 if is_likely_shorts(t) else 1.0) * c for t, c in pairs]).reshape(len(pairs))
+
+    # [B] 키워드 룰 (is_premium 정보 전달!) → 제목별 영양소 부스트 (N×4, 여러 영양소가 섞이면 적중 비율대로 나눔)
+    boosts = np.array([keyword_boost_weights(t, is_premium) for t in texts]).reshape(len(texts), len(NUTRIENTS))
+    is_forced = boosts.sum(axis=1) > 0
+
+    scores = (boosts[is_forced] * weights[is_forced, None]).sum(axis=0)
+    tracing.current_span().set("keyword_matched", int(is_forced.sum()))
+
+    # [C] AI 벡터 계산 (남은 제목을 batch로 묶어서 한 번에 요청, 캐시에 있으면 생략)
+    unclassified = np.flatnonzero(~is_forced)
+    # make_async_client가 있으면 batch들을 동시에 보내는 비동기 경로 사용
+    unclassified_texts = [texts[i] for i in unclassified]
+    if make_async_client:
+        # 동기 경로와 같은 모델명 → 캐시 키와 기준 중심점이 항상 같은 모델에서 나옴
+        title_vectors = embed_texts_concurrent(unclassified_texts, make_async_client, model=as_backend(client).model,
+                                               cache=cache, on_progress=on_progress)
+    else:
+        title_vectors = embed_texts(unclassified_texts, client, cache=cache, on_progress=on_progress)
+
+    # 임베딩 실패한 batch의 제목은 건너뜀
+    rows = [i for i in unclassified if normalize_title(texts[i]) in title_vectors]
+    if rows:
+        vectors = [title_vectors[normalize_title(texts[i])] for i in rows]
+        if exemplars is not None:
+            best_cat, valid = classify_vectors_knn(vectors, exemplars["matrix"], exemplars["labels"])
+        else:
+            best_cat, valid = classify_vectors(vectors, anchor_matrix)
+        scores += accumulate(best_cat[valid], weights[rows][valid])
+
+    # 정규화
+    total = scores.sum()
+    if total == 0: return {k: 0 for k in NUTRIENTS}
+    return {k: int((v / total) * 100) for k, v in zip(NUTRIENTS, scores)}
+
+
+# --- 입력 정제 ---
+def parse_title_list(content):
+    """GPT가 콤마로 나열한 제목 문자열 → 제목 리스트 ('[Shorts]'는 'Shorts'로 남김)"""
+    return [
+        t.strip() for t in content.replace("[", "").replace("]", "").replace('"', '').split(',')
+        if len(t.strip()) > 1
+    ]
+
+
+def clean_pasted_text(user_text, client, min_confidence=PASTE_MIN_CONFIDENCE):
+    """
+    붙여넣은 유튜브 화면 텍스트에서 제목만 추출 → (제목 리스트, 제목을 콤마로 이은 정제 결과)
+    화면 구조(재생 시간/조회수/날짜/Shorts 헤더)를 로컬에서 먼저 읽고, 신뢰도가 낮을 때만 GPT로 정제합니다.
+    GPT 정제는 긴 붙여넣기를 겹치는 조각으로 나눠 동시에 요청하므로, 길이와 상관없이 잘리는 부분이 없습니다.
+    """
+    with tracing.span("text.clean", payload_bytes=len(user_text.encode("utf-8"))) as span:
+        parsed = parse_pasted_text(user_text)
+        span.set("parser_confidence", round(parsed["confidence"], 3))
+        if parsed["confidence"] >= min_confidence:
+            titles = to_title_strings(parsed)
+            span.set("source", "local")
+            span.set("titles", len(titles))
+            return titles, ", ".join(titles)
+
+        chunks = split_paste_chunks(user_text)
+        span.set("source", "gpt")
+        span.set("chunks", len(chunks))
+        with ThreadPoolExecutor(max_workers=min(CLEAN_CONCURRENCY, len(chunks) or 1)) as pool:
+            chunk_titles = list(pool.map(tracing.bind(lambda chunk: clean_text_chunk(chunk, client)), chunks))
+        titles = merge_chunk_titles(chunk_titles)
+        span.set("titles", len(titles))
+        return titles, ", ".join(titles)
+
+
+def split_paste_chunks(text, max_chars=CLEAN_CHUNK_CHARS, overlap_lines=CLEAN_CHUNK_OVERLAP_LINES):
+    """
+    줄 경계에서 max_chars 안팎으로 나누고, 앞 조각의 마지막 overlap_lines 줄을 다음 조각 앞에 다시 넣습니다.
+    조각이 Shorts 선반 중간에서 시작하면 맨 앞에 'Shorts' 줄을 붙여서 GPT가 쇼츠 구간임을 알 수 있게 합니다.
+    """
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return []
+
+    # 각 줄 시점에 Shorts 선반 안인지 (헤더 이후 ~ 다음 재생 시간 줄 이전)
+    in_shorts, state = [], False
+    for line in lines:
+        kind = classify_line(" ".join(line.split()))
+        if kind == "shorts":
+            state = True
+        elif kind == "duration":
+            state = False
+        in_shorts.append(state)
+
+    chunks = []
+    start = 0
+    while start < len(lines):
+        end, size = start, 0
+        while end < len(lines) and (end == start or size + len(lines[end]) + 1 <= max_chars):
+            size += len(lines[end]) + 1
+            end += 1
+        prefix = ["Shorts"] if start > 0 and in_shorts[start] else []
+        chunks.append("\n".join(prefix + lines[start:end]))
+        if end >= len(lines):
+            break
+        start = max(start + 1, end - overlap_lines)
+    return chunks
+
+
+def create_chat_completion(client, span, retries=CHAT_RETRIES, **request):
+    """chat.completions.create를 실패 시 retries번까지 다시 요청 (재시도 횟수는 span의 retries 속성)"""
+    for attempt in range(retries + 1):
+        try:
+            return client.chat.completions.create(**request)
+        except Exception:
+            if attempt == retries:
+                raise
+            span.add("retries")
+            time.sleep(0.5 * (2 ** attempt))
+
+
+def clean_text_chunk(chunk, client, max_tokens=CLEAN_MAX_TOKENS, depth=0):
+    """
+    조각 하나를 GPT로 정제. 응답이 길이 제한에 걸려 잘리면 조각을 반으로 나눠 다시 정제합니다. (제목 누락 방지)
+    나눈 두 조각은 항상 원래 조각보다 줄 수가 적고, CLEAN_MAX_SPLIT_DEPTH까지 나눠도 잘리면 원래 줄을 그대로 반환합니다.
+    """
+    with tracing.span("text.clean_chunk", tracing.SPAN_KIND_CLIENT, **{
+            "gen_ai.request.model": CHAT_MODEL, "payload_bytes": len(chunk.encode("utf-8")), "retries": 0}) as span:
+        response = create_chat_completion(
+            client, span,
+            model=CHAT_MODEL,
+            messages=[
+                {"role": "system", "content": TEXT_CLEANING_PROMPT},
+                {"role": "user", "content": chunk}
+            ],
+            max_tokens=max_tokens
+        )
+        span.record_usage(getattr(response, "usage", None))
+        choice = response.choices[0]
+        lines = chunk.splitlines()
+        if getattr(choice, "finish_reason", None) == "length" and len(lines) > 1:
+            if depth >= CLEAN_MAX_SPLIT_DEPTH:
+                span.set("split_limit", True)
+                return [line.strip() for line in lines if len(line.strip()) > 1 and line.strip() != "Shorts"]
+            span.set("split", True)
+            middle = len(lines) // 2
+            overlap = min(CLEAN_CHUNK_OVERLAP_LINES, middle // 2)   # overlap < middle → 뒤쪽 반은 원래보다 짧음
+            second = lines[middle - overlap:]
+            if lines[0] == "Shorts" and len(second) + 1 < len(lines):
+                second = lines[:1] + second   # 'Shorts' 헤더를 다시 붙여도 원래 조각보다 짧을 때만
+            halves = ["\n".join(lines[:middle]), "\n".join(second)]
+            return merge_chunk_titles([clean_text_chunk(half, client, max_tokens, depth + 1) for half in halves])
+        titles = parse_title_list(choice.message.content)
+        span.set("titles", len(titles))
+        return titles
+
+
+def merge_chunk_titles(chunk_titles):
+    """조각별 제목을 순서대로 합치고, 겹친 구간에서 두 번 나온 제목은 처음 것만 남김 ('Shorts' 표시 유무는 무시)"""
+    merged = {}
+    for titles in chunk_titles:
+        for title in titles:
+            key = normalize_title(title).lower()
+            key = key[:-len(" shorts")] if key.endswith(" shorts") else key
+            merged.setdefault(key, title)
+    return list(merged.values())
+
+
+def image_to_payload(image, crop_chrome=False):
+    """
+    파일 경로 / bytes / 업로드 파일 객체 → vision 요청용 image_url 항목
+    vision 모델이 쓰는 해상도로 줄이고 알맞은 형식으로 다시 인코딩합니다. (읽을 수 없거나 너무 크면 ValueError)
+    """
+    prepared = prepare_screenshot(read_image_bytes(image), crop_chrome=crop_chrome)
+    b64 = base64.b64encode(prepared["data"]).decode('utf-8')
+    return {"type": "image_url", "image_url": {"url": f"data:{prepared['mime']};base64,{b64}"}}
+
+
+def screenshots_to_payload(images, crop_chrome=False):
+    """
+    스크린샷 여러 장 → (image_url 항목 리스트, {"duplicates", "trimmed_rows"})
+    같은 화면은 한 장만 남기고, 스크롤하며 찍어 앞 장과 겹치는 위쪽은 잘라낸 뒤 vision 해상도로 인코딩합니다.
+    읽을 수 없거나 너무 큰 이미지가 있으면 파일 이름(없으면 순번)을 붙여 ValueError
+    """
+    with tracing.span("images.prepare", images=len(images)) as span:
+        payload, report = _screenshots_to_payload(images, crop_chrome)
+        span.set("payload_bytes", sum(len(item["image_url"]["url"]) for item in payload))
+        span.set("duplicates", report["duplicates"])
+        span.set("trimmed_rows", report["trimmed_rows"])
+        return payload, report
+
+
+def _screenshots_to_payload(images, crop_chrome):
+    decoded = []
+    for i, image in enumerate(images):
+        try:
+            raw = read_image_bytes(image)
+            decoded.append((decode_screenshot(raw, crop_chrome=crop_chrome), len(raw)))
+        except ValueError as e:
+            name = getattr(image, "name", None) or (image if isinstance(image, str) else f"{i + 1}번째 이미지")
+            raise ValueError(f"{name}: {e}") from e
+
+    kept, report = dedupe_screenshots([img for img, _ in decoded])
+    payload = []
+    for item in kept:
+        prepared = encode_screenshot(item["image"], decoded[item["index"]][1])
+        b64 = base64.b64encode(prepared["data"]).decode('utf-8')
+        payload.append({"type": "image_url", "image_url": {"url": f"data:{prepared['mime']};base64,{b64}"}})
+    return payload, report
+
+
+def ocr_image_group(group, client, retries=OCR_RETRIES):
+    """스크린샷 묶음 하나를 요청 (실패하면 이 묶음만 재시도, 응답이 잘리면 한 장씩 나눠서 다시 요청)"""
+    with tracing.span("ocr.vision_group", tracing.SPAN_KIND_CLIENT, **{
+            "gen_ai.request.model": CHAT_MODEL, "images": len(group),
+            "payload_bytes": sum(len(item["image_url"]["url"]) for item in group), "retries": 0}) as span:
+        response = create_chat_completion(
+            client, span, retries,
+            model=CHAT_MODEL,
+            messages=[
+                {"role": "system", "content": "You are an AI that extracts text from UI screenshots."},
+                {"role": "user", "content": list(group) + [{"type": "text", "text": IMAGE_EXTRACT_PROMPT}]}
+            ],
+            temperature=0.0,
+            max_tokens=OCR_MAX_TOKENS * len(group)
+        )
+        span.record_usage(getattr(response, "usage", None))
+        choice = response.choices[0]
+        if getattr(choice, "finish_reason", None) == "length" and len(group) > 1:
+            span.set("split", True)
+            return merge_chunk_titles([ocr_image_group([image], client, retries) for image in group])
+        titles = parse_title_list(choice.message.content)
+        span.set("titles", len(titles))
+        return titles
+
+
+def payload_bytes(item):
+    """image_url 항목(data URI) → 이미지 bytes"""
+    return base64.b64decode(item["image_url"]["url"].split(",", 1)[1])
+
+
+def payload_digest(item):
+    """image_url 항목 → 실제로 OCR할 이미지의 내용 해시 (제목 캐시 키). 읽을 수 없으면 None (캐시 없이 그대로 요청)"""
+    try:
+        return content_digest(Image.open(io.BytesIO(payload_bytes(item))))
+    except Exception:
+        return None
+
+
+def extract_titles_from_images(image_payload, client, group_size=OCR_GROUP_SIZE, concurrency=OCR_CONCURRENCY,
+                               local_ocr=None, min_confidence=LOCAL_OCR_MIN_CONFIDENCE, on_progress=None,
+                               title_cache=None):
+    """
+    스크린샷(image_url 항목 리스트)에서 영상 제목 추출.
+    title_cache(screenshot_dedupe.ScreenshotTitleCache)에 같은 화면이 있으면 그 제목을 그대로 씁니다.
+    local_ocr(ocr.OcrBackend)가 있으면 먼저 로컬에서 읽고, 신뢰도가 min_confidence보다 낮은 스크린샷만 vision으로 보냅니다.
+    vision은 group_size장씩 따로 요청해서 동시에 보내고, 업로드 순서대로 합친 뒤 중복을 제거합니다.
+    일부 묶음만 실패하면 나머지 결과로 진행하고, 전부 실패하면 예외를 올립니다.
+    on_progress(처리된 장 수, 전체 장 수, 실패한 장 수)는 호출한 스레드에서 호출됩니다.
+    """
+    if not image_payload:
+        return []
+    with tracing.span("ocr.extract_titles", images=len(image_payload),
+                      payload_bytes=sum(len(item["image_url"]["url"]) for item in image_payload)) as span:
+        total = len(image_payload)
+        results = [None] * total   # 스크린샷별 제목 리스트 (여러 장 묶음은 첫 장 자리에 묶음 전체 제목)
+        done = failed = 0
+        grouped = set()            # 묶음 결과가 들어 있는 자리 → 한 장의 제목이 아니므로 캐시하지 않음
+
+        hashes = [None] * total
+        if title_cache is not None:
+            hashes = [payload_digest(item) for item in image_payload]
+            for i, digest in enumerate(hashes):
+                results[i] = title_cache.get(digest) if digest is not None else None
+                done += results[i] is not None
+        cached = done
+
+        pending = [i for i in range(total) if results[i] is None]
+        if local_ocr is not None and pending:
+            try:
+                readings = local_ocr.read_many([payload_bytes(image_payload[i]) for i in pending])
+            except Exception:
+                readings = [None] * len(pending)   # 로컬 엔진 장애 → 전부 vision
+            for i, reading in zip(pending, readings):
+                if reading and reading["confidence"] >= min_confidence:
+                    results[i] = reading["titles"]
+                    done += 1
+        span.set("cache_hits", cached)
+        span.set("local_ocr", done - cached)
+        if on_progress and done:
+            on_progress(done, total, failed)
+
+        remaining = [i for i in range(total) if results[i] is None]
+        groups = [remaining[i:i + group_size] for i in range(0, len(remaining), group_size)]
+        errors = []
+        if groups:
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(groups))) as pool:
+                futures = {pool.submit(tracing.bind(ocr_image_group), [image_payload[i] for i in group], client): group
+                           for group in groups}
+                for future in as_completed(futures):
+                    group = futures[future]
+                    try:
+                        results[group[0]] = future.result()
+                        if len(group) > 1:
+                            grouped.add(group[0])
+                    except Exception as e:
+                        errors.append(e)
+                        failed += len(group)
+                    done += len(group)
+                    if on_progress:
+                        on_progress(done, total, failed)
+
+        span.set("vision_groups", len(groups))
+        span.set("failed", failed)
+        if groups and len(errors) == len(groups) and not any(results):
+            raise errors[0]
+        if title_cache is not None:
+            for i, (digest, titles) in enumerate(zip(hashes, results)):
+                if digest is not None and titles and i not in grouped:
+                    title_cache.put(digest, titles)
+        merged = merge_chunk_titles([titles for titles in results if titles])
+        span.set("titles", len(merged))
+        return merged
+
+
+def merge_title_counts(*title_lists):
+    """
+    여러 출처의 제목을 합치고 거의 같은 제목(정규화/이모지/해시태그/Shorts 표시 차이)은 하나로 → (대표 제목, 나온 횟수)
+    입력 순서를 유지하고, Shorts 표시가 남아 있는 변형을 대표로 씁니다. (쇼츠 가중치가 빠지지 않도록)
+    """
+    titles = [t.strip() for titles in title_lists for t in titles if len(t.strip()) > 1]
+    return collapse_titles(titles, prefer=is_likely_shorts)
+
+
+def merge_titles(*title_lists):
+    """merge_title_counts의 대표 제목만"""
+    return merge_title_counts(*title_lists)[0]
+
+
+# --- 점수/진단 ---
+def make_embedding_backend(name, client):
+    """"hashing"이면 네트워크 없는 로컬 백엔드, 그 외에는 OpenAI"""
+    if name == "hashing":
+        return HashingEmbeddingBackend()
+    return OpenAIEmbeddingBackend(client)
+
+
+def score_titles(titles, embedder, user_context, cache=None, reference=None, make_async_client=None, on_progress=None,
+                 counts=None):
+    """제목 리스트(+ 제목별 나온 횟수) → {base_scores, scores, diversity_score, diagnosis_name}"""
+    with tracing.span("score_titles", titles=len(titles), embedding_model=getattr(embedder, "model", None)) as span:
+        if reference is None:
+            reference = load_or_build_exemplars(embedder)
+        base_scores = calculate_vector_scores(titles, embedder, user_context, cache=cache,
+                                              anchors=reference["centroids"], make_async_client=make_async_client,
+                                              on_progress=on_progress, counts=counts)
+        weighted_scores = apply_context_weights(base_scores, user_context)
+        diagnosis_name = diagnose_pattern(weighted_scores, user_context)
+        span.set("diagnosis_name", diagnosis_name)
+        return {
+            'base_scores': base_scores,
+            'scores': weighted_scores,
+            'diversity_score': calculate_entropy_score(weighted_scores),
+            'diagnosis_name': diagnosis_name,
+        }
+
+
+# --- GPT 처방 ---
+def build_prescription_prompt(diagnosis_name, weighted_scores):
+    # [핵심 로직] 파이썬이 부족한/과잉 영양소를 미리 계산해서 GPT에게 강력하게 주입
+    min_nutrient = min(weighted_scores, key=weighted_scores.get) # 채워야 할 것
+    max_nutrient = max(weighted_scores, key=weighted_scores.get) # 줄여야 할 것
+
+    return f"""
+        You are a YouTube content analysis expert. Generate a diagnosis about the user's YouTube viewing habits.
+
+        [Analysis Data]
+        - Diagnosis Name: {diagnosis_name}
+        - **EXCESS Nutrient (Too much):** {NUTRIENT_MAP[max_nutrient]}
+        - **LACKING Nutrient (Need more):** {NUTRIENT_MAP[min_nutrient]}
+
+        CRITICAL INSTRUCTIONS:
+        1. **OUTPUT LANGUAGE: MUST BE KOREAN (한국어).**
+        2. **Prescription Goal:** The user consumes too much '{max_nutrient}'. Prescribe content related to '{min_nutrient}' to balance the diet.
+        3. **Search Query Rule:** In 'youtube_search_query', suggest video topics for '{min_nutrient}'. DO NOT recommend '{max_nutrient}'.
+        4. **Word Ban:** Do NOT use words '비타민', '단백질', '탄수화물', '지방' in keyword/query.
+
+        Task:
+        1. 'Prescription Keyword': Catchy keyword for the *LACKING* nutrient.
+        2. 'Summary': Diagnosis summary. Mention excess/lack.
+        3. 'YouTube Search Query': Specific topics for the *LACKING* nutrient.
+
+        IMPORTANT: You MUST return the result in the following JSON format. Do not change the keys.
+        {{
+            "prescription_keyword": "A short, metaphorical title in Korean for the user (e.g., 'Mental Detox', 'Art Vitamin')",
+            "summary_text": "Diagnosis summary in Korean",
+            "youtube_search_query": "A CONCRETE search query in Korean for YouTube. (e.g., 'Funny cat videos', 'Travel vlog', 'ASMR rain sounds'). This must be different from prescription_keyword."
+        }}
+        """
+
+
+def generate_prescription(client, diagnosis_name, weighted_scores):
+    """GPT 진단 소견/처방 키워드/검색어 → {summary_text, prescription_keyword, youtube_search_query}"""
+    prompt = build_prescription_prompt(diagnosis_name, weighted_scores)
+    with tracing.span("diagnosis.prescription", tracing.SPAN_KIND_CLIENT, **{
+            "gen_ai.request.model": CHAT_MODEL, "payload_bytes": len(prompt.encode("utf-8")),
+            "diagnosis_name": diagnosis_name, "retries": 0}) as span:
+        response = create_chat_completion(
+            client, span,
+            model=CHAT_MODEL,
+            messages=[{"role": "system", "content": prompt}],
+            response_format={"type": "json_object"},
+            temperature=0.0,
+            max_tokens=500
+        )
+        span.record_usage(getattr(response, "usage", None))
+        gpt_result = json.loads(response.choices[0].message.content)
+
+    # --- [안전장치] 검색어가 비어있거나, 키워드와 너무 똑같으면 '추천' 단어를 붙여서 검색되게 보정 ---
+    raw_search_query = gpt_result.get('youtube_search_query', '')
+    raw_keyword = gpt_result.get('prescription_keyword', '')
+    if not raw_search_query or raw_search_query == raw_keyword:
+        search_query = f"{raw_keyword} 추천 영상"
+    else:
+        search_query = raw_search_query
+
+    return {
+        'summary_text': gpt_result.get('summary_text', '진단 내용을 불러오지 못했습니다.'),
+        'prescription_keyword': gpt_result.get('prescription_keyword', '디지털 밸런스'),
+        'youtube_search_query': search_query,
+    }
+
+
+def make_result(scored, prescription, recommended_videos, user_context, timings=None):
+    """STEP 4/5 화면과 CLI가 함께 쓰는 결과 형식"""
+    return {
+        'diagnosis_name': scored['diagnosis_name'],
+        'scores': scored['scores'],
+        'diversity_score': scored['diversity_score'],
+        'summary_text': prescription['summary_text'],
+        'prescription_keyword': prescription['prescription_keyword'],
+        'youtube_search_query': prescription['youtube_search_query'],
+        'recommended_videos': recommended_videos,
+        # 파이썬 가이드 생성 (이것도 파이썬 로직이므로 GPT와 결과가 일치하게 됨)
+        'recommendations': generate_personalized_recommendations(scored['scores'], user_context),
+        'timings': {k: round(v, 3) for k, v in (timings or {}).items()}  # 단계별 소요 시간(초)
+    }
+
+
+# --- 전체 파이프라인 ---
+def analyze(titles=None, text=None, images=None, context=None, client=None, embedder=None,
+            cache=None, reference=None, youtube_key=None, prescribe=True, local_ocr=None, title_cache=None):
+    """
+    titles(제목 리스트) / text(붙여넣은 화면 텍스트) / images(경로·bytes 리스트) 중 하나 이상을 받아
+    Streamlit STEP 4와 같은 형식의 결과 dict를 반환합니다.
+    - embedder가 없으면 client로 OpenAI 임베딩 사용
+    - prescribe=False면 GPT 처방/영상 검색 없이 점수와 진단만 계산 (API 키 없이 hashing 백엔드로 가능)
+    - local_ocr(ocr.OcrBackend)가 있으면 스크린샷은 로컬 OCR 우선, 신뢰도가 낮은 것만 vision
+    - 중복 스크린샷은 제외하고 스크롤 겹침은 잘라내며, title_cache가 있으면 이미 분석한 화면은 다시 요청하지 않음
+    """
+    context = context or {}
+    timings = {}
+    start = stage_start = time.perf_counter()
+
+    text_titles = []
+    if text:
+        text_titles, _ = clean_pasted_text(text, client)
+    image_titles = []
+    if images:
+        image_payload, _ = screenshots_to_payload(images)
+        image_titles = extract_titles_from_images(image_payload, client, local_ocr=local_ocr, title_cache=title_cache)
+    timings['ocr'] = time.perf_counter() - stage_start
+
+    all_titles, title_counts = merge_title_counts(image_titles, text_titles, titles or [])
+    if not all_titles:
+        raise ValueError("분석할 데이터가 없습니다")
+
+    stage_start = time.perf_counter()
+    scored = score_titles(all_titles, embedder or as_backend(client), context, cache=cache, reference=reference,
+                          counts=title_counts)
+    timings['scoring'] = time.perf_counter() - stage_start
+
+    prescription = {'summary_text': '', 'prescription_keyword': '', 'youtube_search_query': ''}
+    videos = []
+    if prescribe:
+        stage_start = time.perf_counter()
+        prescription = generate_prescription(client, scored['diagnosis_name'], scored['scores'])
+        timings['diagnosis'] = time.perf_counter() - stage_start
+        if youtube_key:
+            stage_start = time.perf_counter()
+            videos = search_videos(prescription['youtube_search_query'], youtube_key)
+            timings['video_search'] = time.perf_counter() - stage_start
+    timings['total'] = time.perf_counter() - start
+
+    result = make_result(scored, prescription, videos, context, timings)
+    result['title_count'] = len(all_titles)
+    return result
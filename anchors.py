@@ -0,0 +1,169 @@
+"""
+영양소 기준점(anchor) 임베딩 아티팩트
+기준 문장 4개를 분석할 때마다 임베딩하지 않고, 미리 만들어 둔 .npz 파일을 읽습니다.
+파일 이름에 모델명과 기준 문장 해시가 들어가므로, 문장이나 모델이 바뀌면 자동으로 새로 만듭니다.
+
+STANDARD_DATA(영양소별 예시 제목 12개)도 같은 방식으로 한 번만 임베딩해서
+영양소별 중심점(centroid)과 예시 행렬을 저장합니다. (nearest-centroid / k-NN 분류용)
+
+빌드: OPENAI_API_KEY=... python anchors.py   (devcontainer는 postCreateCommand에서 실행)
+      python anchors.py hashing   (네트워크 없는 로컬 백엔드용)
+파일이 없으면 load_or_build_*가 처음 호출될 때 임베딩 API로 만들고 stderr에 남깁니다. (빌드를 빠뜨린 배포용 대체 경로)
+"""
+import hashlib
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from embeddings import EMBEDDING_MODEL, HashingEmbeddingBackend, as_backend
+from scoring import NUTRIENTS, normalize_rows
+
+ARTIFACT_DIR = "artifacts"
+
+NUTRIENT_ANCHORS = {
+    "Carbs": "funny comedy entertainment game show prank variety short dopamine",
+    "Protein": "education knowledge science history news documentary learning philosophy lecture",
+    "Fats": "relaxation healing music nature asmr meditation sleep comfort peace vlog",
+    "Vitamins": "art culture travel creativity diversity new hobby perspective global"
+}
+
+
+# --- 데이터 거버넌스: 영양소별 대표 예시 제목 ---
+STANDARD_DATA = {
+    "Carbs (탄수화물)": ["충격적인 결말 포함 1분 쇼츠", "웃음참기 챌린지 실패", "뇌 빼고 보기 좋은 킬링타임", "틱톡 댄스 챌린지", "연예인 열애설 디스패치", "개그 콩트 몰아보기", "사이다 썰 애니메이션", "먹방 ASMR", "게임 하이라이트", "일상 브이로그", "리액션 영상", "숏폼 드라마"],
+    "Protein (단백질)": ["파이썬 코딩 테스트 풀이", "컴활 1급 필기 요약", "재무제표 분석 강의", "부동산 경매 월세", "직장인 엑셀 실무", "반도체 산업 전망", "토익 공부법", "인공지능 논문 리뷰", "경제 뉴스 해설", "주식 투자 전략", "창업 성공 사례", "마케팅 트렌드"],
+    "Fats (지방)": ["빗소리 10시간", "수면 유도 델타파", "장작 타는 소리 ASMR", "가사 없는 지브리 피아노", "숲속 물소리 명상", "불멍 영상 4K", "로파이(Lofi) 비트", "싱잉볼 소리", "백색소음", "파도소리", "카페 배경음", "명상 가이드"],
+    "Vitamins (비타민)": ["니체의 철학 해설", "현대 미술 난해한 이유", "양자역학 이중 슬릿", "채식주의 윤리 토론", "제3세계 영화 비평", "우주의 기원 빅뱅", "인간의 자유의지", "클래식 음악 역사", "문화 다양성", "환경 다큐멘터리", "역사 다큐", "TED 강연"]
+}
+
+
+def anchor_hash(model=EMBEDDING_MODEL, anchors=NUTRIENT_ANCHORS):
+    payload = json.dumps({"model": model, "anchors": anchors}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def artifact_path(model=EMBEDDING_MODEL, anchors=NUTRIENT_ANCHORS, directory=ARTIFACT_DIR):
+    return os.path.join(directory, f"anchors_{model}_{anchor_hash(model, anchors)[:12]}.npz")
+
+
+def write_artifact(path, **arrays):
+    """임시 파일에 다 쓴 뒤 os.replace로 교체 (여러 워커/스레드가 동시에 만들어도 반쯤 쓰인 파일을 읽지 않음)"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return path
+
+
+def build_anchor_artifact(client, model=EMBEDDING_MODEL, anchors=NUTRIENT_ANCHORS, directory=ARTIFACT_DIR):
+    """
+    기준 문장을 한 번에 임베딩해서 저장합니다. 실패하면 0벡터로 대체하지 않고 예외를 그대로 올립니다.
+    client는 OpenAI 클라이언트 또는 EmbeddingBackend (백엔드면 backend.model이 모델명이 됨)
+    """
+    backend = as_backend(client, model)
+    model = backend.model
+    labels = list(anchors)
+    matrix = np.asarray(backend.embed([anchors[k] for k in labels]), dtype=np.float32)
+    if not np.all(np.linalg.norm(matrix, axis=1) > 0):
+        raise ValueError("anchor embedding has zero norm")
+
+    return write_artifact(artifact_path(model, anchors, directory), labels=np.array(labels), matrix=matrix,
+                          model=np.array(model), anchor_hash=np.array(anchor_hash(model, anchors)))
+
+
+def load_anchor_artifact(model=EMBEDDING_MODEL, anchors=NUTRIENT_ANCHORS, directory=ARTIFACT_DIR):
+    """(labels, matrix) 반환. 파일이 없거나 해시가 맞지 않으면 None"""
+    path = artifact_path(model, anchors, directory)
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        if str(data["anchor_hash"]) != anchor_hash(model, anchors):
+            return None
+        return [str(label) for label in data["labels"]], data["matrix"].astype(np.float32)
+
+
+def load_or_build_anchors(client, model=EMBEDDING_MODEL, anchors=NUTRIENT_ANCHORS, directory=ARTIFACT_DIR):
+    backend = as_backend(client, model)
+    model = backend.model
+    loaded = load_anchor_artifact(model, anchors, directory)
+    if loaded is None:
+        print(f"anchor artifact missing for {model}; building at runtime (run `python anchors.py` at deploy)",
+              file=sys.stderr)
+        build_anchor_artifact(backend, model, anchors, directory)
+        loaded = load_anchor_artifact(model, anchors, directory)
+    return loaded
+
+
+# --- 예시 제목(STANDARD_DATA) 중심점 ---
+def exemplar_path(model=EMBEDDING_MODEL, exemplars=STANDARD_DATA, directory=ARTIFACT_DIR):
+    return os.path.join(directory, f"exemplars_{model}_{anchor_hash(model, exemplars)[:12]}.npz")
+
+
+def build_exemplar_artifact(client, model=EMBEDDING_MODEL, exemplars=STANDARD_DATA, directory=ARTIFACT_DIR):
+    """
+    예시 제목 전체를 한 번에 임베딩해서 저장합니다.
+    - matrix: 정규화된 예시 벡터 (M×D), labels: 각 예시의 영양소 인덱스 (NUTRIENTS 기준)
+    - centroids: 영양소별 정규화 벡터 평균을 다시 정규화한 4×D 행렬
+    """
+    backend = as_backend(client, model)
+    model = backend.model
+    titles, labels = [], []
+    for key, examples in exemplars.items():
+        nutrient = NUTRIENTS.index(key.split()[0])   # "Carbs (탄수화물)" → "Carbs"
+        titles.extend(examples)
+        labels.extend([nutrient] * len(examples))
+    labels = np.array(labels, dtype=np.int64)
+
+    matrix = normalize_rows(backend.embed(titles))
+    if not np.all(np.linalg.norm(matrix, axis=1) > 0):
+        raise ValueError("exemplar embedding has zero norm")
+    centroids = normalize_rows(np.stack([matrix[labels == i].mean(axis=0) for i in range(len(NUTRIENTS))]))
+
+    return write_artifact(exemplar_path(model, exemplars, directory), matrix=matrix, labels=labels,
+                          centroids=centroids, model=np.array(model),
+                          anchor_hash=np.array(anchor_hash(model, exemplars)))
+
+
+def load_exemplar_artifact(model=EMBEDDING_MODEL, exemplars=STANDARD_DATA, directory=ARTIFACT_DIR):
+    """{"centroids", "matrix", "labels"} 반환. 파일이 없거나 해시가 맞지 않으면 None"""
+    path = exemplar_path(model, exemplars, directory)
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        if str(data["anchor_hash"]) != anchor_hash(model, exemplars):
+            return None
+        return {
+            "centroids": data["centroids"].astype(np.float32),
+            "matrix": data["matrix"].astype(np.float32),
+            "labels": data["labels"].astype(np.int64),
+        }
+
+
+def load_or_build_exemplars(client, model=EMBEDDING_MODEL, exemplars=STANDARD_DATA, directory=ARTIFACT_DIR):
+    backend = as_backend(client, model)
+    model = backend.model
+    loaded = load_exemplar_artifact(model, exemplars, directory)
+    if loaded is None:
+        print(f"exemplar artifact missing for {model}; building at runtime (run `python anchors.py` at deploy)",
+              file=sys.stderr)
+        build_exemplar_artifact(backend, model, exemplars, directory)
+        loaded = load_exemplar_artifact(model, exemplars, directory)
+    return loaded
+
+
+if __name__ == "__main__":
+    from openai import OpenAI
+
+    model = sys.argv[1] if len(sys.argv) > 1 else EMBEDDING_MODEL
+    client = HashingEmbeddingBackend() if model == "hashing" else OpenAI(max_retries=0)
+    print(build_anchor_artifact(client, model))
+    print(build_exemplar_artifact(client, model))
@@ -1,21 +1,35 @@
 import streamlit as st
 import streamlit.components.v1 as components
-from openai import OpenAI
-import base64
-import json
-import plotly.graph_objects as go
-from googleapiclient.discovery import build
-import numpy as np
 import time
-import math
+import mimetypes
 import os
-from PIL import Image
-import io
+import threading
 import streamlit as st
+from asset_cache import AssetCache
+from static_assets import load_manifest, pick_asset_url, url_to_file
+import tracing
+# openai / numpy / plotly / 분석 모듈은 쓰는 단계(STEP 2~4, 차트)에서만 import
+# → 서버 콜드 스타트와 Introduction 탭 첫 화면이 무거운 의존성을 기다리지 않음 (benchmarks/bench_startup.py로 측정)
 
 # --- 0. API KEY 설정 ---
 DEFAULT_OPENAI_KEY = st.secrets.get("OPENAI_API_KEY", "")
 DEFAULT_YOUTUBE_KEY = st.secrets.get("YOUTUBE_API_KEY", "")
+# 임베딩 백엔드: "openai" (기본) 또는 "hashing" (네트워크 없이 로컬 계산 — 개발/부하 테스트/장애 대응)
+EMBEDDING_BACKEND = st.secrets.get("EMBEDDING_BACKEND", "openai")
+# API 주소 교체 (로컬 대역 서버 benchmarks/mock_server.py 등으로 부하 테스트할 때만 설정, 비우면 실제 API)
+OPENAI_BASE_URL = st.secrets.get("OPENAI_BASE_URL") or None
+YOUTUBE_BASE_URL = st.secrets.get("YOUTUBE_BASE_URL") or None
+# 주소를 바꾸면 임베딩 캐시/기준점 아티팩트도 따로 저장 (대역 서버 벡터가 실제 모델 캐시에 섞이지 않도록)
+MOCK_DATA_DIR = os.path.join(".cache", "mock") if OPENAI_BASE_URL else None
+# 세로 휴대폰 스크린샷의 상태 표시줄/하단 내비게이션 바를 잘라내고 vision에 보냄
+CROP_SCREENSHOT_CHROME = st.secrets.get("CROP_SCREENSHOT_CHROME", True)
+# 스크린샷 OCR: "vision" (기본, gpt-4o) 또는 "tesseract" (로컬 우선, 신뢰도가 낮은 스크린샷만 vision)
+OCR_BACKEND = st.secrets.get("OCR_BACKEND", "vision")
+# 화면 이미지(source/) base64 캐시 예산과, 서버 시작 시 미리 인코딩할지 여부
+ASSET_CACHE_MAX_MB = st.secrets.get("ASSET_CACHE_MAX_MB", 64)
+WARM_ASSET_CACHE = st.secrets.get("WARM_ASSET_CACHE", False)
+# 세션별 구간 추적(JSON lines, OTLP 형식) 파일. 비우면 기록하지 않음 — 보기: python tracing.py <세션 ID>
+TRACE_FILE = st.secrets.get("TRACE_FILE", tracing.DEFAULT_TRACE_PATH)
 
 # --- 1. 페이지 설정 ---
 st.set_page_config(
@@ -569,18 +583,68 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- 3. 데이터 거버넌스 ---
-STANDARD_DATA = {
-    "Carbs (탄수화물)": ["충격적인 결말 포함 1분 쇼츠", "웃음참기 챌린지 실패", "뇌 빼고 보기 좋은 킬링타임", "틱톡 댄스 챌린지", "연예인 열애설 디스패치", "개그 콩트 몰아보기", "사이다 썰 애니메이션", "먹방 ASMR", "게임 하이라이트", "일상 브이로그", "리액션 영상", "숏폼 드라마"],
-    "Protein (단백질)": ["파이썬 코딩 테스트 풀이", "컴활 1급 필기 요약", "재무제표 분석 강의", "부동산 경매 월세", "직장인 엑셀 실무", "반도체 산업 전망", "토익 공부법", "인공지능 논문 리뷰", "경제 뉴스 해설", "주식 투자 전략", "창업 성공 사례", "마케팅 트렌드"],
-    "Fats (지방)": ["빗소리 10시간", "수면 유도 델타파", "장작 타는 소리 ASMR", "가사 없는 지브리 피아노", "숲속 물소리 명상", "불멍 영상 4K", "로파이(Lofi) 비트", "싱잉볼 소리", "백색소음", "파도소리", "카페 배경음", "명상 가이드"],
-    "Vitamins (비타민)": ["니체의 철학 해설", "현대 미술 난해한 이유", "양자역학 이중 슬릿", "채식주의 윤리 토론", "제3세계 영화 비평", "우주의 기원 빅뱅", "인간의 자유의지", "클래식 음악 역사", "문화 다양성", "환경 다큐멘터리", "역사 다큐", "TED 강연"]
-}
+# (영양소별 예시 제목 STANDARD_DATA는 anchors.py에서 관리)
 
 # --- 4. 헬퍼 함수들 ---
+@st.cache_resource
+def get_trace_exporter():
+    # 파일 exporter는 프로세스당 1개 (세션끼리 공유, 쓰기는 잠금으로 한 줄씩)
+    return tracing.JsonlFileExporter(TRACE_FILE) if TRACE_FILE else None
+
+def session_trace(name, **attributes):
+    """이 브라우저 세션의 분석 실행 1회 (안에서 호출되는 분석 함수들의 구간이 자식 span으로 기록됨)"""
+    return tracing.trace(name, get_trace_exporter(), st.session_state.session_id, **attributes)
+
+@st.cache_resource
+def get_embedding_cache():
+    # 프로세스당 1개 (메모리 LRU) + 워커 프로세스끼리 공유하는 SQLite 파일
+    from embedding_cache import EmbeddingCache
+    if MOCK_DATA_DIR:
+        return EmbeddingCache(os.path.join(MOCK_DATA_DIR, "embeddings.sqlite3"))
+    return EmbeddingCache()
+
+@st.cache_resource
+def get_asset_cache():
+    # 배너/아이콘/캐릭터 이미지의 base64는 프로세스당 한 번만 인코딩 (세션끼리 공유, 파일이 바뀌면 다시 읽음)
+    cache = AssetCache("source", max_bytes=ASSET_CACHE_MAX_MB * 1024 * 1024)
+    if WARM_ASSET_CACHE:
+        threading.Thread(target=cache.warm, daemon=True).start()   # 첫 화면 렌더링을 막지 않도록 백그라운드에서
+    return cache
+
+
+get_asset_cache()
+
+
+@st.cache_resource
+def get_screenshot_title_cache():
+    # 이미 분석한 화면(픽셀 내용 해시 기준)의 제목은 세션이 달라도 다시 요청하지 않음 (프로세스당 1개)
+    from screenshot_dedupe import ScreenshotTitleCache
+    return ScreenshotTitleCache()
+
+
+@st.cache_resource
+def get_ocr_backend():
+    # Tesseract 워커 프로세스 풀은 서버 프로세스당 1개 (설치되어 있지 않으면 None → vision만 사용)
+    from ocr import make_ocr_backend
+    return make_ocr_backend(OCR_BACKEND)
+
+def get_embedding_backend(client):
+    from analysis import make_embedding_backend
+    return make_embedding_backend(EMBEDDING_BACKEND, client)
+
+@st.cache_resource
+def get_exemplar_reference(model_name, _backend):
+    # STANDARD_DATA 예시 제목의 중심점/행렬은 백엔드(모델)별로 프로세스당 한 번만 로딩 (아티팩트가 없을 때만 새로 생성)
+    from anchors import load_or_build_exemplars
+    if MOCK_DATA_DIR:
+        return load_or_build_exemplars(_backend, directory=os.path.join(MOCK_DATA_DIR, "artifacts"))
+    return load_or_build_exemplars(_backend)
+
 def load_image(path):
+    # 경로를 그대로 st.image에 넘김 (PIL 이미지를 넘기면 다시 실행할 때마다 PNG로 재인코딩함)
     full_path = f"source/{path}"
     if os.path.exists(full_path):
-        return Image.open(full_path)
+        return full_path
     return None
 
 def load_svg_content(path):
@@ -594,387 +658,47 @@ def load_svg_content(path):
     return None
 
 def get_base64_of_bin_file(bin_file):
-    full_path = f"source/{bin_file}"
-    if os.path.exists(full_path):
-        with open(full_path, 'rb') as f:
-            data = f.read()
-        return base64.b64encode(data).decode()
-    return ""
-
-def encode_image(image_file):
-    return base64.b64encode(image_file.read()).decode('utf-8')
-
-def get_embedding(text, client):
-    text = text.replace("\n", " ")
-    return client.embeddings.create(input=[text], model="text-embedding-3-small").data[0].embedding
-
-def cosine_similarity(a, b):
-    return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
-
-def filter_invalid_titles(titles):
-    invalid_patterns = [
-        "YouTube", "YouTube Music", "YouTube Kids", "YouTube 스튜디오",
-        "YouTube Premium", "YouTube TV", "YouTube Shorts",
-        "홈", "Shorts", "구독", "나중에 볼 동영상", "좋아요 표시한 동영상",
-        "재생목록", "오프라인 저장", "다운로드", "구매 항목", "영화",
-        "실시간", "게임", "스포츠", "학습", "팟캐스트",
-        "설정", "신고 기록", "고객센터", "의견 보내기", "정보",
-        "보도자료", "저작권", "문의하기", "크리에이터", "광고", "개발자",
-        "약관", "개인정보처리방침", "정책 및 안전", "YouTube 작동 원리",
-        "새로운 기능 테스트", "더보기", "간략히",
-        "구독", "구독중", "알림", "모두", "맞춤설정", "없음",
-        "좋아요", "싫어요", "공유", "오프라인 저장", "클립", "저장",
-        "신고", "스크립트 표시", "댓글",
-        "조회수", "업로드", "실시간 스트리밍", "최근 업로드",
-        "인기 업로드", "처음부터 재생", "믹스", "관련 동영상",
-        "탐색", "라이브러리", "기록", "내 동영상", "시청 기록",
-        "B tv", "tv"
-    ]
-    
-    filtered_titles = []
-    for title in titles:
-        if len(title) < 5 or len(title) > 200:
-            continue
-        
-        is_invalid = False
-        title_lower = title.lower()
-        for pattern in invalid_patterns:
-            if pattern.lower() in title_lower and len(title) < 20:
-                is_invalid = True
-                break
-        
-        if 'http' in title_lower or 'www.' in title_lower:
-            is_invalid = True
-            
-        if title.strip().isdigit():
-            is_invalid = True
-            
-        if not is_invalid:
-            filtered_titles.append(title)
-    
-    return filtered_titles
+    return get_asset_cache().get_base64(bin_file)
 
-def apply_context_weights(base_scores, user_context):
-    weighted_scores = base_scores.copy()
-    
-    # 1. 시청 시간대별 가중치 (기존 유지)
-    watch_time_weights = {
-        "잠들기 전": {"Carbs": 0.9, "Protein": 0.8, "Fats": 1.3, "Vitamins": 1.0},
-        "식사하면서": {"Carbs": 1.3, "Protein": 0.7, "Fats": 0.9, "Vitamins": 1.1}, # 밥친구는 보통 예능
-        "이동 중": {"Carbs": 1.2, "Protein": 1.0, "Fats": 0.8, "Vitamins": 1.0},
-        "일/공부 중": {"Carbs": 0.6, "Protein": 1.1, "Fats": 1.3, "Vitamins": 1.0} # 노동요(Fats)
-    }
-    
-    watch_time = user_context.get('watch_time', "식사하면서")
-    time_weight = watch_time_weights.get(watch_time, {})
-    
-    for nutrient in weighted_scores:
-        weighted_scores[nutrient] *= time_weight.get(nutrient, 1.0)
-    
-    # 2. [수정] 쇼츠 과다 시청 여부 (shorts_heavy) 반영
-    # 쇼츠를 많이 본다고 답했으면, Carbs(재미) 성향이 높다고 판단하여 가중치 부여
-    if user_context.get('shorts_heavy', False):
-        weighted_scores['Carbs'] *= 1.2
-        weighted_scores['Protein'] *= 0.9  # 숏폼러들은 긴 호흡의 학습을 힘들어하는 경향 보정
-
-    # 3. [수정] 프리미엄 유저 (is_premium) 반영
-    # 프리미엄 유저는 '백그라운드 재생'으로 음악(Fats) 점수가 과하게 잡혔을 수 있음.
-    # 이미 앞단(벡터계산)에서 보정했지만, 여기서 한 번 더 밸런스를 잡아줌.
-    if user_context.get('is_premium', False):
-        # 음악 청취로 인한 Fats 거품을 살짝 걷어냄 (정상화)
-        weighted_scores['Fats'] *= 0.9
-    
-    # 4. 백분율 재계산
-    total = sum(weighted_scores.values())
-    if total > 0:
-        for nutrient in weighted_scores:
-            weighted_scores[nutrient] = int((weighted_scores[nutrient] / total) * 100)
-            
-    return weighted_scores
 
-def calculate_entropy_score(scores):
-    """
-    [수정된 로직] 
-    기존 엔트로피 방식 대신 '이상적인 비율(25%)과의 거리'를 계산합니다.
-    편식이 심할수록 점수가 급격히 낮아집니다.
-    """
-    # 1. 값들을 리스트로 변환
-    values = list(scores.values())
-    total = sum(values)
-    
-    if total == 0: return 0
-    
-    # 2. 백분율로 정규화 (합을 100%로 맞춤)
-    percents = [(v / total) * 100 for v in values]
-    
-    # 3. 이상적인 비율 (4개 항목이니 각각 25%)
-    ideal = 25.0
-    
-    # 4. 편차(Distance) 계산: |내 점수 - 25| 의 합계
-    # 예: 53%라면 |53 - 25| = 28만큼 벌점
-    diffs = [abs(p - ideal) for p in percents]
-    total_diff = sum(diffs)
-    
-    # 5. 점수 환산
-    # 이론상 최악의 경우(100, 0, 0, 0)일 때 편차 합은 150입니다.
-    # (|75| + |-25| + |-25| + |-25| = 150)
-    # 따라서 150을 기준으로 감점합니다.
-    
-    penalty = (total_diff / 150.0) * 100
-    final_score = 100 - penalty
-    
-    return int(max(0, final_score))
+@st.cache_resource
+def get_asset_manifest():
+    # `python static_assets.py`로 미리 만든 static/assets/manifest.json만 읽음 (프로세스당 한 번, 요청 중에는 인코딩하지 않음)
+    # 빌드하지 않았으면 {} → 원본 data URI로 표시
+    if not st.get_option("server.enableStaticServing"):
+        return {}
+    return load_manifest()
 
-def diagnose_pattern(weighted_scores, user_context):
-    # 가장 높은 점수의 영양소 찾기
-    max_nutrient = max(weighted_scores, key=weighted_scores.get)
-    max_value = weighted_scores[max_nutrient]
-    
-    # 진단명 사전
-    diagnoses = {
-        "Carbs": {
-            "high": "숏폼 도파민 중독증", 
-            "medium": "알고리즘 표류 증후군", 
-            "context": {
-                "잠들기 전": "야간 자극 과다 증후군", 
-                "식사하면서": "먹방 의존증"
-            }
-        },
-        "Protein": {
-            "high": "정보 과부하 증후군", 
-            "medium": "학습 강박증", 
-            "context": {
-                "일/공부 중": "워커홀릭 정보 섭취증"
-            }
-        },
-        "Fats": {
-            "high": "디지털 수면제 의존증", 
-            "medium": "현실 도피 증후군", 
-            "context": {
-                "잠들기 전": "수면 유도 과의존증"
-            }
-        },
-        "Vitamins": {
-            "high": "정보 편식 개선 중", 
-            "medium": "균형 잡힌 디지털 식단", 
-            "context": {}
-        }
-    }
-    
-    watch_time = user_context.get('watch_time')
-    
-    # 점수 레벨 판별
-    if max_value > 55: level = "high"
-    elif max_value > 35: level = "medium"
-    else: return "디지털 영양 불균형"
-    
-    # [수정됨] 숏폼 과다 시청자 -> '만성...' 대신 기존 '숏폼 도파민 중독증'으로 이름 통합
-    # (쇼츠 많이 봄 체크 시, 점수 상관없이 이 진단명 우선 적용)
-    if max_nutrient == "Carbs" and user_context.get('shorts_heavy', False):
-        return "숏폼 도파민 중독증"
-
-    # 컨텍스트 기반 특수 진단 (시간대별 습관 반영)
-    # 예: 잠들기 전 + 재미 위주 = 야간 자극 과다 증후군
-    if watch_time in diagnoses[max_nutrient].get("context", {}):
-        return diagnoses[max_nutrient]["context"][watch_time]
-        
-    # 기본 진단 반환 (점수 레벨에 따름)
-    return diagnoses[max_nutrient].get(level, "디지털 편식증")
-
-def generate_personalized_recommendations(weighted_scores, user_context):
-    recommendations = []
 
-    if not weighted_scores: return []
-    
-    min_nutrient = min(weighted_scores, key=weighted_scores.get)
-    max_nutrient = max(weighted_scores, key=weighted_scores.get)
-    
-    nutrient_korean = {"Carbs": "재미/오락", "Protein": "지식/학습", "Fats": "휴식/힐링", "Vitamins": "다양성/시야확장"}
-    nutrient_content = {
-        "Carbs": ["코미디 쇼", "게임 방송", "예능 프로그램", "챌린지 영상"],
-        "Protein": ["온라인 강의", "TED 강연", "다큐멘터리", "전문가 인터뷰"],
-        "Fats": ["ASMR", "명상 가이드", "자연 영상", "수면 음악"],
-        "Vitamins": ["외국 문화", "예술 작품", "철학 강의", "새로운 취미"]
-    }
-    
-    if weighted_scores[min_nutrient] < 15:
-        recommendations.append(f"💊 {nutrient_korean[min_nutrient]} 콘텐츠가 매우 부족합니다. {', '.join(nutrient_content[min_nutrient][:2])} 같은 영상을 추가해보세요.")
-    if weighted_scores[max_nutrient] > 50:
-        recommendations.append(f"⚠️ {nutrient_korean[max_nutrient]} 콘텐츠에 과도하게 편중되어 있습니다.")
-    
-    watch_time = user_context.get('watch_time')
-    if watch_time == "잠들기 전" and weighted_scores["Carbs"] > 30:
-        recommendations.append("🌙 잠들기 전 자극적인 콘텐츠는 수면을 방해할 수 있습니다.")
-    
-    try:
-        daily_val = str(user_context.get('daily_hours', 2))
-        import re
-        nums = re.findall(r'\d+', daily_val)
-        daily_hours = int(nums[0]) if nums else 0
-        
-        if daily_hours >= 4:
-            recommendations.append(f"⏰ 하루 {daily_hours}시간 시청은 눈 건강에 해롭습니다. 디지털 디톡스가 필요합니다.")
-    except:
-        pass
-
-    if not recommendations:
-        recommendations.append("✨")
-    
-    return recommendations[:3]
-
-# --- [헬퍼 1] 쇼츠 여부 판별 ---
-def is_likely_shorts(title):
-    """제목에 #Shorts가 있거나, 짐작가는 패턴이 있으면 True"""
-    t = title.lower()
-    if "#shorts" in t or "#쇼츠" in t or "shorts" in t:
-        return True
-    return False
-
-# --- [헬퍼 2] 룰 기반 점수 보정 (치트키) ---
-def apply_keyword_boost(title, is_premium=False):
+def get_asset_url(path, width=None):
     """
-    AI가 헷갈려하는 영상들을 강제로 올바른 영양소로 분류합니다.
+    source/ 기준 경로 → <img src>/CSS url()에 넣을 주소 (정적 서빙을 못 쓰면 원본 data URI, 파일이 없으면 "")
+    width(표시 폭 CSS px)를 주면 그 크기에 맞춰 만든 WebP 변형을 씁니다.
     """
-    title_lower = title.lower()
-
-    # 1. [재미/오락]
-    carbs_keywords = [
-        "예능", "코미디", "개그", "웃음", "레전드", "ㅋㅋ", "ㅎㅎ", 
-        "몰카", "참기", "챌린지", "게임", "game", "매드무비", "하이라이트", 
-        "리액션", "먹방", "쇼츠", "shorts", "무한도전", "런닝맨", "유퀴즈", # 유퀴즈는 예능 성격도 있음
-        "침착맨", "엔터", "스케치", "콩트"
-    ]
-
-    # [지방] 휴식/힐링 (음악, ASMR 등)
-    fats_keywords = [
-        "playlist", "플레이리스트", "essential", "jazz", "lullaby", "asmr", 
-        "빗소리", "백색소음", "meditation", "요가", "산책", "vlog", "브이로그",
-        "pop", "song", "music", "노래", "감성", "lo-fi", "lofi", "piano", "classic", "클래식"
-    ]
-    
-    # [단백질] 지식/학습 (뉴스, 강연 등)
-    protein_keywords = [
-        "교수", "박사", "강연", "ted", "특강", "다큐", "documentary", 
-        "뉴스", "news", "경제", "주식", "재테크", "역사", "history", 
-        "과학", "science", "우주", "기술", "ai", "개발", "코딩", 
-        "영어", "회화", "공부", "스터디", "독서", "책", "인문학", "철학",
-        "지식", "상식", "이동진", "슈카", "유퀴즈", "알쓸", "ebs", "bbc"
-    ]
-    
-    # [비타민] 다양성/예술
-    vitamin_keywords = [
-        "여행", "travel", "세계", "문화", "미술", "전시", "영화", "movie", 
-        "리뷰", "해석", "비하인드", "창작", "메이킹", "diy", "취미"
-    ]
-
-    # [Carbs] 재미
-    if any(k in title_lower for k in carbs_keywords):
-        return "Carbs", 2.0 # 재미는 확실하게 잡아줘야 함
-    
-    # 1. 음악/힐링 키워드 발견 시
-    if any(k in title_lower for k in fats_keywords):
-        if is_premium:
-            # 프리미엄 유저는 "배경음악"일 확률이 높으므로 점수 반영 비중을 낮춤 (0.5)
-            return "Fats", 0.8 
-        else:
-            # 일반 유저는 "일부러 찾아 듣는 힐링"이므로 점수 높임 (3.0)
-            return "Fats", 1.5
-            
-    if any(k in title_lower for k in protein_keywords):
-        return "Protein", 2.0
-    if any(k in title_lower for k in vitamin_keywords):
-        return "Vitamins", 1.8
-        
-    return None, 1.0
+    entry = get_asset_manifest().get(path)
+    if entry:
+        return pick_asset_url(entry, width)
+    b64 = get_base64_of_bin_file(path)
+    if not b64:
+        return ""
+    return f"data:{mimetypes.guess_type(path)[0] or 'image/png'};base64,{b64}"
 
-# --- [메인] 벡터 점수 계산 (수정됨: user_context 추가) ---
-def calculate_vector_scores(user_texts, client, user_context=None):
 
-    # 사용자 설정 가져오기
-    is_premium = False
-    if user_context:
-        is_premium = user_context.get('is_premium', False)
-    
-    # 1. 기준점 임베딩 (기존과 동일)
-    nutrients_anchor = {
-        "Carbs": "funny comedy entertainment game show prank variety short dopamine", 
-        "Protein": "education knowledge science history news documentary learning philosophy lecture", 
-        "Fats": "relaxation healing music nature asmr meditation sleep comfort peace vlog", 
-        "Vitamins": "art culture travel creativity diversity new hobby perspective global" 
-    }
-    
-    anchor_embeddings = {}
-    for k, v in nutrients_anchor.items():
-        try:
-            res = client.embeddings.create(input=v, model="text-embedding-3-small")
-            anchor_embeddings[k] = np.array(res.data[0].embedding)
-        except:
-            anchor_embeddings[k] = np.zeros(1536)
-
-    scores = {"Carbs": 0.0, "Protein": 0.0, "Fats": 0.0, "Vitamins": 0.0}
-    
-    # 2. 텍스트 분석
-    for text in user_texts:
-        if not text.strip(): continue
-        
-        # [A] 쇼츠 디버프
-        weight = 0.4 if is_likely_shorts(text) else 1.0
-        
-        # [B] 키워드 룰 (is_premium 정보 전달!)
-        forced_cat, boost = apply_keyword_boost(text, is_premium)
-        
-        if forced_cat:
-            scores[forced_cat] += (1.0 * boost * weight)
-            continue 
-        
-        # [C] AI 벡터 계산 (기존과 동일)
-        try:
-            res = client.embeddings.create(input=text, model="text-embedding-3-small")
-            user_vec = np.array(res.data[0].embedding)
-            
-            best_cat = None
-            max_sim = -1.0
-            norm_u = np.linalg.norm(user_vec)
-            
-            for k, anchor_vec in anchor_embeddings.items():
-                norm_a = np.linalg.norm(anchor_vec)
-                if norm_u > 0 and norm_a > 0:
-                    sim = np.dot(user_vec, anchor_vec) / (norm_u * norm_a)
-                    if sim > max_sim:
-                        max_sim = sim
-                        best_cat = k
-            
-            if best_cat:
-                scores[best_cat] += (1.0 * weight)
-        except:
-            continue
-
-    # 정규화
-    total = sum(scores.values())
-    if total == 0: return {k: 0 for k in scores}
-    return {k: int((v / total) * 100) for k, v in scores.items()}
+def get_asset_file(path, width=None):
+    """st.image처럼 파일 경로를 받는 곳용 (변형이 있으면 static/assets/의 WebP, 없으면 source/ 원본)"""
+    entry = get_asset_manifest().get(path)
+    return url_to_file(pick_asset_url(entry, width)) if entry else f"source/{path}"
 
 def search_youtube_videos(keyword, api_key):
-    if not keyword or not keyword.strip():
-        return []
     try:
-        youtube = build('youtube', 'v3', developerKey=api_key)
-        search_response = youtube.search().list(q=keyword, part='snippet', maxResults=3, type='video', regionCode='KR', relevanceLanguage='ko').execute()
-        videos = []
-        for item in search_response.get('items', []):
-            if 'id' in item and 'videoId' in item['id']:
-                videos.append({
-                    'title': item['snippet']['title'],
-                    'thumbnail': item['snippet']['thumbnails']['high']['url'],
-                    'url': f"https://www.youtube.com/watch?v={item['id']['videoId']}",
-                    'channel': item['snippet']['channelTitle']
-                })
-        return videos
+        from youtube_search import search_videos
+        return search_videos(keyword, api_key, YOUTUBE_BASE_URL)
     except Exception as e:
         st.error(f"YouTube API Error: {e}") # [수정 9] 에러 발생 시 사용자에게 알림
         return []
 
 def create_radar_chart(scores):
+    import plotly.graph_objects as go
     categories = ['탄수화물(재미)', '단백질(지식)', '지방(휴식)', '비타민(다양성)']
     values = [scores.get('Carbs', 0), scores.get('Protein', 0), scores.get('Fats', 0), scores.get('Vitamins', 0)]
     values += values[:1]
@@ -992,6 +716,7 @@ def create_radar_chart(scores):
     return fig
 
 def create_gauge_chart(score):
+    import plotly.graph_objects as go
     if score < 40: bar_color, status = "#FF6B6B", "위험"
     elif score < 70: bar_color, status = "#FFD93D", "주의"
     else: bar_color, status = "#6BCF7F", "건강"
@@ -1014,9 +739,9 @@ def create_gauge_chart(score):
 
 # [수정 5] 헤더 생성 헬퍼 함수 (이미지 옆에 텍스트 배치)
 def render_step_header(title, image_filename):
-    b64_img = get_base64_of_bin_file(f"steps/{image_filename}")
-    if b64_img:
-        img_tag = f'<img src="data:image/png;base64,{b64_img}" style="width:100px; height:100px; object-fit:contain;">'
+    img_url = get_asset_url(f"steps/{image_filename}", width=100)
+    if img_url:
+        img_tag = f'<img src="{img_url}" style="width:100px; height:100px; object-fit:contain;">'
     else:
         img_tag = ''
         
@@ -1027,16 +752,9 @@ def render_step_header(title, image_filename):
     </div>
     """, unsafe_allow_html=True)
 
-import base64
-import os
-
 # 1. 이미지를 HTML에 넣기 위해 Base64로 변환하는 도구 함수
 def img_to_base64(img_path):
-    if os.path.exists(img_path):
-        with open(img_path, "rb") as f:
-            data = f.read()
-        return base64.b64encode(data).decode()
-    return None
+    return get_asset_cache().get_base64(os.path.relpath(img_path, "source")) or None
 
 # 2. 보내주신 진단명 -> 이미지 경로 매핑 함수
 def get_diagnosis_image_path(diagnosis_name: str) -> str:
@@ -1076,6 +794,7 @@ if 'current_tab' not in st.session_state: st.session_state.current_tab = 'Introd
 if 'step' not in st.session_state: st.session_state.step = 1
 if 'survey_complete' not in st.session_state: st.session_state.survey_complete = False
 if 'user_context' not in st.session_state: st.session_state.user_context = {}
+if 'session_id' not in st.session_state: st.session_state.session_id = tracing.new_session_id()  # 추적 기록의 세션 ID
 
 # --- 6. 사이드바 네비게이션 ---
 with st.sidebar:
@@ -1103,11 +822,11 @@ with st.sidebar:
 if st.session_state.current_tab == 'Introduction':
     
     # 1. Hero Section
-    hero_bg = get_base64_of_bin_file("hero/hero_banner.png")
+    hero_bg = get_asset_url("hero/hero_banner.png", width=1600)
 
     st.markdown(f"""
     <div class="hero-wrapper">
-        <div class="hero-container" style="background-image: url('data:image/png;base64,{hero_bg}');">
+        <div class="hero-container" style="background-image: url('{hero_bg}');">
             <div class="hero-overlay"></div>
             <div class="hero-content animate-on-load">
                 <h1 class="hero-title" style="font-size: 3.5rem; font-weight: 800; letter-spacing: -1px;">Youtube-Diet</h1>
@@ -1148,8 +867,8 @@ if st.session_state.current_tab == 'Introduction':
     
     def card_block(path, title, desc):
         try:
-            b64 = get_base64_of_bin_file(f"card/{path}")
-            img_html = f'<img src="data:image/png;base64,{b64}" style="width:100%; border-radius:15px; margin-bottom:15px; object-fit: cover; height: 180px;">'
+            img_url = get_asset_url(f"card/{path}", width=400)
+            img_html = f'<img src="{img_url}" style="width:100%; border-radius:15px; margin-bottom:15px; object-fit: cover; height: 180px;">'
         except:
             img_html = ''
         return f"""
@@ -1179,11 +898,11 @@ if st.session_state.current_tab == 'Introduction':
     c1, c2 = st.columns([1.2, 1])
     
     with c1:
-        cluster_img = get_base64_of_bin_file("cluster.png")
+        cluster_img = get_asset_url("cluster.png", width=700)
         if cluster_img:
             st.markdown(f"""
             <div class="glass-card animate-on-load" style="padding: 10px; overflow: hidden; border: 1px solid #eee;">
-                <img src="data:image/png;base64,{cluster_img}" style="width: 100%; object-fit: contain; border-radius: 10px;">
+                <img src="{cluster_img}" style="width: 100%; object-fit: contain; border-radius: 10px;">
                 <div style="padding: 12px; text-align: center;">
                     <p style="font-size: 0.9rem; color: #333; font-weight: bold; margin: 0;">[Figure 1] PCA Cluster Verification</p>
                     <p style="font-size: 0.8rem; color: #666; margin-top: 5px;">4대 정보 영양소(Carbs, Protein, Fats, Vitamins)의<br>벡터 공간상 군집화 검증 완료</p>
@@ -1195,9 +914,9 @@ if st.session_state.current_tab == 'Introduction':
 
     with c2:
         def get_icon_img(name):
-            b64 = get_base64_of_bin_file(f"icons/icon_{name}.svg")
-            if b64:
-                return f'<img src="data:image/svg+xml;base64,{b64}" style="width: 24px; height: 24px; vertical-align: middle; margin-right: 8px;">'
+            img_url = get_asset_url(f"icons/icon_{name}.svg")
+            if img_url:
+                return f'<img src="{img_url}" style="width: 24px; height: 24px; vertical-align: middle; margin-right: 8px;">'
             return "" 
 
         icon_carbs = get_icon_img("carbs")
@@ -1271,8 +990,8 @@ if st.session_state.current_tab == 'Introduction':
     
     def solution_card(img_file, step, label):
         try:
-            b64 = get_base64_of_bin_file(f"steps/{img_file}")
-            img_tag = f'<img src="data:image/png;base64,{b64}" style="width:100%; margin-bottom:15px;">' if b64 else ''
+            img_url = get_asset_url(f"steps/{img_file}", width=250)
+            img_tag = f'<img src="{img_url}" style="width:100%; margin-bottom:15px;">' if img_url else ''
         except:
             img_tag = ''
         
@@ -1552,33 +1271,11 @@ elif st.session_state.current_tab == 'Analyzation':
                         progress_msg.info("📜 텍스트 구조를 분석하여 제목만 추출하는 중... (쇼츠 구간 식별)")
                         
                         try:
-                            client = OpenAI(api_key=openai_key)
-                            cleaning_prompt = """
-                            You are a YouTube Page Text Cleaner.
-                            The user has pasted the raw text dump from YouTube Home/History.
-                            
-                            Task:
-                            1. Extract ONLY the video titles. Remove 'Views', 'Time', 'Channel Name', 'Menu items'.
-                            2. **CRITICAL:** Identify the 'Shorts' section. If a title belongs to the Shorts section (usually appears after the word 'Shorts' or has no duration/timestamp), **APPEND '[Shorts]' to the end of the title.**
-                            (Example: "Funny Cat Video [Shorts]", "How to cook steak")
-                            
-                            Return the titles as a simple list separated by commas.
-                            """
-                            
-                            response = client.chat.completions.create(
-                                model="gpt-4o",
-                                messages=[
-                                    {"role": "system", "content": cleaning_prompt},
-                                    {"role": "user", "content": user_text[:20000]} # 너무 긴 텍스트는 자름
-                                ],
-                                max_tokens=2000
-                            )
-                            
-                            cleaned_text = response.choices[0].message.content
-                            titles_from_text = [
-                                t.strip() for t in cleaned_text.replace("[", "").replace("]", "").replace('"', '').split(',') 
-                                if len(t.strip()) > 1
-                            ]
+                            from openai import OpenAI
+                            from analysis import clean_pasted_text
+                            client = OpenAI(api_key=openai_key, base_url=OPENAI_BASE_URL, max_retries=0)
+                            with session_trace("step2.text"):
+                                titles_from_text, cleaned_text = clean_pasted_text(user_text, client)
                             final_titles.extend(titles_from_text)
                             user_input_payload.append({"type": "text", "text": f"Cleaned Text: {cleaned_text}"})
                             
@@ -1588,12 +1285,17 @@ elif st.session_state.current_tab == 'Analyzation':
 
                     # [Case B] 이미지 입력 처리
                     if has_image:
-                        for img_file in uploaded_files:
-                            b64 = encode_image(img_file)
-                            user_input_payload.append({
-                                "type": "image_url", 
-                                "image_url": {"url": f"data:image/jpeg;base64,{b64}"}
-                            })
+                        from analysis import screenshots_to_payload
+                        try:
+                            # 중복 화면 제외 + 스크롤 겹침 잘라내기 → vision 해상도로 축소/재인코딩 (휴대폰 스크린샷은 상태 표시줄/내비게이션 바 제거)
+                            with session_trace("step2.images"):
+                                image_payload, dedupe_report = screenshots_to_payload(uploaded_files, crop_chrome=CROP_SCREENSHOT_CHROME)
+                        except ValueError as e:
+                            st.error(f"이미지 처리 실패 ({e})")
+                            st.stop()
+                        user_input_payload.extend(image_payload)
+                        if dedupe_report["duplicates"]:
+                            st.info(f"같은 화면의 스크린샷 {dedupe_report['duplicates']}장은 한 번만 분석합니다.")
                     
                     # 데이터 세션 저장
                     st.session_state.user_input_data = user_input_payload
@@ -1614,183 +1316,117 @@ elif st.session_state.current_tab == 'Analyzation':
     # ==========================================
     elif st.session_state.step == 3:
 
-        # 1. 진행률 표시
+        # 1. 진행률 표시 (실제 단계 완료 기준) + 단계별 소요 시간 기록
         progress = st.progress(0, text="분석 준비 중...")
-        client = OpenAI(api_key=st.session_state.openai_key)
+        from openai import OpenAI, AsyncOpenAI
+        from analysis import (extract_titles_from_images, merge_title_counts, score_titles, generate_prescription,
+                              make_result)
+        from embeddings import OpenAIEmbeddingBackend
+        # 이 실행의 OCR/임베딩/진단/영상 검색 구간을 세션 ID와 함께 기록 (st.stop()은 오류로 남기지 않음)
+        with session_trace("step3.analyze", inputs=len(st.session_state.user_input_data),
+                           text_titles=len(st.session_state.raw_text_for_vector)) as trace_root:
+            client = OpenAI(api_key=st.session_state.openai_key, base_url=OPENAI_BASE_URL, max_retries=0)
+            timings = {}
+            analysis_start = stage_start = time.perf_counter()
 
-        # ----------------------------------
-        # 단계 1: 이미지 텍스트 추출 (OCR)
-        # ----------------------------------
-        progress.progress(10, text="이미지에서 텍스트 추출 중...")
-        time.sleep(0.5)
+            # ----------------------------------
+            # 단계 1: 이미지 텍스트 추출 (OCR)
+            # ----------------------------------
+            extracted_titles_from_images = []
 
-        extracted_titles_from_images = []
+            if any(item["type"] == "image_url" for item in st.session_state.user_input_data):
+                progress.progress(5, text="이미지 화면 구조 분석 중 (쇼츠 식별)...")
 
-        if any(item["type"] == "image_url" for item in st.session_state.user_input_data):
-            time.sleep(1)
-            progress.progress(30, text="이미지 화면 구조 분석 중 (쇼츠 식별)...")
+                image_payload = [
+                    item for item in st.session_state.user_input_data
+                    if item["type"] == "image_url"
+                ]
 
-            image_payload = [
-                item for item in st.session_state.user_input_data
-                if item["type"] == "image_url"
-            ]
+                # 스크린샷마다 따로 동시에 요청 → 끝나는 대로 5% → 30% 구간을 채움
+                ocr_failed = {"count": 0}
+
+                def on_ocr_progress(done, total, failed):
+                    ocr_failed["count"] = failed
+                    progress.progress(5 + int(25 * done / total), text=f"이미지 화면 구조 분석 중... ({done}/{total}장)")
 
-            if image_payload:
-                extract_prompt = """
-                You are an advanced AI OCR assistant specialized in YouTube UI analysis.
-                
-                Task:
-                1. Read the screen screenshots and extract ALL video titles accurately.
-                2. Do NOT pick only keywords. Extract the FULL title sentences.
-                3. Ignore UI texts like 'Home', 'Shorts', 'Subscriptions', 'Views', 'Time'.
-                
-                CRITICAL - Shorts Detection:
-                - If a video is under a header explicitly named "Shorts",
-                - OR if the thumbnail has a vertical aspect ratio (9:16) AND has the red "Shorts" logo,
-                - THEN append "[Shorts]" to the end of the title.
-                - OTHERWISE, do NOT append "[Shorts]".
-                
-                Output Format:
-                Return a simple list of strings separated by commas.
-                Example: "How to cook steak, Funny Cat [Shorts], Global Economy News, ..."
-                """
                 try:
-                    ext_response = client.chat.completions.create(
-                        model="gpt-4o",
-                        messages=[
-                            {"role": "system", "content": "You are an AI that extracts text from UI screenshots."},
-                            {"role": "user", "content": image_payload + [{"type": "text", "text": extract_prompt}]}
-                        ],
-                        temperature=0.0,
-                        max_tokens=1000
-                    )
-                    extracted_titles_str = ext_response.choices[0].message.content
-                    
-                    extracted_titles_from_images = (
-                        extracted_titles_str.replace("[", "")
-                        .replace("]", "")
-                        .replace('"', '')
-                        .split(',')
-                    )
+                    extracted_titles_from_images = extract_titles_from_images(image_payload, client, local_ocr=get_ocr_backend(),
+                                                                              on_progress=on_ocr_progress,
+                                                                              title_cache=get_screenshot_title_cache())
                 except Exception as e:
                     st.error(f"이미지 분석 실패: {e}")
+                else:
+                    if ocr_failed["count"]:
+                        st.warning(f"스크린샷 {ocr_failed['count']}장은 분석하지 못해 제외했습니다.")
 
-        # ----------------------------------
-        # 단계 2: 벡터 연산 및 점수 계산
-        # ----------------------------------
-        progress.progress(50, text="벡터 공간에서 영양소 계산 중...")
-        time.sleep(0.7)
+                progress.progress(30, text=f"이미지 분석 완료 ({len(extracted_titles_from_images)}개 제목)")
+            timings['ocr'] = time.perf_counter() - stage_start
 
-        all_titles = extracted_titles_from_images + st.session_state.raw_text_for_vector
-        all_titles = list(set([t.strip() for t in all_titles if len(t.strip()) > 1]))
+            # ----------------------------------
+            # 단계 2: 벡터 연산 및 점수 계산
+            # ----------------------------------
+            stage_start = time.perf_counter()
+            progress.progress(30, text="벡터 공간에서 영양소 계산 중...")
 
-        if not all_titles:
-            st.error("분석할 데이터가 없습니다!")
-            st.stop()
+            # 거의 같은 제목은 한 번만 임베딩하고, 나온 횟수는 점수 가중치로 반영
+            all_titles, title_counts = merge_title_counts(extracted_titles_from_images, st.session_state.raw_text_for_vector)
+            trace_root.set("titles", len(all_titles))
 
-        base_scores = calculate_vector_scores(all_titles, client, st.session_state.user_context)
-        weighted_scores = apply_context_weights(base_scores, st.session_state.user_context)
-        diversity_score = calculate_entropy_score(weighted_scores) 
-        diagnosis_name = diagnose_pattern(weighted_scores, st.session_state.user_context)
+            if not all_titles:
+                st.error("분석할 데이터가 없습니다!")
+                st.stop()
 
-        # ----------------------------------
-        # 단계 3: AI 진단서 및 처방 생성
-        # ----------------------------------
-        progress.progress(80, text="AI 닥터가 맞춤형 처방을 작성 중...")
-        time.sleep(0.7)
+            embedder = get_embedding_backend(client)
+            try:
+                reference = get_exemplar_reference(embedder.model, embedder)
+            except Exception as e:
+                st.error(f"기준 벡터를 불러오지 못했습니다: {e}")
+                st.stop()
 
-        context = st.session_state.user_context
-        
-        # [핵심 로직 추가] 파이썬이 부족한/과잉 영양소를 미리 계산
-        if not weighted_scores:
-             weighted_scores = {"Carbs": 25, "Protein": 25, "Fats": 25, "Vitamins": 25}
+            # 예시 제목 중심점(nearest-centroid)으로 분류 (OpenAI 백엔드는 비동기 동시 요청 경로 사용)
+            make_async_client = None
+            if isinstance(embedder, OpenAIEmbeddingBackend):
+                make_async_client = lambda: AsyncOpenAI(api_key=st.session_state.openai_key, base_url=OPENAI_BASE_URL,
+                                                        max_retries=0)
 
-        min_nutrient = min(weighted_scores, key=weighted_scores.get) # 채워야 할 것
-        max_nutrient = max(weighted_scores, key=weighted_scores.get) # 줄여야 할 것
-        
-        nutrient_map = {
-            "Carbs": "Fun/Entertainment (Comedy, Variety)",
-            "Protein": "Knowledge/Learning (Lecture, News)",
-            "Fats": "Rest/Healing (ASMR, Music)",
-            "Vitamins": "Diversity/Art (Travel, Culture)"
-        }
-        
-        # [프롬프트 수정] 계산된 min/max 정보를 GPT에게 강력하게 주입
-        system_prompt = f"""
-        You are a YouTube content analysis expert. Generate a diagnosis about the user's YouTube viewing habits.
-
-        [Analysis Data]
-        - Diagnosis Name: {diagnosis_name}
-        - **EXCESS Nutrient (Too much):** {nutrient_map[max_nutrient]}
-        - **LACKING Nutrient (Need more):** {nutrient_map[min_nutrient]}
-
-        CRITICAL INSTRUCTIONS:
-        1. **OUTPUT LANGUAGE: MUST BE KOREAN (한국어).**
-        2. **Prescription Goal:** The user consumes too much '{max_nutrient}'. Prescribe content related to '{min_nutrient}' to balance the diet.
-        3. **Search Query Rule:** In 'youtube_search_query', suggest video topics for '{min_nutrient}'. DO NOT recommend '{max_nutrient}'.
-        4. **Word Ban:** Do NOT use words '비타민', '단백질', '탄수화물', '지방' in keyword/query.
-
-        Task:
-        1. 'Prescription Keyword': Catchy keyword for the *LACKING* nutrient.
-        2. 'Summary': Diagnosis summary. Mention excess/lack.
-        3. 'YouTube Search Query': Specific topics for the *LACKING* nutrient.
-
-        IMPORTANT: You MUST return the result in the following JSON format. Do not change the keys.
-        {{
-            "prescription_keyword": "A short, metaphorical title in Korean for the user (e.g., 'Mental Detox', 'Art Vitamin')",
-            "summary_text": "Diagnosis summary in Korean",
-            "youtube_search_query": "A CONCRETE search query in Korean for YouTube. (e.g., 'Funny cat videos', 'Travel vlog', 'ASMR rain sounds'). This must be different from prescription_keyword."
-        }}
-        """
+            def on_embed_progress(done, total):
+                # 30% → 75% 구간을 임베딩 완료 비율로 채움
+                ratio = done / total if total else 1.0
+                progress.progress(30 + int(45 * ratio), text=f"벡터 공간에서 영양소 계산 중... ({done}/{total}개 제목)")
 
-        try:
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "system", "content": system_prompt}],
-                response_format={"type": "json_object"},
-                temperature=0.0,
-                max_tokens=500
-            )
-            gpt_result = json.loads(response.choices[0].message.content)
+            scored = score_titles(all_titles, embedder, st.session_state.user_context,
+                                  cache=get_embedding_cache(), reference=reference,
+                                  make_async_client=make_async_client, on_progress=on_embed_progress, counts=title_counts)
 
-            # --- [여기가 추가된 안전장치입니다] ---
-            raw_search_query = gpt_result.get('youtube_search_query', '')
-            raw_keyword = gpt_result.get('prescription_keyword', '')
+            timings['scoring'] = time.perf_counter() - stage_start
 
-            # 검색어가 비어있거나, 키워드와 너무 똑같으면 '추천' 단어를 붙여서 검색되게 보정
-            if not raw_search_query or raw_search_query == raw_keyword:
-                search_query = f"{raw_keyword} 추천 영상"
-            else:
-                search_query = raw_search_query
             # ----------------------------------
+            # 단계 3: AI 진단서 및 처방 생성
+            # ----------------------------------
+            stage_start = time.perf_counter()
+            progress.progress(75, text="AI 닥터가 맞춤형 처방을 작성 중...")
 
             try:
-                recommended_videos = search_youtube_videos(search_query, st.session_state.youtube_key)
-            except Exception as vid_err:
-                recommended_videos = []
-
-            # 파이썬 가이드 생성 (이것도 파이썬 로직이므로 GPT와 결과가 일치하게 됨)
-            python_recommendations = generate_personalized_recommendations(weighted_scores, st.session_state.user_context)
-
-            result = {
-                'diagnosis_name': diagnosis_name,
-                'scores': weighted_scores,
-                'diversity_score': diversity_score,
-                'summary_text': gpt_result.get('summary_text', '진단 내용을 불러오지 못했습니다.'),
-                'prescription_keyword': gpt_result.get('prescription_keyword', '디지털 밸런스'),
-                'youtube_search_query': search_query, 
-                'recommended_videos': recommended_videos,
-                'recommendations': python_recommendations
-            }
+                prescription = generate_prescription(client, scored['diagnosis_name'], scored['scores'])
+                timings['diagnosis'] = time.perf_counter() - stage_start
 
-            st.session_state.result = result
+                stage_start = time.perf_counter()
+                progress.progress(90, text="처방 영상 검색 중...")
+                try:
+                    recommended_videos = search_youtube_videos(prescription['youtube_search_query'], st.session_state.youtube_key)
+                except Exception as vid_err:
+                    recommended_videos = []
+                timings['video_search'] = time.perf_counter() - stage_start
+                timings['total'] = time.perf_counter() - analysis_start
+
+                st.session_state.result = make_result(scored, prescription, recommended_videos,
+                                                      st.session_state.user_context, timings)
 
-        except Exception as e:
-            st.error(f"AI 진단 생성 중 오류 발생: {e}")
-            st.stop()
+            except Exception as e:
+                st.error(f"AI 진단 생성 중 오류 발생: {e}")
+                st.stop()
 
-        progress.progress(100, text="✔ 분석 완료!")
-        time.sleep(0.5)
+            progress.progress(100, text=f"✔ 분석 완료! ({timings['total']:.1f}초)")
 
         st.session_state.step = 4
         st.rerun()
@@ -1800,8 +1436,6 @@ elif st.session_state.current_tab == 'Analyzation':
 # ==========================================
     elif st.session_state.step == 4:
         import html
-        import os
-        import base64
         
         render_step_header("STEP 4. 영양 불균형 진단", "step4_diagnosis.png")
         res = st.session_state.result
@@ -1809,12 +1443,12 @@ elif st.session_state.current_tab == 'Analyzation':
         # 1. 진단명 이미지 및 데이터 준비
         diagnosis_name = res['diagnosis_name']
         char_path = get_diagnosis_image_path(diagnosis_name)
-        char_b64 = get_base64_of_bin_file(char_path)
+        char_url = get_asset_url(char_path, width=250)
         
         # 이미지 태그 생성 (없으면 빈 문자열)
         img_tag_html = ""
-        if char_b64:
-            img_tag_html = f'<img src="data:image/png;base64,{char_b64}" style="width:250px; max-width:100%; margin-right:0px; margin-bottom:20px; border-radius:15px;">'
+        if char_url:
+            img_tag_html = f'<img src="{char_url}" style="width:250px; max-width:100%; margin-right:0px; margin-bottom:20px; border-radius:15px;">'
 
         # 2. [핵심 수정] 진단명 카드 HTML 생성
         # 주의: f-string 내부의 HTML 태그들을 왼쪽 벽(line start)에 붙여서 
@@ -1898,13 +1532,13 @@ elif st.session_state.current_tab == 'Analyzation':
             # 뱃지 표시 로직
             badges_earned = []
             if 30 < res['scores']['Carbs'] < 40:
-                badges_earned.append(("source/badges/badge_balance.png", "균형왕"))
+                badges_earned.append((get_asset_file("badges/badge_balance.png", width=60), "균형왕"))
             if res['scores']['Protein'] > 30:
-                badges_earned.append(("source/badges/badge_study.png", "학습왕"))
+                badges_earned.append((get_asset_file("badges/badge_study.png", width=60), "학습왕"))
             if res['scores']['Fats'] > 30:
-                badges_earned.append(("source/badges/badge_rest.png", "휴식왕"))
+                badges_earned.append((get_asset_file("badges/badge_rest.png", width=60), "휴식왕"))
             if res['scores']['Vitamins'] > 30:
-                badges_earned.append(("source/badges/badge_diversity.png", "다양성왕"))
+                badges_earned.append((get_asset_file("badges/badge_diversity.png", width=60), "다양성왕"))
             
             if badges_earned:
                 badge_cols = st.columns(4) # 한 줄에 4개까지
@@ -1939,6 +1573,13 @@ elif st.session_state.current_tab == 'Analyzation':
 """
             st.markdown(summary_card_html, unsafe_allow_html=True)
 
+        # 단계별 실제 소요 시간 (STEP 3에서 기록)
+        timings = res.get('timings', {})
+        if timings:
+            stage_labels = {"ocr": "이미지 분석", "scoring": "벡터 분석", "diagnosis": "AI 진단", "video_search": "영상 검색", "total": "전체"}
+            st.caption(" · ".join(f"{stage_labels.get(k, k)} {v:.1f}초" for k, v in timings.items())
+                       + f" · 세션 ID {st.session_state.session_id[:8]}")  # 느리다는 문의가 오면 이 ID로 추적 기록을 찾음
+
         st.markdown("---")
 
         _, btn_col, _ = st.columns([3, 2, 3])
@@ -1970,7 +1611,8 @@ elif st.session_state.current_tab == 'Analyzation':
         
         if not videos:
              # 데이터가 비어있을 경우에만 API 호출
-             videos = search_youtube_videos(search_query, st.session_state.youtube_key)
+             with session_trace("step5.video_search"):
+                 videos = search_youtube_videos(search_query, st.session_state.youtube_key)
         
         if videos:
             cols = st.columns(3)
@@ -0,0 +1,71 @@
+"""
+화면용 이미지 base64 캐시 (프로세스 단위 LRU, 바이트 예산 기반)
+Streamlit은 위젯을 누를 때마다 스크립트 전체를 다시 실행하므로, source/의 배너/아이콘/캐릭터 이미지를
+매번 디스크에서 읽고 base64로 인코딩하지 않도록 인코딩 결과를 세션끼리 공유합니다.
+
+파일 수정 시각(mtime)과 크기가 바뀌면 다시 읽습니다. (조회할 때마다 os.stat 한 번)
+"""
+import base64
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024   # base64 문자열 기준 (source/ 전체는 약 40MB)
+
+
+class AssetCache:
+    def __init__(self, root="source", max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._lru = OrderedDict()   # 경로 → (mtime_ns, 파일 크기, base64 문자열)
+        self._bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def _put(self, path, entry):
+        with self._lock:
+            old = self._lru.pop(path, None)
+            if old is not None:
+                self._bytes -= len(old[2])
+            if len(entry[2]) > self.max_bytes:
+                return
+            self._lru[path] = entry
+            self._bytes += len(entry[2])
+            while self._bytes > self.max_bytes:
+                _, dropped = self._lru.popitem(last=False)
+                self._bytes -= len(dropped[2])
+                self.stats["evictions"] += 1
+
+    def get_base64(self, path):
+        """root 기준 상대 경로 → base64 문자열 (파일이 없으면 "")"""
+        full_path = os.path.join(self.root, path)
+        try:
+            st = os.stat(full_path)
+        except OSError:
+            return ""
+        with self._lock:
+            entry = self._lru.get(full_path)
+            if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                self._lru.move_to_end(full_path)
+                self.stats["hits"] += 1
+                return entry[2]
+            self.stats["misses"] += 1
+
+        with open(full_path, "rb") as f:
+            encoded = base64.b64encode(f.read()).decode()
+        self._put(full_path, (st.st_mtime_ns, st.st_size, encoded))
+        return encoded
+
+    def warm(self, extensions=(".png", ".jpg", ".jpeg", ".svg")):
+        """root 아래 이미지를 미리 인코딩 (예산을 넘으면 LRU로 앞의 것부터 밀려남). 인코딩한 파일 수 반환"""
+        count = 0
+        for directory, _, files in os.walk(self.root):
+            for name in sorted(files):
+                if name.lower().endswith(extensions):
+                    self.get_base64(os.path.relpath(os.path.join(directory, name), self.root))
+                    count += 1
+        return count
+
+    def memory_bytes(self):
+        with self._lock:
+            return self._bytes
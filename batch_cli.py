@@ -0,0 +1,131 @@
+"""
+YouTube Diet 배치 분석 CLI
+JSONL 피드를 한 줄씩 읽어 프로세스 풀에서 analyze()를 돌리고, 결과를 같은 순서의 JSONL로 씁니다.
+
+입력 한 줄 예시:
+    {"id": "u1", "titles": ["...", "..."], "context": {"watch_time": "잠들기 전", "is_premium": false}}
+    {"id": "u2", "text": "<유튜브 홈 화면 Ctrl+A 붙여넣기>"}
+    {"id": "u3", "images": ["shots/u3_1.png", "shots/u3_2.png"]}
+
+실행:
+    OPENAI_API_KEY=... python batch_cli.py feeds.jsonl -o results.jsonl --workers 4
+    python batch_cli.py feeds.jsonl --backend hashing --no-prescription   (API 키 없이 점수/진단만)
+    python batch_cli.py feeds.jsonl --trace .cache/traces/batch.jsonl   (피드별 구간 추적, 세션 ID = 피드 id)
+"""
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from analysis import analyze, make_embedding_backend
+from anchors import load_or_build_exemplars
+from embedding_cache import EmbeddingCache
+from ocr import make_ocr_backend
+from screenshot_dedupe import ScreenshotTitleCache
+import tracing
+
+# 워커 프로세스마다 한 번만 만드는 자원
+_worker = {}
+
+
+def init_worker(backend_name, cache_path, prescribe, ocr_name="vision", trace_path=None):
+    client = None
+    if backend_name != "hashing" or prescribe:
+        from openai import OpenAI
+        client = OpenAI(max_retries=0)   # 재시도는 analysis/embeddings에서만 (SDK 재시도와 겹치지 않게)
+    embedder = make_embedding_backend(backend_name, client)
+    _worker.update(
+        client=client,
+        embedder=embedder,
+        cache=EmbeddingCache(cache_path) if cache_path else None,   # SQLite(WAL)는 워커끼리 공유해도 안전
+        reference=load_or_build_exemplars(embedder),
+        youtube_key=os.environ.get("YOUTUBE_API_KEY") if prescribe else None,
+        prescribe=prescribe,
+        local_ocr=make_ocr_backend(ocr_name, processes=1),   # 이미 워커 프로세스 안이므로 OCR 풀은 1개
+        title_cache=ScreenshotTitleCache(),   # 같은 화면이 여러 피드에 있으면 워커 안에서 재사용
+        exporter=tracing.JsonlFileExporter(trace_path) if trace_path else None,
+    )
+
+
+def run_feed(line, line_no=None):
+    """피드 한 줄 → 결과 레코드. JSON이 깨졌거나 분석이 실패해도 예외 대신 {"line", "error"} 레코드를 반환"""
+    feed = {}
+    try:
+        feed = json.loads(line)
+        if not isinstance(feed, dict):
+            raise ValueError("feed must be a JSON object")
+        session_id = str(feed.get("id") or tracing.new_session_id())
+        with tracing.trace("batch.analyze", _worker["exporter"], session_id):
+            result = analyze(
+                titles=feed.get("titles"), text=feed.get("text"), images=feed.get("images"),
+                context=feed.get("context"), client=_worker["client"], embedder=_worker["embedder"],
+                cache=_worker["cache"], reference=_worker["reference"],
+                youtube_key=_worker["youtube_key"], prescribe=_worker["prescribe"], local_ocr=_worker["local_ocr"],
+                title_cache=_worker["title_cache"],
+            )
+        return {"id": feed.get("id"), "result": result}
+    except Exception as e:
+        return {"id": feed.get("id") if isinstance(feed, dict) else None, "line": line_no,
+                "error": f"{type(e).__name__}: {e}"}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="YouTube Diet 배치 분석 (JSONL in → JSONL out)")
+    parser.add_argument("input", help="입력 JSONL 경로 ('-'면 표준입력)")
+    parser.add_argument("-o", "--output", default="-", help="출력 JSONL 경로 (기본: 표준출력)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--backend", choices=["openai", "hashing"], default="openai", help="임베딩 백엔드")
+    parser.add_argument("--cache", default=os.path.join(".cache", "embeddings.sqlite3"),
+                        help="임베딩 캐시 SQLite 경로 ('' 이면 사용 안 함)")
+    parser.add_argument("--no-prescription", action="store_true", help="GPT 처방/영상 검색 생략")
+    parser.add_argument("--ocr", choices=["vision", "tesseract"], default="vision",
+                        help="스크린샷 OCR (tesseract: 로컬 우선, 신뢰도가 낮으면 vision)")
+    parser.add_argument("--trace", default="", help="피드별 구간 추적 JSON lines 경로 (OTLP 형식, 기본: 기록 안 함)")
+    args = parser.parse_args(argv)
+
+    # 워커 초기화(init_worker)에서 실패하면 원인 없이 BrokenProcessPool만 보이므로 클라이언트를 먼저 만들어 봄
+    if args.backend != "hashing" or not args.no_prescription:
+        try:
+            from openai import OpenAI
+            OpenAI()
+        except Exception as e:
+            parser.error(f"OpenAI 클라이언트를 만들 수 없습니다 ({e}). OPENAI_API_KEY를 설정하거나 "
+                         "--backend hashing --no-prescription 으로 실행하세요")
+
+    src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    window = args.workers * 4   # 동시에 처리 중인 피드 수 제한 (입력 전체를 메모리에 올리지 않음)
+
+    done = failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                             initargs=(args.backend, args.cache, not args.no_prescription, args.ocr,
+                                       args.trace)) as pool:
+        pending = deque()
+
+        def flush_one():
+            nonlocal done, failed
+            record = pending.popleft().result()
+            dst.write(json.dumps(record, ensure_ascii=False) + "\n")
+            done += 1
+            failed += "error" in record
+
+        for line_no, line in enumerate(src, 1):
+            if not line.strip():
+                continue
+            pending.append(pool.submit(run_feed, line, line_no))
+            if len(pending) >= window:
+                flush_one()
+        while pending:
+            flush_one()
+
+    if dst is not sys.stdout:
+        dst.close()
+    if src is not sys.stdin:
+        src.close()
+    print(f"done: {done} feeds, {failed} failed", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
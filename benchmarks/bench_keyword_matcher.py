@@ -0,0 +1,66 @@
+"""
+apply_keyword_boost 벤치마크: 기존 선형 탐색(any(k in title)) vs Aho-Corasick 매처
+
+실행: python benchmarks/bench_keyword_matcher.py [제목 수]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keywords import KEYWORD_TABLE, get_matcher, keyword_boost_weights  # noqa: E402
+
+
+def legacy_keyword_boost(title, is_premium=False):
+    """변경 전 apply_keyword_boost (호출마다 키워드 리스트 생성 + 영양소별 선형 탐색, 첫 적중 우선)"""
+    title_lower = title.lower()
+    carbs_keywords = list(KEYWORD_TABLE["Carbs"])
+    fats_keywords = list(KEYWORD_TABLE["Fats"])
+    protein_keywords = list(KEYWORD_TABLE["Protein"])
+    vitamin_keywords = list(KEYWORD_TABLE["Vitamins"])
+    if any(k in title_lower for k in carbs_keywords):
+        return "Carbs", 2.0
+    if any(k in title_lower for k in fats_keywords):
+        return ("Fats", 0.8) if is_premium else ("Fats", 1.5)
+    if any(k in title_lower for k in protein_keywords):
+        return "Protein", 2.0
+    if any(k in title_lower for k in vitamin_keywords):
+        return "Vitamins", 1.8
+    return None, 1.0
+
+
+def make_titles(n, seed=0):
+    rng = random.Random(seed)
+    keywords = [k for words in KEYWORD_TABLE.values() for k in words]
+    filler = ["오늘", "진짜", "이건", "무조건", "봐야 할", "the", "best", "ever", "브이", "2024", "|", "모음", "EP.3"]
+    titles = []
+    for _ in range(n):
+        words = [rng.choice(filler) for _ in range(rng.randint(4, 10))]
+        for _ in range(rng.choice([0, 0, 1, 1, 2])):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+        titles.append(" ".join(words))
+    return titles
+
+
+def timed(fn, titles):
+    start = time.perf_counter()
+    for t in titles:
+        fn(t)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    titles = make_titles(n)
+    get_matcher()   # 컴파일 시간은 제외 (프로세스당 1회)
+
+    legacy = timed(legacy_keyword_boost, titles)
+    matcher = timed(get_matcher().count, titles)
+    weights = timed(keyword_boost_weights, titles)
+
+    print(f"titles: {n}")
+    print(f"legacy any(k in title) : {legacy:.3f}s ({n / legacy:,.0f} titles/s)")
+    print(f"aho-corasick count     : {matcher:.3f}s ({n / matcher:,.0f} titles/s)")
+    print(f"keyword_boost_weights  : {weights:.3f}s ({n / weights:,.0f} titles/s)")
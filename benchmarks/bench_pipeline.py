@@ -0,0 +1,162 @@
+"""
+분석 파이프라인 마이크로벤치마크
+합성 피드(10 ~ 100k 제목)와 가짜 임베딩 클라이언트로 함수별 처리량과 메모리 할당량을 재고 JSON으로 저장합니다.
+이전 결과 파일을 --compare로 주면 함수/크기별 속도 비율을 같이 출력합니다.
+
+실행: python benchmarks/bench_pipeline.py
+      python benchmarks/bench_pipeline.py --sizes 10,1000 --only calculate_vector_scores --compare benchmarks/results/<이전>.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis import (apply_context_weights, apply_keyword_boost, calculate_entropy_score,  # noqa: E402
+                      calculate_vector_scores, diagnose_pattern, filter_invalid_titles, is_likely_shorts,
+                      merge_title_counts)
+from anchors import build_exemplar_artifact, load_exemplar_artifact  # noqa: E402
+from benchmarks.fake_openai import FakeOpenAI  # noqa: E402
+from benchmarks.feeds import make_context, make_feed, make_paste, make_score_dicts  # noqa: E402
+from embeddings import as_backend  # noqa: E402
+from paste_parser import parse_pasted_text  # noqa: E402
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+RESULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def make_cases(dim):
+    """{함수 이름: (n → 실행할 인자 없는 함수)} — 입력 준비 시간은 측정에서 빠짐"""
+    client = FakeOpenAI(dim)
+    # 앱/analyze()와 같은 기준: 예시 제목(STANDARD_DATA) 중심점 (실제 artifacts/를 건드리지 않도록 임시 폴더에 빌드)
+    backend = as_backend(client)
+    with tempfile.TemporaryDirectory() as directory:
+        build_exemplar_artifact(backend, directory=directory)
+        reference = load_exemplar_artifact(backend.model, directory=directory)
+
+    def feed_case(fn):
+        def setup(n):
+            titles = make_feed(n)
+            return lambda: fn(titles)
+        return setup
+
+    def per_title_case(fn):
+        return feed_case(lambda titles: [fn(t) for t in titles])
+
+    def paste_case(n):
+        text = make_paste(n)
+        return lambda: parse_pasted_text(text)
+
+    def vector_scores(n):
+        titles, context = make_feed(n), make_context()
+        return lambda: calculate_vector_scores(titles, client, context, anchors=reference["centroids"])
+
+    def per_score_case(fn):
+        def setup(n):
+            dicts, context = make_score_dicts(n), make_context()
+            return lambda: [fn(d, context) for d in dicts]
+        return setup
+
+    return {
+        "parse_pasted_text": paste_case,   # n = 화면 카드 수
+        "filter_invalid_titles": feed_case(filter_invalid_titles),
+        "merge_title_counts": feed_case(merge_title_counts),
+        "is_likely_shorts": per_title_case(is_likely_shorts),
+        "apply_keyword_boost": per_title_case(apply_keyword_boost),
+        "calculate_vector_scores": vector_scores,
+        # 아래 셋은 피드당 1번 호출되는 함수라 n번 반복 호출로 잽니다
+        "apply_context_weights": per_score_case(apply_context_weights),
+        "calculate_entropy_score": per_score_case(lambda scores, _context: calculate_entropy_score(scores)),
+        "diagnose_pattern": per_score_case(diagnose_pattern),
+    }
+
+
+def repeats_for(n):
+    return 5 if n <= 1_000 else 3 if n <= 10_000 else 1
+
+
+def measure(run, repeat):
+    """(최소 실행 시간, tracemalloc 최대 메모리, 할당 블록 수) — 시간은 tracemalloc 없이 따로 잼"""
+    run()   # 워밍업 (lru_cache, 매처 컴파일 등)
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    result = run()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(s.count_diff for s in after.compare_to(before, "filename") if s.count_diff > 0)
+    del result
+    return best, peak, blocks
+
+
+def run_suite(sizes, only=None, dim=1536):
+    cases = make_cases(dim)
+    results = []
+    for name, setup in cases.items():
+        if only and name not in only:
+            continue
+        for n in sizes:
+            seconds, peak, blocks = measure(setup(n), repeats_for(n))
+            row = {"function": name, "n": n, "seconds": round(seconds, 6),
+                   "items_per_sec": round(n / seconds, 1) if seconds else None,
+                   "peak_bytes": peak, "retained_blocks": blocks}
+            results.append(row)
+            print(f"{name:<24} n={n:<7} {seconds * 1000:>10.2f} ms  {row['items_per_sec'] or 0:>14,.0f} /s  "
+                  f"peak {peak / 1024:>10,.0f} KiB", flush=True)
+    return results
+
+
+def compare(results, previous_path):
+    with open(previous_path, encoding="utf-8") as f:
+        previous = {(r["function"], r["n"]): r for r in json.load(f)["results"]}
+    print(f"\n--- vs {previous_path} (time ratio, <1 이면 빨라짐) ---")
+    for row in results:
+        old = previous.get((row["function"], row["n"]))
+        if not old or not old["seconds"]:
+            continue
+        ratio = row["seconds"] / old["seconds"]
+        mark = "  ⚠️ slower" if ratio > 1.1 else ""
+        print(f"{row['function']:<24} n={row['n']:<7} x{ratio:.2f}  peak x{row['peak_bytes'] / max(old['peak_bytes'], 1):.2f}{mark}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="분석 파이프라인 마이크로벤치마크")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="쉼표로 구분한 피드 크기")
+    parser.add_argument("--only", default="", help="쉼표로 구분한 함수 이름 (기본: 전부)")
+    parser.add_argument("--dim", type=int, default=1536, help="가짜 임베딩 차원")
+    parser.add_argument("-o", "--output", help=f"결과 JSON 경로 (기본: {RESULT_DIR}/pipeline_<시각>.json)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    only = {s for s in args.only.split(",") if s}
+    results = run_suite(sizes, only, args.dim)
+
+    output = args.output or os.path.join(RESULT_DIR, time.strftime("pipeline_%Y%m%d_%H%M%S.json"))
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                   "machine": platform.machine(), "dim": args.dim, "results": results}, f, ensure_ascii=False, indent=2)
+    print(f"\nsaved: {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
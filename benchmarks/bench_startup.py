@@ -0,0 +1,198 @@
+"""
+Streamlit 앱 콜드 스타트 벤치마크
+화면(탭/단계)마다 새 프로세스를 띄워 streamlit import 시간, 첫 렌더링 시간(앱 스크립트의 import 포함), 다시 실행(rerun) 시간을 재고
+첫 렌더링 동안 새로 올라온 무거운 모듈(openai, numpy, googleapiclient 등)을 같이 적어서 JSON으로 저장합니다.
+- streamlit/AppTest import 뒤의 sys.modules를 기준으로, 그 뒤에 올라온 모듈만 셉니다. (AppTest가 올리는 plotly 등 제외)
+- 그중 import 문을 실행한 파일이 이 저장소(앱/분석 모듈)인 것만 heavy_modules로,
+  Streamlit 내부(예: set_page_config의 page_icon 처리가 올리는 PIL/numpy)가 올린 것은 streamlit_modules로 따로 적습니다.
+네트워크는 쓰지 않습니다. (STEP 4/5 결과는 부모 프로세스에서 hashing 임베딩 백엔드로 한 번 만들어 JSON으로 넘김)
+
+실행: python benchmarks/bench_startup.py
+      python benchmarks/bench_startup.py --repeat 5 --only introduction --compare benchmarks/results/<이전>.json
+"""
+import argparse
+import builtins
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app_final_v2.py")
+RESULT_DIR = os.path.join(ROOT, "benchmarks", "results")
+HEAVY_MODULES = ["openai", "httpx", "numpy", "googleapiclient", "plotly.graph_objects", "PIL.Image", "pytesseract"]
+CONTEXT = {"watch_time": "잠들기 전", "shorts_heavy": True, "is_premium": False, "daily_hours": "3~4시간"}
+
+# 화면 이름 → session_state
+SCREENS = {
+    "introduction": {"current_tab": "Introduction"},
+    "step1_survey": {"current_tab": "Analyzation", "step": 1},
+    "step2_collect": {"current_tab": "Analyzation", "step": 2, "survey_complete": True, "user_context": CONTEXT},
+    "step4_diagnosis": {"current_tab": "Analyzation", "step": 4, "survey_complete": True, "user_context": CONTEXT,
+                        "result": "analyze"},
+    "step5_prescription": {"current_tab": "Analyzation", "step": 5, "survey_complete": True, "user_context": CONTEXT,
+                           "result": "analyze"},
+}
+
+
+def make_result():
+    """STEP 4/5 화면용 결과 (hashing 백엔드, 처방/영상 검색 없이)"""
+    sys.path.insert(0, ROOT)
+    from analysis import analyze
+    from anchors import load_or_build_exemplars
+    from embeddings import HashingEmbeddingBackend
+
+    embedder = HashingEmbeddingBackend()
+    with tempfile.TemporaryDirectory() as directory:
+        reference = load_or_build_exemplars(embedder, directory=directory)
+        result = analyze(titles=["파이썬 코딩 강의 1강", "먹방 ASMR 레전드", "빗소리 10시간 수면", "우주의 기원 다큐"],
+                         context=CONTEXT, embedder=embedder, reference=reference, prescribe=False)
+    result.update(summary_text="요약", prescription_keyword="다큐", youtube_search_query="다큐 추천",
+                  recommended_videos=[{"title": "다큐 추천", "thumbnail": "", "url": "https://www.youtube.com/watch?v=bench",
+                                       "channel": "bench"}])   # STEP 5가 YouTube 검색을 하지 않도록
+    return result
+
+
+def track_heavy_imports():
+    """이후 처음 올라오는 HEAVY_MODULES → 그 import 문을 실행한 파일 (import 1번당 sys.modules 조회 몇 번만 추가)"""
+    origins = {}
+    original_import = builtins.__import__
+
+    def tracking_import(name, globals=None, locals=None, fromlist=(), level=0):
+        names = [name, *(f"{name}.{item}" for item in fromlist or ())] if level == 0 else []
+        pending = [n for n in names if n in HEAVY_MODULES and n not in sys.modules and n not in origins]
+        module = original_import(name, globals, locals, fromlist, level)
+        for loaded in pending:
+            if loaded in sys.modules:
+                origins[loaded] = (globals or {}).get("__file__") or "?"
+        return module
+
+    builtins.__import__ = tracking_import
+    return origins
+
+
+def from_repo(path):
+    path = os.path.abspath(path)
+    return path.startswith(ROOT + os.sep) and os.sep + "site-packages" + os.sep not in path
+
+
+def run_child(screen, result_path):
+    """(자식 프로세스) 한 화면을 처음 그리고 측정값을 JSON 한 줄로 출력"""
+    state = dict(SCREENS[screen])
+    result = None
+    if state.pop("result", None):
+        with open(result_path, encoding="utf-8") as f:
+            result = json.load(f)
+
+    start = time.perf_counter()
+    import streamlit  # noqa: F401
+    from streamlit.testing.v1 import AppTest
+    import_seconds = time.perf_counter() - start
+    origins = track_heavy_imports()   # 여기까지 올라온 모듈(streamlit, AppTest)은 앱이 올린 것이 아님
+
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    at.session_state["openai_key"] = "sk-bench"
+    at.session_state["youtube_key"] = "yt-bench"
+    for key, value in state.items():
+        at.session_state[key] = value
+    if result is not None:
+        at.session_state["result"] = result
+
+    start = time.perf_counter()
+    at.run()
+    first_render = time.perf_counter() - start
+    start = time.perf_counter()
+    at.run()
+    rerun = time.perf_counter() - start
+
+    print(json.dumps({
+        "screen": screen,
+        "import_streamlit": round(import_seconds, 4),
+        "first_render": round(first_render, 4),
+        "rerun": round(rerun, 4),
+        "heavy_modules": [name for name in HEAVY_MODULES if name in origins and from_repo(origins[name])],
+        "streamlit_modules": [name for name in HEAVY_MODULES if name in origins and not from_repo(origins[name])],
+        "errors": [str(e.value) for e in at.exception] + [str(e.value) for e in at.error],
+    }, ensure_ascii=False))
+
+
+def measure(screen, repeat, result_path):
+    """새 프로세스 repeat번 → 중앙값 (process 는 프로세스 시작부터 끝까지 전체 시간)"""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", screen, "--result", result_path],
+                             cwd=ROOT,
+                             capture_output=True, text=True, check=True).stdout
+        row = json.loads(out.strip().splitlines()[-1])
+        row["process"] = time.perf_counter() - start
+        runs.append(row)
+    summary = {key: round(statistics.median(r[key] for r in runs), 4)
+               for key in ("process", "import_streamlit", "first_render", "rerun")}
+    summary.update(screen=screen, repeat=repeat, heavy_modules=runs[-1]["heavy_modules"],
+                   streamlit_modules=runs[-1]["streamlit_modules"], errors=runs[-1]["errors"])
+    return summary
+
+
+def compare(results, previous_path):
+    with open(previous_path, encoding="utf-8") as f:
+        previous = {r["screen"]: r for r in json.load(f)["results"]}
+    print(f"\n--- vs {previous_path} (time ratio, <1 이면 빨라짐) ---")
+    for row in results:
+        old = previous.get(row["screen"])
+        if not old:
+            continue
+        ratios = "  ".join(f"{key} x{row[key] / old[key]:.2f}" for key in ("process", "first_render", "rerun") if old[key])
+        print(f"{row['screen']:<20} {ratios}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streamlit 앱 콜드 스타트 벤치마크")
+    parser.add_argument("--repeat", type=int, default=3, help="화면마다 새 프로세스 실행 횟수 (중앙값)")
+    parser.add_argument("--only", default="", help="쉼표로 구분한 화면 이름 (기본: 전부)")
+    parser.add_argument("-o", "--output", help=f"결과 JSON 경로 (기본: {RESULT_DIR}/startup_<시각>.json)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.child, args.result)
+        return
+
+    only = {s for s in args.only.split(",") if s}
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8") as f:
+        json.dump(make_result(), f, ensure_ascii=False)
+        result_path = f.name
+    results = []
+    for screen in SCREENS:
+        if only and screen not in only:
+            continue
+        row = measure(screen, args.repeat, result_path)
+        results.append(row)
+        print(f"{screen:<20} process {row['process'] * 1000:>7.0f} ms  import streamlit {row['import_streamlit'] * 1000:>6.0f} ms  "
+              f"first render {row['first_render'] * 1000:>6.0f} ms  rerun {row['rerun'] * 1000:>5.0f} ms  "
+              f"heavy (app): {', '.join(row['heavy_modules']) or '-'}"
+              f"  (streamlit: {', '.join(row['streamlit_modules']) or '-'})"
+              f"{'  ⚠️ ' + row['errors'][0] if row['errors'] else ''}",
+              flush=True)
+
+    os.remove(result_path)
+
+    output = args.output or os.path.join(RESULT_DIR, time.strftime("startup_%Y%m%d_%H%M%S.json"))
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                   "machine": platform.machine(), "results": results}, f, ensure_ascii=False, indent=2)
+    print(f"\nsaved: {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
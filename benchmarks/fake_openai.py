@@ -0,0 +1,37 @@
+"""
+결정적인(deterministic) 가짜 OpenAI 임베딩 클라이언트
+client.embeddings.create(input=[...], model=...) 형태만 흉내 냅니다. 네트워크 없이 같은 제목이면 항상 같은 벡터를 돌려줍니다.
+실제 API처럼 embedding은 float 리스트이고, data 순서는 뒤집어서(index로 정렬해야 맞음) 반환합니다.
+"""
+import hashlib
+from types import SimpleNamespace
+
+import numpy as np
+
+DEFAULT_DIM = 1536   # text-embedding-3-small과 같은 차원
+
+
+def fake_vector(text, dim=DEFAULT_DIM):
+    seed = int.from_bytes(hashlib.md5(text.encode("utf-8")).digest()[:8], "little")
+    return np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+
+
+class FakeEmbeddings:
+    def __init__(self, dim):
+        self.dim = dim
+        self.calls = 0
+        self.inputs = 0
+
+    def create(self, input, model, **kwargs):
+        texts = [input] if isinstance(input, str) else list(input)
+        self.calls += 1
+        self.inputs += len(texts)
+        data = [SimpleNamespace(index=i, embedding=fake_vector(t, self.dim).tolist()) for i, t in enumerate(texts)]
+        return SimpleNamespace(data=data[::-1], model=model)
+
+
+class FakeOpenAI:
+    """OpenAI() 대신 넘기는 객체 (embeddings만 지원)"""
+
+    def __init__(self, dim=DEFAULT_DIM):
+        self.embeddings = FakeEmbeddings(dim)
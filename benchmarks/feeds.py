@@ -0,0 +1,128 @@
+"""
+벤치마크용 합성 피드 생성기
+한국어/영어 제목, 쇼츠 태그, 이모지, 유튜브 UI 잡음(메뉴 이름, 조회수, URL)을 섞어서
+실제 Ctrl+A 붙여넣기/OCR 결과와 비슷한 제목 리스트를 만듭니다. 같은 seed면 항상 같은 피드가 나옵니다.
+"""
+import io
+import random
+
+from keywords import KEYWORD_TABLE
+
+KO_SUBJECTS = ["고양이", "강아지", "아이폰", "서울 맛집", "부동산", "주식", "반도체", "파이썬", "엑셀", "다이어트",
+               "캠핑", "제주도", "월급", "자취 요리", "토익", "연애", "출근길", "노트북", "스마트폰", "헬스"]
+KO_TEMPLATES = ["{s} 이거 모르면 손해", "{s} 완벽 정리 (10분 요약)", "요즘 난리난 {s} 근황", "{s} 1년 해보고 느낀 점",
+                "[{k}] {s} 솔직 후기", "{s} 하는 법 | 초보자 가이드", "역대급 {s} {k} 모음", "{s}ㅋㅋㅋ 이건 못 참지",
+                "{k} 보면서 {s} 이야기", "EP.{n} {s} 브이로그"]
+EN_SUBJECTS = ["iPhone", "Python", "New York", "coffee", "minimalism", "productivity", "AI", "guitar", "cat", "budget travel"]
+EN_TEMPLATES = ["I tried {s} for 30 days", "The truth about {s}", "{s} explained in {n} minutes", "{k} | {s} edition",
+                "Why {s} is everywhere now", "Top {n} {s} tips", "{s} {k} compilation"]
+TAGS = ["", "", "", " #shorts", " #쇼츠", " 🔥", " 😂", " [4K]", " (ft. 친구)"]
+NOISE = ["홈", "Shorts", "구독", "재생목록", "조회수 1.2만회", "3일 전", "12:34", "더보기", "YouTube Premium",
+         "https://youtu.be/abc123", "2024", "맞춤설정", "알림", "오프라인 저장", "www.youtube.com"]
+
+
+def make_title(rng):
+    keyword = rng.choice([k for words in KEYWORD_TABLE.values() for k in words]) if rng.random() < 0.5 else ""
+    if rng.random() < 0.7:
+        template, subject = rng.choice(KO_TEMPLATES), rng.choice(KO_SUBJECTS)
+    else:
+        template, subject = rng.choice(EN_TEMPLATES), rng.choice(EN_SUBJECTS)
+    title = template.format(s=subject, k=keyword, n=rng.randint(1, 99))
+    return " ".join(title.split()) + rng.choice(TAGS)
+
+
+def make_feed(n, seed=0, noise_ratio=0.15, repeat_ratio=0.1):
+    """
+    제목 n개 리스트.
+    - noise_ratio: UI 잡음 줄 비율 (filter_invalid_titles가 걸러야 하는 줄)
+    - repeat_ratio: 앞에서 나온 제목을 다시 넣는 비율 (홈 화면 새로고침/여러 스크린샷 겹침 흉내)
+    """
+    rng = random.Random(seed)
+    feed = []
+    for _ in range(n):
+        r = rng.random()
+        if r < noise_ratio:
+            feed.append(rng.choice(NOISE))
+        elif r < noise_ratio + repeat_ratio and feed:
+            feed.append(rng.choice(feed))
+        else:
+            feed.append(make_title(rng))
+    return feed
+
+
+def make_paste(n, seed=0, shorts_ratio=0.3):
+    """
+    유튜브 홈 화면 Ctrl+A 붙여넣기 형태의 텍스트 (카드 n개).
+    사이드바/카테고리 칩 → [재생 시간, 제목, 채널, 인증됨, 조회수 • 날짜] 카드들 사이사이에 Shorts 선반
+    """
+    rng = random.Random(seed)
+    lines = ["탐색 건너뛰기", "KR", "검색", "홈", "Shorts", "구독", "내 페이지", "기록", "전체", "음악", "게임", "요리", "실시간"]
+    made = 0
+    while made < n:
+        if rng.random() < shorts_ratio:
+            lines.append("Shorts")
+            for _ in range(min(rng.randint(3, 6), n - made)):
+                lines += [make_title(rng), f"조회수 {rng.randint(1, 999)}만회"]
+                made += 1
+            continue
+        lines.append(f"{rng.randint(0, 59)}:{rng.randint(0, 59):02d}")
+        lines += [make_title(rng), f"채널{rng.randint(1, 500)}"]
+        if rng.random() < 0.3:
+            lines.append("인증됨")
+        lines.append(f"조회수 {rng.randint(1, 999)}만회 • {rng.randint(1, 11)}개월 전")
+        made += 1
+    return "\n".join(lines)
+
+
+def make_context(seed=0):
+    rng = random.Random(seed)
+    return {
+        "watch_time": rng.choice(["잠들기 전", "식사하면서", "이동 중", "일/공부 중"]),
+        "shorts_heavy": rng.random() < 0.5,
+        "is_premium": rng.random() < 0.3,
+        "daily_hours": rng.choice(["1시간 미만", "1~2시간", "3~4시간", "5시간 이상"]),
+    }
+
+
+def make_score_dicts(n, seed=0):
+    """apply_context_weights / diagnose_pattern 입력용 영양소 점수 dict n개 (합 100 근처)"""
+    rng = random.Random(seed)
+    dicts = []
+    for _ in range(n):
+        cuts = sorted(rng.randint(0, 100) for _ in range(3))
+        parts = [cuts[0], cuts[1] - cuts[0], cuts[2] - cuts[1], 100 - cuts[2]]
+        dicts.append(dict(zip(["Carbs", "Protein", "Fats", "Vitamins"], parts)))
+    return dicts
+
+
+def make_screenshot(seed=0, size=(1170, 2532), fmt="PNG"):
+    """
+    휴대폰 유튜브 홈 화면 흉내 스크린샷 bytes (상태 표시줄, 썸네일 사진 영역, 제목/채널 줄, 하단 내비게이션 바).
+    기본 폰트는 한글이 없어서 제목은 영어만 그립니다.
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    import numpy as np
+
+    rng = random.Random(seed)
+    width, height = size
+    img = Image.new("RGB", size, (255, 255, 255))
+    draw = ImageDraw.Draw(img)
+    font = ImageFont.load_default(size=max(12, width // 28))
+    draw.rectangle((0, 0, width, height * 0.04), fill=(240, 240, 240))
+    y = int(height * 0.06)
+    noise = np.random.default_rng(seed)
+    while y < height * 0.9:
+        thumb_h = int(width * 9 / 16)
+        photo = noise.integers(0, 255, (thumb_h // 8, width // 8, 3), dtype=np.uint8)
+        img.paste(Image.fromarray(photo).resize((width, thumb_h)), (0, y))
+        y += thumb_h + 20
+        draw.text((30, y), f"{rng.choice(EN_TEMPLATES).format(s=rng.choice(EN_SUBJECTS), k='', n=rng.randint(1, 99))}",
+                  fill=(15, 15, 15), font=font)
+        y += font.size + 12
+        draw.text((30, y), f"channel {rng.randint(1, 500)} - {rng.randint(1, 999)}K views", fill=(96, 96, 96), font=font)
+        y += font.size + 40
+    draw.rectangle((0, height * 0.93, width, height), fill=(248, 248, 248))
+    buf = io.BytesIO()
+    img.save(buf, fmt)
+    return buf.getvalue()
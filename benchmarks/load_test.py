@@ -0,0 +1,128 @@
+"""
+전체 파이프라인 부하/지연 측정 (로컬 대역 서버 사용, 실제 API 할당량 소모 없음)
+세션 하나 = 붙여넣은 화면 텍스트 정제 + 스크린샷 제목 추출 + 임베딩 + GPT 처방 + YouTube 검색.
+여러 세션을 동시에 돌리고 단계별 p50/p95와 서버가 돌려준 429/500(=SDK 재시도) 수를 출력합니다.
+
+실행:
+    python benchmarks/load_test.py --sessions 50 --concurrency 8 --latency chat=800:2000 --rate-limit 0.05
+    python benchmarks/load_test.py --url http://127.0.0.1:8765   (따로 띄운 mock_server.py 사용)
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openai import OpenAI  # noqa: E402
+
+from analysis import analyze  # noqa: E402
+from anchors import load_or_build_exemplars  # noqa: E402
+from benchmarks.feeds import make_context, make_feed, make_screenshot  # noqa: E402
+from benchmarks.mock_server import add_config_arguments, config_from_args, start_in_thread  # noqa: E402
+from embeddings import as_backend  # noqa: E402
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(q / 100 * len(values) + 0.5) - 1))
+    return values[index]
+
+
+def make_session(i, titles_per_session, images_per_session):
+    text = "\n".join(make_feed(titles_per_session, seed=i))
+    images = [make_screenshot(seed=i * 100 + k) for k in range(images_per_session)]
+    return {"text": text, "images": images, "context": make_context(seed=i)}
+
+
+def fetch_stats(base_url, reset=False):
+    if reset:
+        urllib.request.urlopen(urllib.request.Request(f"{base_url}/_reset", data=b"{}", method="POST")).read()
+        return {}
+    with urllib.request.urlopen(f"{base_url}/_stats") as res:
+        return json.load(res)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대역 서버로 전체 파이프라인 p50/p95 측정")
+    parser.add_argument("--url", help="이미 떠 있는 mock_server.py 주소 (없으면 이 프로세스에서 띄움)")
+    parser.add_argument("--sessions", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--titles", type=int, default=120, help="세션당 붙여넣기 줄 수")
+    parser.add_argument("--images", type=int, default=2, help="세션당 스크린샷 수")
+    parser.add_argument("--max-retries", type=int, default=0,
+                        help="OpenAI SDK 재시도 횟수 (앱과 같게 0: 재시도는 analysis/embeddings에서만)")
+    parser.add_argument("-o", "--output", help="결과 JSON 경로")
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        server = start_in_thread(config_from_args(args))
+        base_url = server.base_url
+    os.environ["YOUTUBE_BASE_URL"] = base_url
+    fetch_stats(base_url, reset=True)
+
+    client = OpenAI(api_key="mock", base_url=f"{base_url}/v1", max_retries=args.max_retries)
+    # 대역 서버 벡터로 만든 기준점이 실제 artifacts/를 덮어쓰지 않도록 임시 폴더 사용
+    with tempfile.TemporaryDirectory() as artifact_dir:
+        reference = load_or_build_exemplars(as_backend(client), directory=artifact_dir)
+
+    sessions = [make_session(i, args.titles, args.images) for i in range(args.sessions)]
+
+    def run(session):
+        start = time.perf_counter()
+        try:
+            result = analyze(text=session["text"], images=session["images"], context=session["context"],
+                             client=client, reference=reference, youtube_key="mock")
+            return result["timings"], None
+        except Exception as e:
+            return {"total": time.perf_counter() - start}, f"{type(e).__name__}: {e}"
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        outcomes = list(pool.map(run, sessions))
+    wall = time.perf_counter() - wall_start
+
+    errors = [err for _, err in outcomes if err]
+    stages = {}
+    for timings, err in outcomes:
+        if err:
+            continue
+        for stage, seconds in timings.items():
+            stages.setdefault(stage, []).append(seconds)
+
+    print(f"sessions: {args.sessions} (concurrency {args.concurrency}), failed: {len(errors)}, "
+          f"wall {wall:.2f}s, {args.sessions / wall:.2f} sessions/s")
+    summary = {}
+    for stage, values in stages.items():
+        summary[stage] = {"p50": percentile(values, 50), "p95": percentile(values, 95), "max": max(values),
+                          "mean": statistics.fmean(values)}
+        print(f"  {stage:<13} p50 {summary[stage]['p50'] * 1000:>8.0f} ms   p95 {summary[stage]['p95'] * 1000:>8.0f} ms"
+              f"   max {summary[stage]['max'] * 1000:>8.0f} ms")
+    for err in sorted(set(errors))[:5]:
+        print(f"  error: {err}")
+
+    server_stats = fetch_stats(base_url)
+    print("server (요청 수 - ok 수 = 재시도/실패):")
+    for endpoint, counts in sorted(server_stats.items()):
+        print(f"  {endpoint:<11} {counts}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "wall_seconds": wall, "failed": len(errors), "stages": summary,
+                       "server": server_stats}, f, ensure_ascii=False, indent=2)
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""
+로컬 OpenAI / YouTube 대역(stand-in) 서버
+앱이 쓰는 엔드포인트만 흉내 냅니다. 같은 입력이면 항상 같은 응답이 나오고, 지연 분포/에러율/429를 설정할 수 있습니다.
+- POST /v1/chat/completions   텍스트 정제, 스크린샷(vision) 제목 추출, JSON 처방
+- POST /v1/embeddings          md5 seed 벡터 (encoding_format float/base64 모두 지원)
+- GET  /youtube/v3/search      search.list
+- GET  /_stats, POST /_reset   엔드포인트별 요청/에러 수
+
+실행:
+    python benchmarks/mock_server.py --port 8765 --latency chat=800:2000 --latency embeddings=80:200 --rate-limit 0.05
+앱 연결 (.streamlit/secrets.toml):
+    OPENAI_BASE_URL = "http://127.0.0.1:8765/v1"
+    YOUTUBE_BASE_URL = "http://127.0.0.1:8765"
+"""
+import argparse
+import base64
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_openai import fake_vector  # noqa: E402
+from benchmarks.feeds import make_title  # noqa: E402
+from embeddings import estimate_tokens  # noqa: E402
+
+ENDPOINTS = ["chat", "vision", "embeddings", "youtube"]
+DEFAULT_EMBEDDING_DIM = 1536
+PRESCRIPTIONS = [
+    ("지식 단백질", "TED 강연 추천"),
+    ("힐링 지방", "빗소리 ASMR 수면"),
+    ("다양성 비타민", "세계 여행 다큐멘터리"),
+    ("가벼운 탄수화물", "예능 레전드 모음"),
+]
+
+
+def parse_per_endpoint(values, cast, default):
+    """['0.05', 'chat=0.1'] → {"default": 0.05, "chat": 0.1}"""
+    parsed = {"default": default}
+    for value in values or []:
+        key, _, raw = value.rpartition("=")
+        parsed[key or "default"] = cast(raw)
+    return parsed
+
+
+def parse_latency(raw):
+    """'중앙값[:p95]' (ms) → (mu, sigma) 로그정규분포 파라미터 (p95가 없으면 고정 지연)"""
+    median, _, p95 = raw.partition(":")
+    median = max(float(median), 0.001)
+    p95 = float(p95) if p95 else median
+    return math.log(median), max(math.log(max(p95, median)) - math.log(median), 0.0) / 1.645
+
+
+class MockConfig:
+    def __init__(self, latency=None, error_rate=None, rate_limit=None, retry_after=0.1, seed=0,
+                 dim=DEFAULT_EMBEDDING_DIM, token_ms=0.0):
+        self.latency = parse_per_endpoint(latency, parse_latency, parse_latency("1"))
+        self.error_rate = parse_per_endpoint(error_rate, float, 0.0)
+        self.rate_limit = parse_per_endpoint(rate_limit, float, 0.0)
+        self.retry_after = retry_after
+        self.dim = dim
+        self.token_ms = token_ms   # chat 응답 토큰당 추가 지연 (생성 속도 흉내)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def get(self, table, endpoint):
+        return table.get(endpoint, table["default"])
+
+    def draw(self, endpoint):
+        """(지연 초, 'ok' | '429' | '500')"""
+        mu, sigma = self.get(self.latency, endpoint)
+        with self._lock:
+            delay = self._rng.lognormvariate(mu, sigma) / 1000 if sigma else math.exp(mu) / 1000
+            r = self._rng.random()
+        if r < self.get(self.rate_limit, endpoint):
+            return delay, "429"
+        if r < self.get(self.rate_limit, endpoint) + self.get(self.error_rate, endpoint):
+            return delay, "500"
+        return delay, "ok"
+
+
+def seed_of(*parts):
+    return int.from_bytes(hashlib.md5("\x00".join(parts).encode("utf-8")).digest()[:8], "little")
+
+
+# --- 응답 생성 (결정적) ---
+def chat_reply(body):
+    messages = body.get("messages", [])
+    if (body.get("response_format") or {}).get("type") == "json_object":
+        prompt = json.dumps(messages, ensure_ascii=False)
+        keyword, query = PRESCRIPTIONS[seed_of(prompt) % len(PRESCRIPTIONS)]
+        return json.dumps({"summary_text": "모의 서버 진단 소견입니다.", "prescription_keyword": keyword,
+                           "youtube_search_query": query}, ensure_ascii=False)
+
+    user_content = messages[-1].get("content", "") if messages else ""
+    if isinstance(user_content, list):
+        # vision: 이미지마다 data URI 해시를 seed로 제목 8개
+        titles = []
+        for part in user_content:
+            if part.get("type") == "image_url":
+                rng = random.Random(seed_of(part["image_url"]["url"]))
+                titles.extend(make_title(rng).replace(",", " ") for _ in range(8))
+        return ", ".join(f'"{t}"' for t in titles)
+
+    # 텍스트 정제: 제목처럼 보이는 줄만 남김
+    lines = [line.strip().replace(",", " ") for line in user_content.splitlines()]
+    titles = [line for line in lines if 5 <= len(line) <= 100 and not line.isdigit() and "http" not in line]
+    return ", ".join(f'"{t}"' for t in titles)
+
+
+def chat_response(body):
+    content = chat_reply(body)
+    finish_reason = "stop"
+    max_tokens = body.get("max_tokens") or body.get("max_completion_tokens")
+    if max_tokens and estimate_tokens(content) > max_tokens:
+        # 실제 API처럼 길이 제한에서 응답을 자름
+        content = content.encode("utf-8")[:max_tokens * 2].decode("utf-8", "ignore")
+        finish_reason = "length"
+    return {
+        "id": f"chatcmpl-mock-{seed_of(content) % 10**8}", "object": "chat.completion", "created": 0,
+        "model": body.get("model", "gpt-4o"),
+        "choices": [{"index": 0, "finish_reason": finish_reason,
+                     "message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+def embeddings_response(body, dim):
+    texts = body.get("input", [])
+    texts = [texts] if isinstance(texts, str) else texts
+    as_base64 = body.get("encoding_format") == "base64"
+    data = []
+    for i, text in enumerate(texts):
+        vector = fake_vector(text, dim)
+        embedding = base64.b64encode(vector.astype("<f4").tobytes()).decode() if as_base64 else vector.tolist()
+        data.append({"object": "embedding", "index": i, "embedding": embedding})
+    return {"object": "list", "data": data[::-1], "model": body.get("model", ""),
+            "usage": {"prompt_tokens": 0, "total_tokens": 0}}
+
+
+def youtube_response(query):
+    q = query.get("q", [""])[0]
+    rng = random.Random(seed_of(q))
+    items = []
+    for _ in range(int(query.get("maxResults", ["5"])[0])):
+        video_id = "".join(rng.choice("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-") for _ in range(11))
+        items.append({
+            "kind": "youtube#searchResult", "id": {"kind": "youtube#video", "videoId": video_id},
+            "snippet": {"title": f"{q} - {make_title(rng)}", "channelTitle": f"mock channel {rng.randint(1, 99)}",
+                        "thumbnails": {"high": {"url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"}}},
+        })
+    return {"kind": "youtube#searchListResponse", "items": items}
+
+
+# --- HTTP ---
+class MockHandler(BaseHTTPRequestHandler):
+    server_version = "YouTubeDietMock/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def send_json(self, status, payload, headers=None):
+        raw = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def serve(self, endpoint, make_payload):
+        delay, outcome = self.server.config.draw(endpoint)
+        payload = make_payload() if outcome == "ok" else None
+        if payload and endpoint in ("chat", "vision"):
+            content = payload["choices"][0]["message"]["content"]
+            delay += estimate_tokens(content) * self.server.config.token_ms / 1000
+        time.sleep(delay)
+        self.server.count(endpoint, outcome)
+        if outcome == "429":
+            retry_after = self.server.config.retry_after
+            self.send_json(429, {"error": {"message": "Rate limit reached (mock)", "type": "requests",
+                                           "code": "rate_limit_exceeded"}},
+                           {"Retry-After": str(retry_after), "retry-after-ms": str(int(retry_after * 1000))})
+        elif outcome == "500":
+            self.send_json(500, {"error": {"message": "Internal server error (mock)", "type": "server_error"}})
+        else:
+            self.send_json(200, payload)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_POST(self):
+        path = urlparse(self.path).path.rstrip("/")
+        if path.endswith("/chat/completions"):
+            body = self.read_json()
+            content = body.get("messages", [{}])[-1].get("content")
+            self.serve("vision" if isinstance(content, list) else "chat", lambda: chat_response(body))
+        elif path.endswith("/embeddings"):
+            body = self.read_json()
+            self.serve("embeddings", lambda: embeddings_response(body, self.server.config.dim))
+        elif path == "/_reset":
+            self.read_json()
+            self.server.reset()
+            self.send_json(200, {"ok": True})
+        else:
+            self.send_json(404, {"error": {"message": f"unknown path {path}"}})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.rstrip("/").endswith("/youtube/v3/search"):
+            query = parse_qs(url.query)
+            self.serve("youtube", lambda: youtube_response(query))
+        elif url.path == "/_stats":
+            self.send_json(200, self.server.snapshot())
+        else:
+            self.send_json(404, {"error": {"message": f"unknown path {url.path}"}})
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config, verbose=False):
+        super().__init__(address, MockHandler)
+        self.config = config
+        self.verbose = verbose
+        self._stats = defaultdict(Counter)
+        self._stats_lock = threading.Lock()
+
+    def count(self, endpoint, outcome):
+        with self._stats_lock:
+            self._stats[endpoint]["requests"] += 1
+            self._stats[endpoint][outcome] += 1
+
+    def snapshot(self):
+        with self._stats_lock:
+            return {endpoint: dict(counter) for endpoint, counter in self._stats.items()}
+
+    def reset(self):
+        with self._stats_lock:
+            self._stats.clear()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_in_thread(config, host="127.0.0.1", port=0):
+    """테스트/부하 측정용: 백그라운드 스레드에서 서버 시작 (port=0이면 빈 포트)"""
+    server = MockServer((host, port), config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def add_config_arguments(parser):
+    parser.add_argument("--latency", action="append", metavar="[ENDPOINT=]MEDIAN[:P95]",
+                        help=f"지연(ms) 로그정규분포. ENDPOINT: {', '.join(ENDPOINTS)} (반복 가능)")
+    parser.add_argument("--error-rate", action="append", metavar="[ENDPOINT=]RATE", help="500 응답 비율")
+    parser.add_argument("--rate-limit", action="append", metavar="[ENDPOINT=]RATE", help="429 응답 비율")
+    parser.add_argument("--retry-after", type=float, default=0.1, help="429 응답의 Retry-After(초)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dim", type=int, default=DEFAULT_EMBEDDING_DIM, help="임베딩 차원")
+    parser.add_argument("--token-ms", type=float, default=0.0, help="chat 응답 토큰당 추가 지연(ms), 예: 15")
+
+
+def config_from_args(args):
+    return MockConfig(args.latency, args.error_rate, args.rate_limit, args.retry_after, args.seed, args.dim,
+                      args.token_ms)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 OpenAI/YouTube 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("-v", "--verbose", action="store_true", help="요청 로그 출력")
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = MockServer((args.host, args.port), config_from_args(args), args.verbose)
+    print(f"mock server: {server.base_url}  (OPENAI_BASE_URL={server.base_url}/v1, YOUTUBE_BASE_URL={server.base_url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+임베딩 2단 캐시
+- 1단: 프로세스 내 LRU (바이트 예산 기반)
+- 2단: SQLite 디스크 저장소 (WAL 모드, 여러 Streamlit 워커 프로세스가 공유)
+
+키는 (모델명, 정규화된 제목) 이고, 값은 float32 벡터입니다.
+인기 영상 제목은 사용자마다 반복되므로 같은 제목을 다시 임베딩하지 않도록 합니다.
+"""
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "embeddings.sqlite3")
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024   # 64MB (1536차원 float32 기준 약 1만 개)
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600       # 30일
+DEFAULT_MAX_DISK_ROWS = 200_000
+EVICTION_INTERVAL = 500                    # 쓰기 N건마다 디스크 정리
+
+
+def normalize_title(text):
+    """캐시 키용 제목 정규화 (NFKC + 공백/줄바꿈 정리)"""
+    text = unicodedata.normalize("NFKC", text)
+    return " ".join(text.split())
+
+
+class EmbeddingCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, memory_budget=DEFAULT_MEMORY_BUDGET,
+                 ttl_seconds=DEFAULT_TTL_SECONDS, max_disk_rows=DEFAULT_MAX_DISK_ROWS):
+        """path=None 이면 디스크 없이 메모리 LRU만 사용합니다."""
+        self.path = path
+        self.memory_budget = memory_budget
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_rows = max_disk_rows
+
+        self._lock = threading.Lock()
+        self._lru = OrderedDict()
+        self._lru_bytes = 0
+        self._local = threading.local()   # sqlite 커넥션은 스레드(세션)별로 따로 씀
+        self._writes_since_eviction = 0
+
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+        if self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn()
+
+    # --- SQLite ---
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (model, title)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_accessed ON embeddings (accessed_at)")
+            self._local.conn = conn
+        return conn
+
+    # --- 메모리 LRU ---
+    # 값은 (벡터, 처음 저장한 시각). 디스크와 같은 TTL을 읽을 때 적용 (오래 떠 있는 프로세스도 만료된 벡터를 쓰지 않음)
+    def _memory_get(self, key):
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is None:
+                return None
+            vec, created_at = entry
+            if created_at < time.time() - self.ttl_seconds:
+                del self._lru[key]
+                self._lru_bytes -= vec.nbytes
+                return None
+            self._lru.move_to_end(key)
+            return vec
+
+    def _memory_put(self, key, vec, created_at):
+        with self._lock:
+            old = self._lru.pop(key, None)
+            if old is not None:
+                self._lru_bytes -= old[0].nbytes
+            if vec.nbytes > self.memory_budget:
+                return
+            self._lru[key] = (vec, created_at)
+            self._lru_bytes += vec.nbytes
+            while self._lru_bytes > self.memory_budget:
+                _, (dropped, _) = self._lru.popitem(last=False)
+                self._lru_bytes -= dropped.nbytes
+
+    # --- 공개 API ---
+    def get_many(self, model, titles):
+        """{정규화 제목: 벡터} 중 캐시에 있는 것만 반환합니다."""
+        found = {}
+        pending = []
+        for title in dict.fromkeys(normalize_title(t) for t in titles):
+            vec = self._memory_get((model, title))
+            if vec is not None:
+                found[title] = vec
+            else:
+                pending.append(title)
+        memory_hits = len(found)
+
+        if pending and self.path:
+            now = time.time()
+            expire_before = now - self.ttl_seconds
+            conn = self._conn()
+            hits = []
+            # SQLite 변수 개수 제한(999)을 넘지 않도록 나눠서 조회
+            for i in range(0, len(pending), 500):
+                chunk = pending[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT title, vector, created_at FROM embeddings WHERE model = ? AND created_at >= ? AND title IN ({placeholders})",
+                    [model, expire_before, *chunk]
+                ).fetchall()
+                for title, blob, created_at in rows:
+                    vec = np.frombuffer(blob, dtype=np.float32)
+                    found[title] = vec
+                    hits.append(title)
+                    self._memory_put((model, title), vec, created_at)
+            if hits:
+                conn.executemany(
+                    "UPDATE embeddings SET accessed_at = ? WHERE model = ? AND title = ?",
+                    [(now, model, t) for t in hits]
+                )
+
+        disk_hits = len(found) - memory_hits
+        with self._lock:   # 여러 세션 스레드가 같은 캐시(st.cache_resource)를 씀
+            self.stats["memory_hits"] += memory_hits
+            self.stats["disk_hits"] += disk_hits
+            self.stats["misses"] += len(pending) - disk_hits
+        return found
+
+    def put_many(self, model, items):
+        """items: {제목: 벡터}. 메모리와 디스크 양쪽에 저장합니다."""
+        if not items:
+            return
+        now = time.time()
+        rows = []
+        for title, vec in items.items():
+            key = normalize_title(title)
+            vec = np.asarray(vec, dtype=np.float32)
+            self._memory_put((model, key), vec, now)
+            rows.append((model, key, vec.tobytes(), now, now))
+        with self._lock:
+            self.stats["writes"] += len(rows)
+
+        if self.path:
+            conn = self._conn()
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, title, vector, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            with self._lock:
+                self._writes_since_eviction += len(rows)
+                due = self._writes_since_eviction >= EVICTION_INTERVAL
+                if due:
+                    self._writes_since_eviction = 0
+            if due:
+                self.evict()
+
+    def get(self, model, title):
+        return self.get_many(model, [title]).get(normalize_title(title))
+
+    def put(self, model, title, vec):
+        self.put_many(model, {title: vec})
+
+    def evict(self):
+        """TTL 지난 항목 삭제 후, 최대 행 수를 넘으면 오래 안 쓴 순서로 삭제"""
+        if not self.path:
+            return 0
+        conn = self._conn()
+        removed = conn.execute(
+            "DELETE FROM embeddings WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+        ).rowcount
+        total = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        overflow = total - self.max_disk_rows
+        if overflow > 0:
+            removed += conn.execute(
+                "DELETE FROM embeddings WHERE (model, title) IN "
+                "(SELECT model, title FROM embeddings ORDER BY accessed_at LIMIT ?)", (overflow,)
+            ).rowcount
+        with self._lock:
+            self.stats["evictions"] += removed
+        return removed
+
+    def hit_rate(self):
+        with self._lock:
+            hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+            total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
@@ -0,0 +1,247 @@
+"""
+임베딩 요청 헬퍼
+제목을 한 개씩 보내지 않고, 개수/토큰 한도 안에서 묶어서(batch) 보냅니다.
+AsyncOpenAI 경로는 여러 batch를 동시에(세마포어로 개수 제한) 보냅니다.
+
+임베딩 백엔드는 embed(list[str]) -> np.ndarray 인터페이스로 교체할 수 있습니다.
+- OpenAIEmbeddingBackend: OpenAI 임베딩 API
+- HashingEmbeddingBackend: 네트워크 없이 문자 n-gram feature hashing (개발/부하 테스트/장애 시 대체용)
+"""
+import asyncio
+import time
+import zlib
+
+import numpy as np
+
+from embedding_cache import normalize_title
+from scoring import normalize_rows
+import tracing
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+MAX_BATCH_SIZE = 256        # 요청 1건당 입력 개수 (API 한도 2048)
+MAX_BATCH_TOKENS = 50_000   # 요청 1건당 토큰 추정치 합계 (API 한도 300k)
+MAX_RETRIES = 2             # 재시도는 여기서만 (SDK 재시도는 끄므로 span의 retries가 실제 재요청 횟수)
+MAX_CONCURRENCY = 8         # 비동기 경로의 동시 요청 수
+REQUEST_TIMEOUT = 30.0      # 요청 1건당 타임아웃(초)
+HASHING_DIM = 1024
+
+
+def estimate_tokens(text):
+    """토크나이저 없이 보수적으로 추정 (한글 1자 = 3바이트 ≈ 1~2토큰)"""
+    return len(text.encode("utf-8")) // 2 + 1
+
+
+def iter_batches(texts, max_items=MAX_BATCH_SIZE, max_tokens=MAX_BATCH_TOKENS):
+    batch, batch_tokens = [], 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if batch and (len(batch) >= max_items or batch_tokens + tokens > max_tokens):
+            yield batch
+            batch, batch_tokens = [], 0
+        batch.append(text)
+        batch_tokens += tokens
+    if batch:
+        yield batch
+
+
+def embed_batch(client, batch, model=EMBEDDING_MODEL, retries=MAX_RETRIES):
+    """batch 하나를 요청하고 입력 순서대로 벡터 리스트를 반환 (실패 시 이 batch만 재시도)"""
+    with tracing.span("embedding.batch", tracing.SPAN_KIND_CLIENT, **batch_attributes(batch, model)) as span:
+        for attempt in range(retries + 1):
+            try:
+                res = client.embeddings.create(input=batch, model=model)
+                span.record_usage(getattr(res, "usage", None))
+                # 응답 순서가 보장되지 않을 수 있으므로 index 기준으로 정렬
+                data = sorted(res.data, key=lambda d: d.index)
+                if len(data) != len(batch):
+                    raise ValueError(f"embedding count mismatch: {len(data)} != {len(batch)}")
+                return [np.asarray(d.embedding, dtype=np.float32) for d in data]
+            except Exception:
+                if attempt == retries:
+                    raise
+                span.add("retries")
+                time.sleep(0.5 * (2 ** attempt))
+
+
+def without_sdk_retries(client):
+    """OpenAI/AsyncOpenAI 클라이언트 → SDK 자체 재시도를 끈 사본 (기본 max_retries=2로 만든 클라이언트가 들어와도)"""
+    with_options = getattr(client, "with_options", None)
+    return with_options(max_retries=0) if with_options else client
+
+
+def batch_attributes(batch, model):
+    """임베딩 batch span 속성 (보낸 제목 수/바이트/추정 토큰)"""
+    return {"gen_ai.request.model": model, "titles": len(batch), "retries": 0,
+            "payload_bytes": sum(len(text.encode("utf-8")) for text in batch),
+            "estimated_tokens": sum(estimate_tokens(text) for text in batch)}
+
+
+class EmbeddingBackend:
+    """임베딩 백엔드 공통 인터페이스 (model은 캐시/아티팩트 키로 쓰임)"""
+    model = None
+
+    def embed(self, texts):
+        """texts 순서대로 N×D float32 행렬을 반환"""
+        raise NotImplementedError
+
+
+class OpenAIEmbeddingBackend(EmbeddingBackend):
+    def __init__(self, client, model=EMBEDDING_MODEL):
+        self.client = without_sdk_retries(client)
+        self.model = model
+
+    def embed(self, texts):
+        return np.stack(embed_batch(self.client, list(texts), self.model))
+
+
+class HashingEmbeddingBackend(EmbeddingBackend):
+    """
+    문자 n-gram을 crc32로 해싱해 고정 차원 벡터에 ±1로 누적한 뒤 L2 정규화합니다.
+    같은 입력이면 프로세스가 달라도 항상 같은 벡터가 나옵니다. (hash()는 프로세스마다 달라서 쓰지 않음)
+    """
+
+    def __init__(self, dim=HASHING_DIM, ngram_range=(1, 3)):
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.model = f"hashing-char{ngram_range[0]}{ngram_range[1]}-{dim}"
+
+    def embed(self, texts):
+        rows, cols, signs = [], [], []
+        low, high = self.ngram_range
+        for row, text in enumerate(texts):
+            text = normalize_title(text).lower()
+            if not text:
+                continue   # 빈 제목 → 0벡터 (공백 n-gram만으로 만든 벡터가 분류되지 않도록)
+            padded = f" {text} "
+            for n in range(low, high + 1):
+                for i in range(len(padded) - n + 1):
+                    h = zlib.crc32(padded[i:i + n].encode("utf-8"))
+                    rows.append(row)
+                    cols.append(h % self.dim)
+                    signs.append(1.0 if h & 0x80000000 else -1.0)   # 부호는 최상위 비트로 (충돌 상쇄)
+
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(matrix, (rows, cols), signs)
+        return normalize_rows(matrix)
+
+
+def as_backend(client, model=EMBEDDING_MODEL):
+    """OpenAI 클라이언트가 들어오면 OpenAIEmbeddingBackend로 감쌉니다."""
+    if isinstance(client, EmbeddingBackend):
+        return client
+    return OpenAIEmbeddingBackend(client, model)
+
+
+def _split_cached(texts, model, cache):
+    """(캐시에서 찾은 벡터, 요청이 필요한 정규화 제목 목록)"""
+    titles = list(dict.fromkeys(normalize_title(t) for t in texts if t.strip()))
+    vectors = cache.get_many(model, titles) if cache else {}
+    return vectors, [t for t in titles if t not in vectors]
+
+
+def embed_texts(texts, client, model=EMBEDDING_MODEL, cache=None, on_progress=None):
+    """
+    {정규화된 제목: 벡터} 를 반환합니다. client는 OpenAI 클라이언트 또는 EmbeddingBackend.
+    캐시에 있는 제목은 건너뛰고, 끝까지 실패한 batch의 제목은 결과에서 빠집니다.
+    on_progress(처리된 제목 수, 전체 제목 수)는 캐시 조회 후와 batch가 끝날 때마다 호출됩니다.
+    """
+    backend = as_backend(client, model)
+    with tracing.span("embedding.embed_texts", embedding_model=backend.model) as span:
+        vectors, missing = _split_cached(texts, backend.model, cache)
+        total, done = len(vectors) + len(missing), len(vectors)
+        span.set("titles", total)
+        span.set("cache_hits", len(vectors))
+        if on_progress:
+            on_progress(done, total)
+
+        for batch in iter_batches(missing):
+            span.add("batches")
+            try:
+                batch_vectors = backend.embed(batch)
+            except Exception:
+                batch_vectors = None
+                span.add("failed_batches")
+            done += len(batch)
+            if on_progress:
+                on_progress(done, total)
+            if batch_vectors is None:
+                continue
+            fetched = dict(zip(batch, batch_vectors))
+            vectors.update(fetched)
+            if cache:
+                cache.put_many(backend.model, fetched)
+
+        return vectors
+
+
+async def embed_batch_async(client, batch, model, semaphore, timeout=REQUEST_TIMEOUT, retries=MAX_RETRIES):
+    """embed_batch의 비동기 버전 (요청마다 타임아웃, 실패 시 이 batch만 재시도)"""
+    # 태스크마다 컨텍스트가 복사되므로 동시에 도는 batch span끼리 섞이지 않음 (세마포어 대기 시간도 포함)
+    with tracing.span("embedding.batch", tracing.SPAN_KIND_CLIENT, **batch_attributes(batch, model)) as span:
+        for attempt in range(retries + 1):
+            try:
+                async with semaphore:
+                    res = await asyncio.wait_for(client.embeddings.create(input=batch, model=model), timeout)
+                span.record_usage(getattr(res, "usage", None))
+                data = sorted(res.data, key=lambda d: d.index)
+                if len(data) != len(batch):
+                    raise ValueError(f"embedding count mismatch: {len(data)} != {len(batch)}")
+                return [np.asarray(d.embedding, dtype=np.float32) for d in data]
+            except Exception:
+                if attempt == retries:
+                    raise
+                span.add("retries")
+                await asyncio.sleep(0.5 * (2 ** attempt))
+
+
+async def embed_texts_async(texts, client, model=EMBEDDING_MODEL, cache=None,
+                            concurrency=MAX_CONCURRENCY, timeout=REQUEST_TIMEOUT, batch_size=MAX_BATCH_SIZE,
+                            on_progress=None):
+    """embed_texts와 같은 결과를 반환하되, batch들을 동시에 보냅니다. (batch_size=1이면 제목별 요청)"""
+    with tracing.span("embedding.embed_texts", embedding_model=model, concurrency=concurrency) as span:
+        vectors, missing = _split_cached(texts, model, cache)
+        batches = list(iter_batches(missing, max_items=batch_size))
+        span.set("titles", len(vectors) + len(missing))
+        span.set("cache_hits", len(vectors))
+        span.set("batches", len(batches))
+        semaphore = asyncio.Semaphore(concurrency)
+        client = without_sdk_retries(client)
+        progress = {"done": len(vectors), "total": len(vectors) + len(missing)}
+        if on_progress:
+            on_progress(progress["done"], progress["total"])
+
+        async def run_batch(batch):
+            try:
+                return await embed_batch_async(client, batch, model, semaphore, timeout)
+            finally:
+                # 완료 순서대로 진행률 갱신 (같은 이벤트 루프 스레드에서 호출됨)
+                progress["done"] += len(batch)
+                if on_progress:
+                    on_progress(progress["done"], progress["total"])
+
+        # gather는 입력 순서대로 결과를 돌려주므로 batch ↔ 결과 매핑이 유지됨
+        results = await asyncio.gather(*(run_batch(batch) for batch in batches), return_exceptions=True)
+        for batch, batch_vectors in zip(batches, results):
+            if isinstance(batch_vectors, BaseException):
+                span.add("failed_batches")
+                continue
+            fetched = dict(zip(batch, batch_vectors))
+            vectors.update(fetched)
+            if cache:
+                cache.put_many(model, fetched)
+
+        return vectors
+
+
+def embed_texts_concurrent(texts, make_async_client, model=EMBEDDING_MODEL, cache=None,
+                           concurrency=MAX_CONCURRENCY, timeout=REQUEST_TIMEOUT, batch_size=MAX_BATCH_SIZE,
+                           on_progress=None):
+    """
+    동기 코드(Streamlit STEP 3)에서 쓰는 래퍼.
+    AsyncOpenAI는 이벤트 루프에 묶이므로 호출할 때마다 make_async_client()로 새로 만들고 닫습니다.
+    """
+    async def run():
+        async with make_async_client() as client:
+            return await embed_texts_async(texts, client, model, cache, concurrency, timeout, batch_size, on_progress)
+
+    return asyncio.run(run())
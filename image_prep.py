@@ -0,0 +1,104 @@
+"""
+스크린샷 전처리 (vision 요청 전)
+- 크기 제한을 확인하고 디코딩 (픽셀 폭탄/초대형 파일 차단)
+- vision 모델이 실제로 쓰는 해상도로 축소 (2048×2048 안에 맞춘 뒤 짧은 변 768px) — 그 이상은 어차피 모델 쪽에서 줄여서 버려짐
+- 선택: 휴대폰 스크린샷의 상태 표시줄/하단 내비게이션 바 잘라내기
+- 알맞은 형식으로 다시 인코딩 (사진이 섞인 화면은 JPEG, 단색 위주 화면은 더 작으면 PNG) + 정확한 MIME
+디코딩(decode_screenshot)과 인코딩(encode_screenshot) 사이에 중복 제거/겹침 잘라내기(screenshot_dedupe)가 들어갑니다.
+"""
+import io
+
+from PIL import Image, ImageOps
+
+MAX_INPUT_BYTES = 25 * 1024 * 1024   # 업로드 파일 크기 한도
+MAX_INPUT_PIXELS = 50_000_000        # 디코딩 전에 확인하는 픽셀 수 한도
+VISION_MAX_SIDE = 2048
+VISION_SHORT_SIDE = 768
+JPEG_QUALITY = 85
+PNG_MAX_COLORS = 256                 # 색이 이보다 적으면 PNG도 시도
+# 세로로 긴 휴대폰 스크린샷에서 잘라낼 비율
+PHONE_ASPECT = 1.7
+STATUS_BAR_RATIO = 0.04
+NAV_BAR_RATIO = 0.07
+
+
+def read_image_bytes(image):
+    """파일 경로 / bytes / 업로드 파일 객체 → bytes"""
+    if isinstance(image, str):
+        with open(image, "rb") as f:
+            return f.read()
+    if isinstance(image, (bytes, bytearray)):
+        return bytes(image)
+    return image.read()
+
+
+def vision_size(width, height, max_side=VISION_MAX_SIDE, short_side=VISION_SHORT_SIDE):
+    """vision 모델(detail=high)이 실제로 보는 크기. 작은 이미지는 키우지 않음"""
+    scale = min(1.0, max_side / max(width, height))
+    if min(width, height) * scale > short_side:
+        scale = short_side / min(width, height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def crop_phone_chrome(img):
+    """세로 휴대폰 스크린샷이면 위쪽 상태 표시줄과 아래쪽 내비게이션 바를 잘라냄 (가로/PC 화면은 그대로)"""
+    width, height = img.size
+    if height / width < PHONE_ASPECT:
+        return img
+    return img.crop((0, round(height * STATUS_BAR_RATIO), width, round(height * (1 - NAV_BAR_RATIO))))
+
+
+def _encode(img, fmt, **params):
+    buf = io.BytesIO()
+    img.save(buf, fmt, **params)
+    return buf.getvalue()
+
+
+def prepare_screenshot(raw, crop_chrome=False):
+    """
+    이미지 bytes → {"data", "mime", "width", "height", "original_bytes"}
+    크기 한도를 넘거나 이미지가 아니면 ValueError
+    """
+    return encode_screenshot(decode_screenshot(raw, crop_chrome), len(raw))
+
+
+def decode_screenshot(raw, crop_chrome=False):
+    """이미지 bytes → RGB PIL 이미지 (크기 한도 확인, EXIF 회전, 선택적으로 상태/내비게이션 바 제거). 축소는 하지 않음"""
+    if len(raw) > MAX_INPUT_BYTES:
+        raise ValueError(f"이미지 파일이 너무 큽니다 ({len(raw) // (1024 * 1024)}MB)")
+    try:
+        img = Image.open(io.BytesIO(raw))
+    except Exception as e:
+        raise ValueError(f"이미지를 읽을 수 없습니다: {e}") from e
+    if img.width * img.height > MAX_INPUT_PIXELS:
+        raise ValueError(f"이미지 해상도가 너무 큽니다 ({img.width}×{img.height})")
+
+    # JPEG는 디코딩 단계에서부터 줄여서 읽음 (draft는 1/2, 1/4, 1/8 단위로 목표 크기 이상을 유지)
+    if img.format == "JPEG":
+        img.draft("RGB", vision_size(img.width, img.height))
+    img = ImageOps.exif_transpose(img)
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel("A"))
+        img = background
+    elif img.mode != "RGB":
+        img = img.convert("RGB")
+
+    if crop_chrome:
+        img = crop_phone_chrome(img)
+    return img
+
+
+def encode_screenshot(img, original_bytes=0):
+    """decode_screenshot 결과 → vision 해상도로 줄여서 다시 인코딩한 {"data", "mime", "width", "height", "original_bytes"}"""
+    size = vision_size(*img.size)
+    if size != img.size:
+        img = img.resize(size, Image.LANCZOS)
+
+    data, mime = _encode(img, "JPEG", quality=JPEG_QUALITY, optimize=True), "image/jpeg"
+    if img.getcolors(PNG_MAX_COLORS) is not None:
+        png = _encode(img.quantize(PNG_MAX_COLORS), "PNG", optimize=True)
+        if len(png) < len(data):
+            data, mime = png, "image/png"
+    return {"data": data, "mime": mime, "width": img.width, "height": img.height, "original_bytes": original_bytes}
@@ -0,0 +1,130 @@
+"""
+룰 기반 키워드 매칭 (Aho-Corasick)
+영양소별 키워드 표를 한 번만 오토마톤으로 컴파일해 두고,
+제목 한 번 훑기로 모든 영양소의 키워드 적중 수를 셉니다.
+"""
+from collections import deque
+from functools import lru_cache
+
+from scoring import NUTRIENTS
+
+# 영양소별 키워드 (제목은 소문자로 바꿔서 비교)
+KEYWORD_TABLE = {
+    # [탄수화물] 재미/오락
+    "Carbs": [
+        "예능", "코미디", "개그", "웃음", "레전드", "ㅋㅋ", "ㅎㅎ",
+        "몰카", "참기", "챌린지", "게임", "game", "매드무비", "하이라이트",
+        "리액션", "먹방", "쇼츠", "shorts", "무한도전", "런닝맨", "유퀴즈",  # 유퀴즈는 예능 성격도 있음
+        "침착맨", "엔터", "스케치", "콩트"
+    ],
+    # [지방] 휴식/힐링 (음악, ASMR 등)
+    "Fats": [
+        "playlist", "플레이리스트", "essential", "jazz", "lullaby", "asmr",
+        "빗소리", "백색소음", "meditation", "요가", "산책", "vlog", "브이로그",
+        "pop", "song", "music", "노래", "감성", "lo-fi", "lofi", "piano", "classic", "클래식"
+    ],
+    # [단백질] 지식/학습 (뉴스, 강연 등)
+    "Protein": [
+        "교수", "박사", "강연", "ted", "특강", "다큐", "documentary",
+        "뉴스", "news", "경제", "주식", "재테크", "역사", "history",
+        "과학", "science", "우주", "기술", "ai", "개발", "코딩",
+        "영어", "회화", "공부", "스터디", "독서", "책", "인문학", "철학",
+        "지식", "상식", "이동진", "슈카", "유퀴즈", "알쓸", "ebs", "bbc"
+    ],
+    # [비타민] 다양성/예술
+    "Vitamins": [
+        "여행", "travel", "세계", "문화", "미술", "전시", "영화", "movie",
+        "리뷰", "해석", "비하인드", "창작", "메이킹", "diy", "취미"
+    ]
+}
+
+# 동점일 때의 우선순위 (기존 if 순서와 동일)
+PRIORITY = ["Carbs", "Fats", "Protein", "Vitamins"]
+
+
+def keyword_boosts(is_premium=False):
+    """영양소별 부스트 (재미는 확실하게 잡아주고, 프리미엄 유저의 음악은 배경음악일 확률이 높아 낮춤)"""
+    return {"Carbs": 2.0, "Fats": 0.8 if is_premium else 1.5, "Protein": 2.0, "Vitamins": 1.8}
+
+
+class KeywordMatcher:
+    """
+    여러 키워드를 동시에 찾는 Aho-Corasick 오토마톤.
+    실패 링크를 미리 풀어서 완전한 전이표(DFA)로 만들어 두므로 문자당 dict 조회 1번이면 됩니다.
+    """
+
+    def __init__(self, table):
+        self.labels = list(table)
+        goto = [{}]
+        outputs = [[]]   # 상태별로 끝나는 키워드의 영양소 인덱스 목록 (같은 키워드가 여러 영양소에 있을 수 있음)
+
+        for idx, label in enumerate(self.labels):
+            for keyword in table[label]:
+                state = 0
+                for ch in keyword.lower():
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[state][ch] = nxt
+                        goto.append({})
+                        outputs.append([])
+                    state = nxt
+                outputs[state].append(idx)
+
+        # BFS로 실패 링크 계산 + 전이표 채우기
+        fail = [0] * len(goto)
+        delta = [dict(g) for g in goto]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                fail[nxt] = delta[fail[state]].get(ch, 0)
+            # 이 상태에 없는 전이는 실패 상태의 전이를 그대로 물려받음
+            for ch, nxt in delta[fail[state]].items():
+                delta[state].setdefault(ch, nxt)
+
+        self._delta = delta
+        self._outputs = [tuple(o) for o in outputs]
+
+    def count(self, text):
+        """영양소별 키워드 적중 수 (labels 순서, 겹치는 키워드도 모두 셈)"""
+        counts = [0] * len(self.labels)
+        delta, outputs = self._delta, self._outputs
+        state = 0
+        for ch in text.lower():
+            state = delta[state].get(ch, 0)
+            for idx in outputs[state]:
+                counts[idx] += 1
+        return counts
+
+
+@lru_cache(maxsize=None)
+def get_matcher():
+    """프로세스당 한 번만 컴파일 (NUTRIENTS 순서로 정렬된 표 사용)"""
+    return KeywordMatcher({n: KEYWORD_TABLE[n] for n in NUTRIENTS})
+
+
+def keyword_hits(title):
+    """{영양소: 적중 수}"""
+    return dict(zip(NUTRIENTS, get_matcher().count(title)))
+
+
+def dominant_nutrient(hits):
+    """적중 수가 가장 많은 영양소 (동점이면 PRIORITY 순서), 적중이 없으면 None"""
+    best = max(PRIORITY, key=lambda n: (hits[n], -PRIORITY.index(n)))
+    return best if hits[best] > 0 else None
+
+
+def keyword_boost_weights(title, is_premium=False):
+    """
+    NUTRIENTS 순서의 가중치 리스트.
+    여러 영양소 키워드가 섞인 제목은 적중 수 비율대로 부스트를 나눠 줍니다. (적중이 없으면 모두 0)
+    """
+    counts = get_matcher().count(title)
+    total = sum(counts)
+    if total == 0:
+        return [0.0] * len(NUTRIENTS)
+    boosts = keyword_boosts(is_premium)
+    return [boosts[n] * c / total for n, c in zip(NUTRIENTS, counts)]
@@ -0,0 +1,148 @@
+"""
+스크린샷 로컬 OCR 백엔드
+- TesseractOcrBackend: Tesseract(kor+eng)를 프로세스 풀에서 돌리고, 인식한 줄을 붙여넣기 파서(paste_parser)로 넘겨
+  제목만 추립니다. (조회수/날짜/재생 시간/Shorts 헤더 규칙이 화면 텍스트와 같음)
+- vision(gpt-4o)은 analysis.extract_titles_from_images가 직접 호출하며, 로컬 결과의 신뢰도가 낮은 스크린샷에만 씁니다.
+
+설치: apt install tesseract-ocr tesseract-ocr-kor (Streamlit Cloud는 packages.txt) + pip install pytesseract
+설치되어 있지 않으면 make_ocr_backend()가 None을 돌려주고, 모든 스크린샷이 vision으로 갑니다.
+"""
+import abc
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from paste_parser import parse_pasted_text, to_title_strings
+
+TESSERACT_LANG = "kor+eng"
+TESSERACT_CONFIG = "--psm 3"   # 자동 레이아웃 분석 (카드 여러 개가 세로로 쌓인 화면)
+OCR_PROCESSES = min(4, os.cpu_count() or 1)
+MIN_OCR_WIDTH = 1200           # 글자가 작으면 Tesseract 인식률이 떨어지므로 이 폭이 되도록 키워서 읽음
+MIN_WORD_CONFIDENCE = 30       # 이보다 낮은 단어는 버림 (썸네일 속 글자/잡음)
+
+
+class OcrBackend(abc.ABC):
+    """로컬 OCR 공통 인터페이스 (read만 구현하면 read_many는 한 장씩 읽음)"""
+    name = None
+
+    @abc.abstractmethod
+    def read(self, image):
+        """이미지 bytes → {"titles": [...], "confidence": 0~1} (읽지 못하면 예외)"""
+
+    def read_many(self, images):
+        """이미지 bytes 리스트 → 같은 순서의 결과 리스트. 읽지 못한 장은 None (그 장만 vision으로)"""
+        results = []
+        for image in images:
+            try:
+                results.append(self.read(image))
+            except Exception:
+                results.append(None)
+        return results
+
+
+def tesseract_lines(raw, lang=TESSERACT_LANG, config=TESSERACT_CONFIG):
+    """(워커 프로세스에서 실행) 이미지 bytes → [(줄 텍스트, 평균 단어 신뢰도 0~100), ...] 위에서 아래 순서"""
+    try:
+        return _tesseract_lines(raw, lang, config)
+    except Exception as e:
+        # pytesseract 예외 중에는 pickle로 되돌릴 수 없는 것이 있어(풀 전체가 깨짐) 문자열로 감싸서 올림
+        raise RuntimeError(f"{type(e).__name__}: {e}") from None
+
+
+def _tesseract_lines(raw, lang, config):
+    import pytesseract
+    from PIL import Image, ImageOps
+
+    img = ImageOps.grayscale(Image.open(io.BytesIO(raw)))
+    if img.width < MIN_OCR_WIDTH:
+        scale = MIN_OCR_WIDTH / img.width
+        img = img.resize((MIN_OCR_WIDTH, round(img.height * scale)), Image.LANCZOS)
+    data = pytesseract.image_to_data(img, lang=lang, config=config, output_type=pytesseract.Output.DICT)
+
+    lines = {}
+    for i, word in enumerate(data["text"]):
+        conf = float(data["conf"][i])
+        if not word.strip() or conf < MIN_WORD_CONFIDENCE:
+            continue
+        key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        lines.setdefault(key, []).append((word, conf))   # dict는 처음 나온 순서(위→아래)를 유지
+    return [(" ".join(w for w, _ in words), sum(c for _, c in words) / len(words)) for words in lines.values()]
+
+
+def titles_from_lines(lines):
+    """OCR 줄 → {"titles", "confidence"}. 신뢰도 = 붙여넣기 파서 신뢰도 × 평균 글자 인식 신뢰도"""
+    if not lines:
+        return {"titles": [], "confidence": 0.0}
+    parsed = parse_pasted_text("\n".join(text for text, _ in lines))
+    ocr_confidence = sum(conf for _, conf in lines) / len(lines) / 100
+    return {"titles": to_title_strings(parsed), "confidence": round(parsed["confidence"] * ocr_confidence, 3)}
+
+
+class TesseractOcrBackend(OcrBackend):
+    name = "tesseract"
+    _available = None
+
+    def __init__(self, lang=TESSERACT_LANG, processes=OCR_PROCESSES):
+        self.lang = lang
+        self.processes = processes
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def available(cls, lang=TESSERACT_LANG):
+        """pytesseract와 tesseract 실행 파일, 언어 데이터가 모두 있는지 (프로세스당 한 번만 확인)"""
+        if cls._available is None:
+            try:
+                import pytesseract
+
+                installed = set(pytesseract.get_languages(config=""))
+                cls._available = all(code in installed for code in lang.split("+"))
+            except Exception:
+                cls._available = False
+        return cls._available
+
+    def pool(self):
+        # Streamlit 서버는 스레드가 많아서 fork 대신 spawn으로 워커를 만듦
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.processes,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def read(self, image):
+        return titles_from_lines(self.pool().submit(tesseract_lines, image, self.lang).result())
+
+    def read_many(self, images):
+        """장마다 따로 제출하고, 실패한 장만 None (한 장이 깨져도 나머지는 로컬 결과를 씀)"""
+        try:
+            pool = self.pool()
+            futures = [pool.submit(tesseract_lines, raw, self.lang) for raw in images]
+        except BrokenProcessPool:
+            self._reset_pool(None)
+            return [None] * len(images)
+        results = []
+        for future in futures:
+            try:
+                results.append(titles_from_lines(future.result()))
+            except BrokenProcessPool:
+                self._reset_pool(pool)
+                results.append(None)
+            except Exception:
+                results.append(None)
+        return results
+
+    def _reset_pool(self, broken):
+        # 워커가 죽었으면 다음 요청 때 새 풀을 만듦 (다른 스레드가 이미 새로 만든 풀은 그대로 둠)
+        with self._lock:
+            if broken is None or self._pool is broken:
+                self._pool = None
+
+
+def make_ocr_backend(name, processes=OCR_PROCESSES):
+    """"tesseract"이고 설치되어 있으면 로컬 백엔드, 그 외에는 None (= 전부 vision)"""
+    if name == "tesseract" and TesseractOcrBackend.available():
+        return TesseractOcrBackend(processes=processes)
+    return None
@@ -0,0 +1,144 @@
+"""
+유튜브 홈/시청 기록 화면 Ctrl+A 붙여넣기 → 제목 추출 (로컬 규칙 기반)
+화면 덤프는 카드마다 [재생 시간] → 제목 → 채널명 → "조회수 … 회 • 3일 전" 순서로 고정되어 있으므로,
+조회수/날짜 줄을 기준점으로 삼아 바로 앞 줄들에서 제목과 채널을 고릅니다.
+"Shorts" 헤더 뒤(다음 재생 시간 줄이 나올 때까지)는 쇼츠 선반이라 제목 → 조회수 순서입니다.
+
+결과에는 제목별 신뢰도와 전체 신뢰도가 들어가며, 전체 신뢰도가 낮으면 호출하는 쪽에서 GPT 정제로 넘깁니다.
+"""
+import re
+
+MIN_CONFIDENCE = 0.6   # 이보다 낮으면 GPT 정제 사용
+MIN_TITLES = 3         # 제목이 이보다 적게 나오면 구조를 잘못 읽었을 가능성이 높음
+
+DURATION_RE = re.compile(r"^\d{1,2}(:\d{2}){1,2}$")
+VIEWS_RE = re.compile(
+    r"^(조회수\s*([\d.,]+\s*[천만억]?\s*회|없음)"
+    r"|[\d.,]+\s*[천만억]?\s*명\s*시청\s*중"
+    r"|[\d.,]+\s*[KMB]?\s*(views?|watching)|no views)$",
+    re.IGNORECASE,
+)
+DATE_RE = re.compile(
+    r"^((스트리밍|최초 공개)\s*(시간)?\s*:?\s*)?\d+\s*(초|분|시간|일|주|개월|달|년)\s*전$"
+    r"|^(streamed\s+|premiered\s+)?\d+\s+(second|minute|hour|day|week|month|year)s?\s+ago$",
+    re.IGNORECASE,
+)
+SEPARATOR_RE = re.compile(r"\s*[•·]\s*")
+SHORTS_HEADERS = {"shorts", "쇼츠", "youtube shorts"}
+# 화면 메뉴/버튼/배지 (정규화 + 소문자 후 정확히 일치할 때만 잡음으로 봄)
+UI_LINES = {
+    "건너뛰기", "탐색 건너뛰기", "검색", "홈", "구독", "내 페이지", "기록", "시청 기록", "재생목록", "내 동영상",
+    "나중에 볼 동영상", "좋아요 표시한 동영상", "오프라인 저장", "오프라인 저장 동영상", "더보기", "간략히", "탐색",
+    "인기 급상승", "음악", "영화", "실시간", "게임", "뉴스", "스포츠", "학습", "패션 및 뷰티", "팟캐스트", "쇼핑",
+    "설정", "신고 기록", "고객센터", "의견 보내기", "정보", "보도자료", "저작권", "문의하기", "크리에이터", "광고",
+    "개발자", "약관", "개인정보처리방침", "정책 및 안전", "youtube 작동 원리", "새로운 기능 테스트", "전체", "믹스",
+    "최근에 업로드된 동영상", "새로운 맞춤 동영상", "시청함", "지금 재생 중", "인증됨", "새 동영상", "새 영상",
+    "4k", "cc", "hd", "live", "실시간 스트리밍 중", "프리미엄", "kr", "youtube", "youtube premium",
+    "youtube music", "youtube kids", "youtube 스튜디오", "youtube tv", "구독 관리", "모두", "맞춤설정", "알림",
+    "home", "subscriptions", "you", "history", "playlists", "your videos", "watch later", "liked videos",
+    "skip navigation", "search", "all", "show more", "show less", "now playing", "verified", "new", "explore",
+    "trending", "music", "gaming", "news", "sports", "mixes", "recently uploaded", "watched", "new to you",
+    "youtube studio", "settings", "help", "send feedback", "•", "·", "…", "...",
+}
+
+# 제목별 신뢰도
+CONF_FULL_CARD = 1.0        # 재생 시간 + 제목 + 채널 + 조회수
+CONF_CARD = 0.85            # 제목 + 채널 + 조회수 (재생 시간 없음: 실시간/최초 공개 등)
+CONF_SHORTS = 0.9           # 쇼츠 선반의 제목 + 조회수
+CONF_LONE_TITLE = 0.6       # 조회수 앞에 줄이 하나뿐 (채널 줄이 빠짐)
+
+
+def classify_line(line):
+    """'duration' | 'meta' | 'shorts' | 'ui' | 'text'"""
+    key = line.lower()
+    if DURATION_RE.match(line):
+        return "duration"
+    if key in SHORTS_HEADERS:
+        return "shorts"
+    if key in UI_LINES or line.startswith("©"):
+        return "ui"
+    parts = [p for p in SEPARATOR_RE.split(line) if p]
+    if parts and all(VIEWS_RE.match(p) or DATE_RE.match(p) for p in parts):
+        return "meta"
+    return "text"
+
+
+def split_inline_meta(line):
+    """'채널명 • 조회수 1.2만회 • 3일 전' 처럼 채널과 조회수가 한 줄에 있으면 채널 부분을 반환"""
+    parts = [p for p in SEPARATOR_RE.split(line) if p]
+    if len(parts) >= 2 and not (VIEWS_RE.match(parts[0]) or DATE_RE.match(parts[0])) \
+            and all(VIEWS_RE.match(p) or DATE_RE.match(p) for p in parts[1:]):
+        return parts[0]
+    return None
+
+
+def parse_pasted_text(text):
+    """
+    반환: {"titles": [{"title", "shorts", "confidence"}, ...], "confidence": 0~1}
+    전체 신뢰도 = 제목 신뢰도 평균 × (0.5 + 0.5 × 제목/채널로 쓰인 텍스트 줄 비율)
+    """
+    # NFKC는 쓰지 않음 ('ㅋㅋ' 같은 호환 자모가 바뀌어 키워드 룰에 안 걸림) — 공백만 정리
+    lines = [" ".join(line.split()) for line in text.splitlines()]
+    lines = [line for line in lines if line]
+
+    titles = []
+    buffer = []             # 마지막 기준점 이후의 텍스트 줄
+    text_lines = used_lines = 0
+    in_shorts = had_duration = False
+
+    def emit(title, shorts, confidence):
+        titles.append({"title": title, "shorts": shorts, "confidence": confidence})
+
+    for line in lines:
+        kind = classify_line(line)
+        if kind == "text":
+            channel = split_inline_meta(line)
+            if channel is None:
+                buffer.append(line)
+                text_lines += 1
+                continue
+            # 채널과 조회수가 한 줄: 바로 앞 텍스트 줄이 제목
+            text_lines += 1
+            used_lines += 1
+            if buffer:
+                emit(buffer[-1], in_shorts, CONF_FULL_CARD if had_duration else CONF_CARD)
+                used_lines += 1
+            buffer, had_duration = [], False
+        elif kind == "meta":
+            if not buffer:
+                continue   # 조회수 다음 줄의 날짜 등
+            if in_shorts:
+                emit(buffer[-1], True, CONF_SHORTS)
+                used_lines += 1
+            elif len(buffer) >= 2:
+                emit(buffer[-2], False, CONF_FULL_CARD if had_duration else CONF_CARD)
+                used_lines += 2
+            else:
+                emit(buffer[-1], False, CONF_LONE_TITLE)
+                used_lines += 1
+            buffer, had_duration = [], False
+        elif kind == "duration":
+            # 재생 시간은 긴 영상 카드의 시작 → 쇼츠 선반이 끝났다는 뜻
+            buffer, had_duration, in_shorts = [], True, False
+        elif kind == "shorts":
+            buffer, had_duration, in_shorts = [], False, True
+
+    if not titles:
+        return {"titles": [], "confidence": 0.0}
+
+    seen = {}
+    for t in titles:
+        seen.setdefault(t["title"], t)   # 중복 제거 (처음 나온 것과 그 순서 유지)
+    titles = list(seen.values())
+    mean_confidence = sum(t["confidence"] for t in titles) / len(titles)
+    coverage = used_lines / text_lines if text_lines else 0.0
+    confidence = mean_confidence * (0.5 + 0.5 * coverage)
+    if len(titles) < MIN_TITLES:
+        confidence = min(confidence, 0.5)
+    return {"titles": titles, "confidence": round(confidence, 3)}
+
+
+def to_title_strings(parsed):
+    """GPT 정제 결과(parse_title_list)와 같은 형식: 쇼츠는 제목 뒤에 'Shorts' (이미 들어 있으면 그대로)"""
+    return [f"{t['title']} Shorts" if t["shorts"] and "shorts" not in t["title"].lower() else t["title"]
+            for t in parsed["titles"]]
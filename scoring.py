@@ -0,0 +1,66 @@
+"""
+영양소 분류 엔진 (numpy 벡터 연산)
+제목 임베딩을 N×D 행렬로 쌓고, 미리 정규화한 4×D 기준 행렬과 한 번의 행렬곱으로 분류합니다.
+"""
+import numpy as np
+
+NUTRIENTS = ["Carbs", "Protein", "Fats", "Vitamins"]
+BLOCK_SIZE = 4096   # 수만 개 제목도 메모리 폭주 없이 나눠서 계산
+KNN_K = 5
+
+
+def normalize_rows(matrix):
+    """행 단위 L2 정규화 (norm이 0인 행은 0으로 유지)"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def prepare_anchor_matrix(labels, matrix):
+    """기준 행렬을 NUTRIENTS 순서로 정렬하고 미리 정규화합니다."""
+    order = [list(labels).index(n) for n in NUTRIENTS]
+    return normalize_rows(np.asarray(matrix)[order])
+
+
+def classify_vectors(vectors, anchor_matrix):
+    """
+    vectors: 제목 벡터 리스트(또는 N×D 행렬), anchor_matrix: 정규화된 4×D 행렬
+    반환: (카테고리 인덱스 배열, 유효 여부 배열) — norm이 0인 벡터는 유효하지 않음
+    """
+    n = len(vectors)
+    best = np.full(n, -1, dtype=np.int64)
+    for start in range(0, n, BLOCK_SIZE):
+        block = np.asarray(vectors[start:start + BLOCK_SIZE], dtype=np.float32)
+        norms = np.linalg.norm(block, axis=1)
+        sims = block @ anchor_matrix.T          # 정규화된 기준 → argmax는 코사인 유사도 기준과 동일
+        best[start:start + len(block)] = np.where(norms > 0, sims.argmax(axis=1), -1)
+    return best, best >= 0
+
+
+def classify_vectors_knn(vectors, exemplar_matrix, exemplar_labels, k=KNN_K):
+    """
+    k-NN 분류: 정규화된 예시 행렬(M×D)에서 가장 가까운 k개의 예시가 유사도 가중치로 투표합니다.
+    반환 형식은 classify_vectors와 같습니다.
+    """
+    n = len(vectors)
+    k = min(k, len(exemplar_labels))
+    best = np.full(n, -1, dtype=np.int64)
+    for start in range(0, n, BLOCK_SIZE):
+        block = np.asarray(vectors[start:start + BLOCK_SIZE], dtype=np.float32)
+        norms = np.linalg.norm(block, axis=1)
+        sims = normalize_rows(block) @ exemplar_matrix.T                    # (B, M)
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]                  # (B, k)
+        rows = np.arange(len(block))[:, None]
+        votes = np.zeros((len(block), len(NUTRIENTS)), dtype=np.float32)
+        np.add.at(votes, (np.broadcast_to(rows, top.shape), exemplar_labels[top]), sims[rows, top])
+        best[start:start + len(block)] = np.where(norms > 0, votes.argmax(axis=1), -1)
+    return best, best >= 0
+
+
+def accumulate(categories, weights):
+    """카테고리 인덱스별 가중치 합 → NUTRIENTS 순서의 배열"""
+    categories = np.asarray(categories, dtype=np.int64)
+    weights = np.asarray(weights, dtype=np.float64)
+    if categories.size == 0:
+        return np.zeros(len(NUTRIENTS))
+    return np.bincount(categories, weights=weights, minlength=len(NUTRIENTS))
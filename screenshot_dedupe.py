@@ -0,0 +1,147 @@
+"""
+스크린샷 중복 제거 / 스크롤 겹침 잘라내기 / 제목 캐시
+- 내용 해시(content_digest, 디코딩한 픽셀의 sha256): 픽셀까지 똑같은 화면을 두 번 올렸는지 판별, 제목 캐시 키
+  (pHash 같은 유사 해시는 레이아웃이 같은 목록 화면끼리 몇 비트 차이밖에 나지 않아서, 제목만 다른 화면을 중복으로 버리거나
+  다른 사용자의 제목을 돌려줄 수 있으므로 쓰지 않음)
+- 줄(row) 해시: 스크롤하며 연속으로 찍은 스크린샷에서 앞 장의 아래쪽과 겹치는 뒤 장의 위쪽을 찾아 잘라냄
+  → 같은 영상 카드를 vision이 두 번 읽지 않음. 새로 보이는 줄이 하나도 없을 때만 그 장을 제외
+- ScreenshotTitleCache: 내용 해시 → 추출한 제목 (프로세스 단위 LRU), 같은 화면은 다시 요청하지 않음
+
+줄 해시는 디코딩 직후(축소/재인코딩 전) 픽셀로 계산합니다. PNG 스크린샷은 겹치는 부분의 픽셀이 완전히 같아서
+정확히 맞고, JPEG처럼 손실 압축된 경우 못 찾으면 그냥 자르지 않습니다.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image
+
+ROW_HASH_WIDTH = 32          # 줄 해시를 계산할 때 가로를 이 폭으로 줄임 (안티앨리어싱 차이 흡수)
+ROW_HASH_SHIFT = 4           # 밝기를 16단계로 양자화
+OVERLAP_BAND_ROWS = 24       # 뒤 장에서 기준으로 삼는 연속된 줄 수
+OVERLAP_MIN_MATCH = 0.9      # 겹친다고 본 구간(움직이지 않는 줄 제외)에서 일치해야 하는 줄 비율
+TITLE_CACHE_MAX_ENTRIES = 2000
+
+
+def content_digest(img):
+    """PIL 이미지 → 디코딩한 RGB 픽셀과 크기의 sha256 (파일 형식/메타데이터가 달라도 픽셀이 같으면 같음)"""
+    rgb = img.convert("RGB")
+    digest = hashlib.sha256(f"{rgb.width}x{rgb.height}".encode())
+    digest.update(rgb.tobytes())
+    return digest.hexdigest()
+
+
+def row_hashes(img):
+    """PIL 이미지 → 줄마다 해시 (가로만 줄이므로 각 줄의 해시는 그 줄 픽셀에만 의존)"""
+    gray = img.convert("L").resize((ROW_HASH_WIDTH, img.height), Image.BOX)
+    rows = np.asarray(gray) >> ROW_HASH_SHIFT
+    return [hash(row.tobytes()) for row in rows]
+
+
+def static_rows(upper, lower):
+    """두 스크린샷에서 같은 위치에 같은 내용인 줄 (상태 표시줄, 고정 헤더, 하단 탭 바처럼 스크롤해도 움직이지 않는 부분)"""
+    return [a == b for a, b in zip(upper, lower)] + [False] * max(0, len(upper) - len(lower), len(lower) - len(upper))
+
+
+def find_vertical_overlap(upper, lower, band=OVERLAP_BAND_ROWS, min_match=OVERLAP_MIN_MATCH):
+    """
+    upper(앞 장)의 아래쪽과 lower(뒤 장)의 위쪽이 겹치는 줄 수 (row_hashes 결과 두 개를 받음). 못 찾으면 0
+    뒤 장 위쪽 절반에서 내용이 있는 줄 묶음을 골라 앞 장에서 같은 위치를 찾고, 그 위치 기준으로 겹치는 구간 전체를 확인합니다.
+    스크롤해도 움직이지 않는 줄(static_rows)은 확인에서 빼므로 상태 표시줄/탭 바를 잘라내지 않은 화면에도 맞습니다.
+    """
+    if len(upper) < band or len(lower) < band:
+        return 0
+    static = static_rows(upper, lower)
+    index = {}
+    for pos in range(len(upper) - band + 1):
+        index.setdefault(tuple(upper[pos:pos + band]), []).append(pos)
+
+    best = 0
+    for start in range(0, len(lower) // 2, band):
+        key = tuple(lower[start:start + band])
+        if len(set(key)) < band // 4:
+            continue   # 여백/단색 구간은 어디에나 맞으므로 기준으로 쓰지 않음
+        for pos in index.get(key, ()):
+            offset = pos - start   # lower의 0번째 줄 = upper의 offset번째 줄
+            if offset <= 0:
+                continue
+            overlap = min(len(upper) - offset, len(lower))
+            if overlap <= best:
+                continue
+            compared = [i for i in range(overlap) if not static[i] and not static[offset + i]]
+            matches = sum(upper[offset + i] == lower[i] for i in compared)
+            if len(compared) >= band and matches >= len(compared) * min_match:
+                best = overlap
+    return best
+
+
+def dedupe_screenshots(images):
+    """
+    업로드 순서의 PIL 이미지 리스트 → (남길 항목 리스트, {"duplicates": 제외한 장 수, "trimmed_rows": 잘라낸 줄 수})
+    항목: {"index": 원래 순서, "image": (겹침을 잘라낸) 이미지}
+    - 앞서 올린 스크린샷과 픽셀까지 같으면(content_digest) 중복으로 제외
+    - 바로 앞에 남긴 스크린샷과 폭이 같고 스크롤로 겹치면 겹치는 위쪽을 잘라냄
+      겹친 구간이 줄 해시까지 모두 같고 새로 보이는 줄이 하나도 없을 때만(앞 장에 완전히 들어 있음) 제외
+    """
+    kept, duplicates, trimmed = [], 0, 0
+    seen = set()
+    previous_rows = None
+    for index, img in enumerate(images):
+        digest = content_digest(img)
+        if digest in seen:
+            duplicates += 1
+            continue
+        seen.add(digest)
+        rows = row_hashes(img)
+        if previous_rows is not None and kept[-1]["image"].width == img.width:
+            overlap = find_vertical_overlap(previous_rows, rows)
+            if overlap:
+                static = static_rows(previous_rows, rows)
+                covered = not any(not static[i] for i in range(overlap, len(rows)))
+                if covered and find_vertical_overlap(previous_rows, rows, min_match=1.0) == overlap:
+                    duplicates += 1
+                    continue
+                img = img.crop((0, overlap, img.width, img.height))
+                rows = rows[overlap:]
+                trimmed += overlap
+        kept.append({"index": index, "image": img})
+        previous_rows = rows
+    return kept, {"duplicates": duplicates, "trimmed_rows": trimmed}
+
+
+class ScreenshotTitleCache:
+    """
+    내용 해시(content_digest) → 스크린샷에서 추출한 제목 리스트 (스레드 안전 LRU)
+    픽셀까지 같은 화면을 다시 올리면(다른 세션이어도) vision/로컬 OCR을 다시 돌리지 않습니다.
+    정확히 같은 키만 찾으므로 비슷한 다른 화면(다른 사용자의 목록 화면 등)의 제목을 돌려주지 않습니다.
+    """
+
+    def __init__(self, max_entries=TITLE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, digest):
+        with self._lock:
+            titles = self._entries.get(digest)
+            if titles is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return list(titles)
+
+    def put(self, digest, titles):
+        if not titles:
+            return   # 빈 결과는 일시적인 실패일 수 있으므로 저장하지 않음
+        with self._lock:
+            self._entries[digest] = list(titles)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,213 @@
+"""
+화면 이미지 정적 파일 배포 (Streamlit static file serving)
+source/의 이미지를 static/assets/ 아래에 내용 해시가 들어간 이름으로 복사하고, 원래 경로 → URL 매니페스트를 만듭니다.
+    source/hero/hero_banner.png → static/assets/hero/hero_banner.3f2a9c0d1e.png → "app/static/assets/hero/hero_banner.3f2a9c0d1e.png"
+
+HTML에는 base64 대신 URL만 들어가므로 화면을 다시 그릴 때 이미지 바이트를 웹소켓으로 보내지 않고,
+브라우저는 같은 URL을 캐시해서 다시 받지 않습니다. 파일 내용이 바뀌면 URL도 바뀝니다.
+Streamlit의 app/static 응답에는 Cache-Control을 직접 붙일 수 없어서 브라우저는 Last-Modified 기준
+휴리스틱 캐시를 씁니다 (그래서 원본 수정 시각을 그대로 유지). 앞단 프록시/CDN이 있으면
+/app/static/assets/* 에 "public, max-age=31536000, immutable"을 붙이면 됩니다.
+
+화면에 작게 표시되는 이미지는 표시 크기(CSS px)의 2배 폭으로 줄인 WebP 변형도 만들고(ASSET_WIDTHS),
+SVG는 좌표 소수점을 줄이고 공백을 정리한 버전을 씁니다. 변형을 만들지 못하면 원본 URL을 그대로 씁니다.
+매니페스트: {원래 상대 경로: {"url": 원본(SVG는 최소화본) URL, "variants": {"표시 폭": WebP URL}}}
+
+필요 설정: .streamlit/config.toml 의 [server] enableStaticServing = true
+빌드: python static_assets.py   (배포/컨테이너 빌드 때 한 번. 이미 있는 해시 파일은 다시 만들지 않음)
+앱은 빌드가 남긴 manifest.json만 읽고(load_manifest) 요청 경로에서 이미지를 다시 인코딩하지 않습니다.
+매니페스트가 없으면 source/ 원본(data URI)으로 표시합니다.
+"""
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import sys
+
+SOURCE_DIR = "source"
+STATIC_DIR = "static"
+ASSET_SUBDIR = "assets"
+URL_PREFIX = "app/static"
+HASH_LENGTH = 10
+ASSET_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg", ".ico")
+MANIFEST_NAME = "manifest.json"
+# 코드에서 표시하는 크기(CSS px). 디렉터리(첫 경로) 또는 파일 경로 기준
+ASSET_WIDTHS = {
+    "characters": (250,),     # STEP 4 진단 캐릭터
+    "steps": (100, 250),      # 단계 헤더 / Introduction 솔루션 카드
+    "badges": (60,),
+    "card": (400,),
+    "hero": (1600,),          # 배너 배경 (전체 폭)
+    "cluster.png": (700,),
+}
+DISPLAY_DPR = 2               # 고해상도 화면용으로 표시 크기의 2배 폭 (원본보다 키우지는 않음)
+WEBP_QUALITY = 82
+SVG_PRECISION = 1             # SVG 좌표 소수점 자리수 (500px 캔버스를 24px로 표시하므로 충분)
+
+
+def content_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(rel_path, digest):
+    stem, ext = os.path.splitext(rel_path)
+    return f"{stem}.{digest}{ext}"
+
+
+def display_widths(rel_path):
+    return ASSET_WIDTHS.get(rel_path) or ASSET_WIDTHS.get(rel_path.split("/", 1)[0], ())
+
+
+def _write_atomic(dst, data):
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, dst)
+
+
+def minify_svg(text, precision=SVG_PRECISION):
+    """XML 선언/주석 제거, 좌표 반올림, 공백 정리. viewBox가 없으면 width/height로 넣어서 작게 표시해도 잘리지 않게 함"""
+    text = re.sub(r"<\?xml[^>]*\?>|<!--.*?-->", "", text, flags=re.S)
+
+    def round_number(match):
+        value = f"{float(match.group()):.{precision}f}".rstrip("0").rstrip(".")
+        return "0" if value in ("", "-0") else value
+
+    text = re.sub(r"-?\d+\.\d+", round_number, text)
+    text = re.sub(r">\s+<", "><", re.sub(r"\s+", " ", text)).strip()
+    if "viewBox" not in text:
+        size = re.search(r'<svg[^>]*?width="(\d+)"[^>]*?height="(\d+)"', text)
+        if size:
+            text = text.replace("<svg", f'<svg viewBox="0 0 {size.group(1)} {size.group(2)}"', 1)
+    return text
+
+
+def webp_variant(src, width):
+    """이미지를 width 폭(원본보다 크면 원본 폭)으로 줄인 WebP bytes와 실제 폭"""
+    from PIL import Image   # 변형이 이미 있으면 앱 시작 때 PIL을 올리지 않음
+    with Image.open(src) as img:
+        img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+        width = min(width, img.width)
+        if width != img.width:
+            img = img.resize((width, max(1, round(img.height * width / img.width))), Image.LANCZOS)
+        buf = io.BytesIO()
+        img.save(buf, "WEBP", quality=WEBP_QUALITY, method=4)
+        return buf.getvalue(), width
+
+
+def _link_or_copy(src, dst):
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    try:
+        os.link(src, tmp)   # 같은 파일 시스템이면 디스크를 더 쓰지 않음
+    except OSError:
+        shutil.copy2(src, tmp)   # 수정 시각 유지 (Last-Modified)
+    os.replace(tmp, dst)   # 여러 워커가 동시에 배포해도 반쯤 쓰인 파일을 서빙하지 않도록
+
+
+def publish_assets(source_dir=SOURCE_DIR, static_dir=STATIC_DIR):
+    """
+    source_dir의 이미지를 static_dir/assets/에 해시 이름으로 배포하고 {원래 상대 경로: URL} 매니페스트를 반환합니다.
+    이미 같은 해시 파일이 있으면 복사하지 않고, 매니페스트에 없는 예전 해시 파일은 지웁니다.
+    """
+    asset_root = os.path.join(static_dir, ASSET_SUBDIR)
+    manifest = {}
+    published = set()
+    for directory, _, files in os.walk(source_dir):
+        for name in sorted(files):
+            if not name.lower().endswith(ASSET_EXTENSIONS):
+                continue
+            src = os.path.join(directory, name)
+            rel_path = os.path.relpath(src, source_dir).replace(os.sep, "/")
+            digest = content_hash(src)
+            target = hashed_name(rel_path, digest)
+            dst = os.path.join(asset_root, *target.split("/"))
+            if not os.path.exists(dst):
+                _link_or_copy(src, dst)
+            published.add(os.path.normpath(dst))
+            entry = {"url": f"{URL_PREFIX}/{ASSET_SUBDIR}/{target}", "variants": {}}
+
+            stem = os.path.splitext(rel_path)[0]
+            try:
+                if rel_path.endswith(".svg"):
+                    target = f"{stem}.{digest}.min.svg"
+                    dst = os.path.join(asset_root, *target.split("/"))
+                    if not os.path.exists(dst):
+                        with open(src, encoding="utf-8") as f:
+                            _write_atomic(dst, minify_svg(f.read()).encode("utf-8"))
+                    entry["url"] = f"{URL_PREFIX}/{ASSET_SUBDIR}/{target}"
+                    published.add(os.path.normpath(dst))
+                for width in display_widths(rel_path):
+                    # 파일 이름에 요청 폭을 넣어서, 이미 만든 변형은 이미지를 열지 않고 건너뜀
+                    target = f"{stem}.{digest}.w{width * DISPLAY_DPR}.webp"
+                    dst = os.path.join(asset_root, *target.split("/"))
+                    if not os.path.exists(dst):
+                        _write_atomic(dst, webp_variant(src, width * DISPLAY_DPR)[0])
+                    entry["variants"][str(width)] = f"{URL_PREFIX}/{ASSET_SUBDIR}/{target}"
+                    published.add(os.path.normpath(dst))
+            except (OSError, ValueError) as e:
+                print(f"asset variant failed ({rel_path}): {e}", file=sys.stderr)   # 원본 URL로 대체
+            manifest[rel_path] = entry
+
+    for directory, _, files in os.walk(asset_root):
+        for name in files:
+            path = os.path.normpath(os.path.join(directory, name))
+            if path not in published and name != MANIFEST_NAME and not name.endswith(".tmp"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass   # 다른 워커가 먼저 지운 경우
+
+    os.makedirs(asset_root, exist_ok=True)
+    manifest_path = os.path.join(asset_root, MANIFEST_NAME)
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+    return manifest
+
+
+def load_manifest(static_dir=STATIC_DIR):
+    """
+    빌드된 매니페스트 → {원래 상대 경로: 항목}. 없거나 읽을 수 없으면 {} (호출하는 쪽에서 원본으로 대체)
+    파일이 지워진 URL은 빼서 깨진 이미지 대신 원본이 보이게 합니다. (변형만 없으면 원본 URL 사용)
+    """
+    try:
+        with open(os.path.join(static_dir, ASSET_SUBDIR, MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    entries = {}
+    for rel_path, entry in manifest.items():
+        if not os.path.exists(url_to_file(entry["url"], static_dir)):
+            continue
+        variants = {w: url for w, url in entry.get("variants", {}).items() if os.path.exists(url_to_file(url, static_dir))}
+        entries[rel_path] = {"url": entry["url"], "variants": variants}
+    return entries
+
+
+def pick_asset_url(entry, width=None):
+    """매니페스트 항목 → 표시 폭(CSS px)에 맞는 URL (표시 폭 이상인 변형 중 가장 작은 것, 없으면 원본)"""
+    if width is None:
+        return entry["url"]
+    fits = sorted(int(w) for w in entry["variants"] if int(w) >= width)
+    return entry["variants"][str(fits[0])] if fits else entry["url"]
+
+
+def url_to_file(url, static_dir=STATIC_DIR):
+    """app/static URL → 로컬 파일 경로 (st.image처럼 경로를 받는 곳용)"""
+    return os.path.join(static_dir, *url[len(URL_PREFIX) + 1:].split("/"))
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else SOURCE_DIR
+    static = sys.argv[2] if len(sys.argv) > 2 else STATIC_DIR
+    manifest = publish_assets(source, static)
+    print(f"{len(manifest)} assets → {os.path.join(static, ASSET_SUBDIR)}")
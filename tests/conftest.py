@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 최상위 모듈(analysis, paste_parser 등)을 패키지 없이 import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+
+import analysis
+
+
+class TruncatingClient:
+    """응답이 항상 길이 제한에 걸려 잘리는 가짜 OpenAI 클라이언트"""
+
+    def __init__(self):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(content="잘린 응답")
+        return SimpleNamespace(choices=[SimpleNamespace(finish_reason="length", message=message)], usage=None)
+
+
+def test_short_shorts_chunk_terminates():
+    chunk = "\n".join(["Shorts", "고양이 점프 실패", "강아지 산책 브이로그", "오늘의 요리", "수면 음악"])
+    client = TruncatingClient()
+
+    titles = analysis.clean_text_chunk(chunk, client)
+
+    assert client.calls < 2 ** (analysis.CLEAN_MAX_SPLIT_DEPTH + 1)
+    assert isinstance(titles, list)
+
+
+def test_depth_limit_returns_raw_lines():
+    chunk = "\n".join(["Shorts", "고양이 점프 실패", "강아지 산책 브이로그"])
+    client = TruncatingClient()
+
+    titles = analysis.clean_text_chunk(chunk, client, depth=analysis.CLEAN_MAX_SPLIT_DEPTH)
+
+    assert client.calls == 1
+    assert titles == ["고양이 점프 실패", "강아지 산책 브이로그"]
+
+
+def test_split_halves_are_strictly_shorter():
+    seen = []
+
+    class RecordingClient(TruncatingClient):
+        def create(self, **kwargs):
+            seen.append(kwargs["messages"][1]["content"].count("\n") + 1)
+            return super().create(**kwargs)
+
+    lines = ["Shorts"] + [f"제목 {i}" for i in range(40)]
+    analysis.clean_text_chunk("\n".join(lines), RecordingClient(), depth=analysis.CLEAN_MAX_SPLIT_DEPTH - 2)
+
+    assert seen[0] == len(lines)
+    assert all(count < len(lines) for count in seen[1:])
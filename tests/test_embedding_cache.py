@@ -0,0 +1,37 @@
+import numpy as np
+
+import embedding_cache
+from embedding_cache import EmbeddingCache
+
+
+def test_memory_entries_expire_after_ttl(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(embedding_cache.time, "time", lambda: now[0])
+    cache = EmbeddingCache(path=None, ttl_seconds=60)
+    cache.put("model", "제목", np.ones(4, dtype=np.float32))
+
+    now[0] += 59
+    assert cache.get("model", "제목") is not None
+
+    now[0] += 2
+    assert cache.get("model", "제목") is None
+    assert cache._lru_bytes == 0
+
+
+def test_stats_are_exact_under_concurrent_sessions(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = EmbeddingCache(path=str(tmp_path / "embeddings.sqlite3"))
+    vec = np.ones(4, dtype=np.float32)
+
+    def session(n):
+        for i in range(50):
+            cache.put("model", f"{n}-{i}", vec)
+            cache.get_many("model", [f"{n}-{i}", f"missing-{n}-{i}"])
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(session, range(8)))
+
+    assert cache.stats["writes"] == 400
+    assert cache.stats["memory_hits"] == 400
+    assert cache.stats["misses"] == 400
@@ -0,0 +1,101 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+import embeddings
+import tracing
+from benchmarks.fake_openai import FakeEmbeddings, FakeOpenAI, fake_vector
+from embedding_cache import EmbeddingCache
+
+
+class ListExporter:
+    def __init__(self):
+        self.records = []
+
+    def export(self, record):
+        self.records.append(record)
+
+
+class FlakyClient:
+    """embeddings.create가 처음 failures번 실패하는 OpenAI 클라이언트 대역"""
+
+    def __init__(self, failures):
+        self.embeddings = self
+        self.failures = failures
+        self.calls = 0
+        self.max_retries = 2
+
+    def with_options(self, max_retries):
+        self.max_retries = max_retries
+        return self
+
+    def create(self, input, model):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("rate limited")
+        data = [SimpleNamespace(index=i, embedding=[1.0, 0.0]) for i in range(len(input))]
+        return SimpleNamespace(data=data, usage=None)
+
+
+def test_batch_span_counts_every_request(monkeypatch):
+    monkeypatch.setattr(embeddings.time, "sleep", lambda seconds: None)
+    client = FlakyClient(failures=2)
+    exporter = ListExporter()
+
+    with tracing.trace("test", exporter, "session"):
+        vectors = embeddings.embed_texts(["제목 하나", "제목 둘"], client)
+
+    batch = next(r for r in exporter.records if r["name"] == "embedding.batch")
+    retries = next(a["value"]["intValue"] for a in batch["attributes"] if a["key"] == "retries")
+    assert len(vectors) == 2
+    assert client.max_retries == 0
+    assert int(retries) == client.calls - 1
+
+
+def test_iter_batches_splits_at_item_and_token_limits():
+    short = [f"제목 {i}" for i in range(embeddings.MAX_BATCH_SIZE * 2 + 10)]
+    assert [len(b) for b in embeddings.iter_batches(short)] == [embeddings.MAX_BATCH_SIZE, embeddings.MAX_BATCH_SIZE, 10]
+
+    long = ["가" * 10_000] * 5   # 1개당 약 15k 토큰 → 50k 한도 안에 3개씩
+    batches = list(embeddings.iter_batches(long))
+    assert [len(b) for b in batches] == [3, 2]
+    assert all(sum(map(embeddings.estimate_tokens, b)) <= embeddings.MAX_BATCH_TOKENS for b in batches)
+    assert [t for b in batches for t in b] == long
+
+
+def test_embed_texts_maps_vectors_by_index():
+    client = FakeOpenAI(dim=8)   # 응답 data를 뒤집어서 돌려줌
+    titles = [f"영상 제목 {i}" for i in range(embeddings.MAX_BATCH_SIZE + 3)]
+
+    vectors = embeddings.embed_texts(titles, client)
+
+    assert client.embeddings.calls == 2
+    for title in titles:
+        np.testing.assert_array_equal(vectors[title], fake_vector(title, 8))
+
+
+class FailingEmbeddings(FakeEmbeddings):
+    """poison 제목이 들어 있는 요청은 항상 실패"""
+
+    def __init__(self, dim, poison):
+        super().__init__(dim)
+        self.poison = poison
+
+    def create(self, input, model, **kwargs):
+        if self.poison in input:
+            raise RuntimeError("server error")
+        return super().create(input, model, **kwargs)
+
+
+def test_failed_batch_drops_only_its_own_titles(monkeypatch):
+    monkeypatch.setattr(embeddings.time, "sleep", lambda seconds: None)
+    titles = [f"영상 제목 {i}" for i in range(embeddings.MAX_BATCH_SIZE * 2)]
+    client = FakeOpenAI(dim=8)
+    client.embeddings = FailingEmbeddings(8, poison=titles[-1])
+    cache = EmbeddingCache(path=None)
+
+    vectors = embeddings.embed_texts(titles, client, cache=cache)
+
+    first = titles[:embeddings.MAX_BATCH_SIZE]
+    assert set(vectors) == set(first)
+    assert set(cache.get_many(embeddings.EMBEDDING_MODEL, titles)) == set(first)   # 실패한 batch는 캐시에도 없음
@@ -0,0 +1,61 @@
+import numpy as np
+
+from anchors import STANDARD_DATA, build_exemplar_artifact, load_exemplar_artifact, load_or_build_exemplars
+from embeddings import HashingEmbeddingBackend
+from scoring import NUTRIENTS, classify_vectors, classify_vectors_knn, normalize_rows
+
+
+def test_exemplar_labels_follow_nutrient_names(tmp_path):
+    backend = HashingEmbeddingBackend()
+    # 키 순서가 NUTRIENTS와 달라도 "Vitamins (비타민)" → NUTRIENTS.index("Vitamins")
+    exemplars = {key: STANDARD_DATA[key] for key in reversed(list(STANDARD_DATA))}
+    build_exemplar_artifact(backend, exemplars=exemplars, directory=str(tmp_path))
+    reference = load_exemplar_artifact(backend.model, exemplars, str(tmp_path))
+
+    expected = [NUTRIENTS.index(key.split()[0]) for key, titles in exemplars.items() for _ in titles]
+    assert reference["labels"].tolist() == expected
+
+    titles = [t for titles in exemplars.values() for t in titles]
+    vectors = backend.embed(titles)
+    for i, nutrient in enumerate(NUTRIENTS):
+        members = vectors[reference["labels"] == i]
+        np.testing.assert_allclose(reference["centroids"][i], normalize_rows(members.mean(axis=0)[None])[0],
+                                   atol=1e-6)
+    # 예시 제목 자신은 자기 영양소로 분류됨 (k=1 최근접 = 자기 자신)
+    categories, valid = classify_vectors_knn(vectors, reference["matrix"], reference["labels"], k=1)
+    assert valid.all() and categories.tolist() == expected
+
+
+def test_load_or_build_reuses_artifact(tmp_path):
+    backend = HashingEmbeddingBackend()
+    first = load_or_build_exemplars(backend, directory=str(tmp_path))
+    second = load_or_build_exemplars(backend, directory=str(tmp_path))
+
+    assert len(list(tmp_path.iterdir())) == 1
+    np.testing.assert_array_equal(first["centroids"], second["centroids"])
+    categories, valid = classify_vectors(backend.embed(["웃음참기 챌린지 실패"]), first["centroids"])
+    assert valid.all()
+
+
+def test_knn_tie_goes_to_first_nutrient():
+    matrix = normalize_rows(np.array([[1.0, 0.0], [1.0, 0.0]]))
+    labels = np.array([2, 1])
+
+    categories, _ = classify_vectors_knn(np.array([[1.0, 0.0]]), matrix, labels, k=2)
+
+    assert categories.tolist() == [1]   # 같은 득표면 NUTRIENTS 앞쪽 (argmax)
+
+
+def test_knn_k_larger_than_class_and_exemplar_count():
+    # Carbs 예시 1개는 아주 가깝고, Protein 예시 3개는 조금 덜 가까움
+    matrix = normalize_rows(np.array([[1.0, 0.0], [0.9, 0.3], [0.9, 0.35], [0.9, 0.4]]))
+    labels = np.array([0, 1, 1, 1])
+    query = np.array([[1.0, 0.1], [0.0, 0.0]])
+
+    nearest, _ = classify_vectors_knn(query, matrix, labels, k=1)
+    voted, valid = classify_vectors_knn(query, matrix, labels, k=3)        # Carbs는 1개뿐 (k > 클래스 크기)
+    all_votes, _ = classify_vectors_knn(query, matrix, labels, k=100)      # k > 예시 수 → 전부 투표
+
+    assert nearest[0] == 0
+    assert voted[0] == 1 and all_votes[0] == 1
+    assert valid.tolist() == [True, False]   # norm 0 벡터는 분류하지 않음
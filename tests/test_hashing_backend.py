@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from anchors import exemplar_path
+from embedding_cache import EmbeddingCache
+from embeddings import EMBEDDING_MODEL, HashingEmbeddingBackend, embed_texts
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TITLES = ["침착맨 레전드 모음", "TED 강연 | Science", "빗소리 10시간"]
+
+
+def test_vectors_are_identical_across_processes():
+    script = ("import sys; from embeddings import HashingEmbeddingBackend; "
+              f"sys.stdout.buffer.write(HashingEmbeddingBackend().embed({TITLES!r}).tobytes())")
+    outputs = []
+    for seed in ("1", "2"):   # hash()를 썼다면 PYTHONHASHSEED마다 달라짐
+        env = {**os.environ, "PYTHONHASHSEED": seed}
+        outputs.append(subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env,
+                                      capture_output=True, check=True).stdout)
+
+    local = HashingEmbeddingBackend().embed(TITLES)
+    assert outputs[0] == outputs[1] == local.tobytes()
+    np.testing.assert_allclose(np.linalg.norm(local, axis=1), 1.0, rtol=1e-6)
+
+
+def test_empty_input():
+    backend = HashingEmbeddingBackend(dim=64)
+
+    assert backend.embed([]).shape == (0, 64)
+    blank = backend.embed(["", "   "])
+    assert blank.shape == (2, 64) and not blank.any()   # 빈 제목은 0벡터 → 분류에서 제외됨
+
+
+def test_model_name_keys_cache_and_artifacts(tmp_path):
+    small, large = HashingEmbeddingBackend(dim=64), HashingEmbeddingBackend(dim=128)
+    cache = EmbeddingCache(path=None)
+
+    embed_texts(TITLES, small, cache=cache)
+
+    assert small.model != large.model != EMBEDDING_MODEL
+    assert set(cache.get_many(small.model, TITLES)) == set(TITLES)
+    assert cache.get_many(large.model, TITLES) == {}   # 차원이 다른 벡터를 섞어 쓰지 않음
+    assert cache.get_many(EMBEDDING_MODEL, TITLES) == {}
+    assert exemplar_path(small.model, directory=str(tmp_path)) != exemplar_path(large.model, directory=str(tmp_path))
@@ -0,0 +1,73 @@
+import pytest
+
+from analysis import apply_keyword_boost
+from benchmarks.bench_keyword_matcher import legacy_keyword_boost, make_titles
+from keywords import KEYWORD_TABLE, get_matcher, keyword_boost_weights, keyword_boosts, keyword_hits
+from scoring import NUTRIENTS
+
+CORPUS = [
+    "침착맨 레전드 ㅋㅋㅋㅋ",                # 'ㅋㅋ'가 겹쳐서 3번
+    "유퀴즈 온 더 블럭 EP.3",                 # 한 키워드가 두 영양소에 있음
+    "TED 강연 | LoFi Piano Playlist",          # 대소문자 섞인 영어
+    "Lo-Fi jazz for study 공부할 때 듣는 노래",
+    "ASMR 빗소리 10시간 백색소음",
+    "세계 여행 VLOG 브이로그 | 영화 리뷰",
+    "AI 개발자가 알려주는 코딩 공부법 (Science)",
+    "먹방 하이라이트 모음 shorts",
+    "오늘의 뉴스 경제 해설",
+    "아무 키워드도 없는 제목",
+] + make_titles(2000, seed=7)
+
+
+def scan_counts(title):
+    """변경 전처럼 키워드마다 제목을 훑되, 겹치는 위치도 모두 셈"""
+    lower = title.lower()
+    counts = []
+    for nutrient in NUTRIENTS:
+        total = 0
+        for keyword in KEYWORD_TABLE[nutrient]:
+            start = lower.find(keyword)
+            while start != -1:
+                total += 1
+                start = lower.find(keyword, start + 1)
+        counts.append(total)
+    return counts
+
+
+def test_automaton_counts_match_substring_scan():
+    for title in CORPUS:
+        counts = get_matcher().count(title)
+
+        assert counts == scan_counts(title), title
+        # 어느 영양소에 적중이 있는지는 기존 any(k in title) 판정과 같음
+        lower = title.lower()
+        assert [c > 0 for c in counts] == [any(k in lower for k in KEYWORD_TABLE[n]) for n in NUTRIENTS], title
+
+
+def test_overlapping_and_shared_keywords():
+    assert keyword_hits("ㅋㅋㅋㅋ")["Carbs"] == 3
+    hits = keyword_hits("유퀴즈")
+    assert hits["Carbs"] == 1 and hits["Protein"] == 1
+    assert keyword_hits("LO-FI Lofi")["Fats"] == 2
+
+
+@pytest.mark.parametrize("is_premium", [False, True])
+def test_single_nutrient_titles_match_legacy_boost(is_premium):
+    for title in CORPUS:
+        if sum(c > 0 for c in get_matcher().count(title)) <= 1:
+            assert apply_keyword_boost(title, is_premium) == legacy_keyword_boost(title, is_premium), title
+
+
+def test_premium_lowers_only_music_boost():
+    assert apply_keyword_boost("잠잘 때 듣는 Piano Playlist", is_premium=False) == ("Fats", 1.5)
+    assert apply_keyword_boost("잠잘 때 듣는 Piano Playlist", is_premium=True) == ("Fats", 0.8)
+    assert apply_keyword_boost("침착맨 레전드", is_premium=True) == ("Carbs", 2.0)
+
+
+@pytest.mark.parametrize("is_premium", [False, True])
+def test_boost_is_split_by_hit_ratio(is_premium):
+    weights = keyword_boost_weights("TED 강연 먹방", is_premium)   # Protein 2번, Carbs 1번
+    boosts = keyword_boosts(is_premium)
+
+    assert weights == pytest.approx([boosts["Carbs"] / 3, boosts["Protein"] * 2 / 3, 0.0, 0.0])
+    assert keyword_boost_weights("아무 키워드도 없는 제목", is_premium) == [0.0] * len(NUTRIENTS)
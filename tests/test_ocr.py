@@ -0,0 +1,16 @@
+from ocr import OcrBackend
+
+
+class FlakyBackend(OcrBackend):
+    name = "flaky"
+
+    def read(self, image):
+        if image == b"broken":
+            raise ValueError("cannot decode")
+        return {"titles": [image.decode()], "confidence": 1.0}
+
+
+def test_read_many_marks_only_failed_image():
+    readings = FlakyBackend().read_many([b"a", b"broken", b"c"])
+
+    assert readings == [{"titles": ["a"], "confidence": 1.0}, None, {"titles": ["c"], "confidence": 1.0}]
@@ -0,0 +1,14 @@
+from paste_parser import parse_pasted_text
+
+
+def test_repeated_title_keeps_first_occurrence_order():
+    text = "\n".join([
+        "12:34", "첫 번째 영상", "채널 A • 조회수 1.2만회 • 3일 전",
+        "8:01", "두 번째 영상", "채널 B • 조회수 3천회 • 1주 전",
+        "12:34", "첫 번째 영상", "채널 A • 조회수 1.2만회 • 3일 전",
+        "5:10", "세 번째 영상", "채널 C • 조회수 50회 • 1시간 전",
+    ])
+
+    titles = [t["title"] for t in parse_pasted_text(text)["titles"]]
+
+    assert titles == ["첫 번째 영상", "두 번째 영상", "세 번째 영상"]
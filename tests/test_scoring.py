@@ -0,0 +1,37 @@
+import numpy as np
+
+from scoring import BLOCK_SIZE, NUTRIENTS, accumulate, classify_vectors, prepare_anchor_matrix
+
+
+def reference_scores(vectors, weights, anchors):
+    """벡터화 전의 제목별 루프 (코사인 유사도 최대인 영양소에 가중치를 더함)"""
+    scores = dict.fromkeys(NUTRIENTS, 0.0)
+    for user_vec, weight in zip(vectors, weights):
+        best_cat, max_sim = None, -1.0
+        norm_u = np.linalg.norm(user_vec)
+        for k, anchor_vec in anchors.items():
+            norm_a = np.linalg.norm(anchor_vec)
+            if norm_u > 0 and norm_a > 0:
+                sim = np.dot(user_vec, anchor_vec) / (norm_u * norm_a)
+                if sim > max_sim:
+                    max_sim, best_cat = sim, k
+        if best_cat:
+            scores[best_cat] += 1.0 * weight
+    return [scores[n] for n in NUTRIENTS]
+
+
+def test_vectorized_totals_match_per_title_loop():
+    rng = np.random.default_rng(0)
+    n = BLOCK_SIZE * 2 + 37   # 블록 경계를 넘도록
+    vectors = rng.standard_normal((n, 16)).astype(np.float32)
+    vectors[::97] = 0          # norm 0 → 어느 영양소에도 넣지 않음
+    weights = np.where(rng.random(n) < 0.3, 0.4, 1.0)   # 쇼츠 디버프
+    labels = ["Fats", "Carbs", "Vitamins", "Protein"]   # 아티팩트 순서가 NUTRIENTS와 달라도
+    raw = rng.standard_normal((4, 16)).astype(np.float32) * rng.uniform(0.5, 3, (4, 1))
+
+    categories, valid = classify_vectors(vectors, prepare_anchor_matrix(labels, raw))
+    totals = accumulate(categories[valid], weights[valid])
+
+    expected = reference_scores(vectors, weights, dict(zip(labels, raw)))
+    np.testing.assert_allclose(totals, expected)
+    assert (~valid).sum() == len(range(0, n, 97))
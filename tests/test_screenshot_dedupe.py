@@ -0,0 +1,74 @@
+import base64
+import io
+
+from PIL import Image, ImageDraw
+
+from screenshot_dedupe import ScreenshotTitleCache, content_digest, dedupe_screenshots
+
+WIDTH, ROW, ROWS = 720, 90, 60
+
+
+def list_page(seed):
+    """레이아웃이 같은 목록 화면 (썸네일 자리 + 제목 두 줄), 제목만 seed마다 다름"""
+    img = Image.new("RGB", (WIDTH, ROW * ROWS), "white")
+    draw = ImageDraw.Draw(img)
+    for i in range(ROWS):
+        top = i * ROW
+        draw.rectangle((20, top + 10, 200, top + 80), fill=(200, 200, 200))
+        draw.text((220, top + 20), f"video {seed}-{i} title", fill="black")
+        draw.text((220, top + 50), f"channel {(seed * 7 + i) % 13} · {i}K views", fill="gray")
+    return img
+
+
+def screen(page, top, height=1600):
+    return page.crop((0, top, WIDTH, top + height))
+
+
+def test_distinct_list_screens_are_all_kept():
+    shots = [screen(list_page(seed), 0) for seed in range(12)]
+
+    kept, report = dedupe_screenshots(shots)
+
+    assert len(kept) == 12
+    assert report["duplicates"] == 0
+
+
+def test_exact_duplicate_and_covered_scroll_are_dropped():
+    page = list_page(1)
+    first, scrolled = screen(page, 0), screen(page, 800)
+
+    covered = screen(page, 1200, 400)   # 첫 장의 아래쪽 400줄과 같음 → 새로 보이는 줄 없음
+
+    kept, report = dedupe_screenshots([first, first.copy(), covered, scrolled])
+
+    assert [item["index"] for item in kept] == [0, 3]
+    assert report["duplicates"] == 2
+    assert kept[1]["image"].height == 800   # 겹친 위쪽 800줄을 잘라냄
+
+
+def test_title_cache_only_matches_exact_content():
+    cache = ScreenshotTitleCache()
+    a, b = screen(list_page(1), 0), screen(list_page(2), 0)
+    cache.put(content_digest(a), ["video 1-0 title"])
+
+    assert cache.get(content_digest(a.copy())) == ["video 1-0 title"]
+    assert cache.get(content_digest(b)) is None
+
+
+def test_grouped_vision_titles_are_not_cached_under_one_screen(monkeypatch):
+    import analysis
+
+    def payload(img):
+        buf = io.BytesIO()
+        img.save(buf, format="PNG")
+        return {"type": "image_url", "image_url": {"url": "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode()}}
+
+    shots = [screen(list_page(seed), 0, 200) for seed in (1, 2, 3)]
+    monkeypatch.setattr(analysis, "ocr_image_group",
+                        lambda group, client: [f"title {len(group)}-{i}" for i in range(len(group))])
+    cache = ScreenshotTitleCache()
+
+    analysis.extract_titles_from_images([payload(img) for img in shots], None, group_size=2, title_cache=cache)
+
+    assert cache.get(content_digest(shots[0])) is None   # 두 장 묶음의 제목 → 캐시하지 않음
+    assert cache.get(content_digest(shots[2])) == ["title 1-0"]   # 한 장 묶음은 그 화면의 제목
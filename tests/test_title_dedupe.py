@@ -0,0 +1,55 @@
+from title_dedupe import MIN_JACCARD, MIN_NEAR_DUP_CHARS, canonical_title, collapse_titles, ngrams
+
+
+def jaccard(a, b):
+    ga, gb = ngrams(canonical_title(a)), ngrams(canonical_title(b))
+    return len(ga & gb) / len(ga | gb)
+
+
+def test_canonical_title_strips_shorts_hashtags_emoji_and_punctuation():
+    assert canonical_title("고양이 영상 🔥 #shorts | Shorts!!") == "고양이 영상"
+    assert canonical_title("ＬｏＦｉ  Playlist #공부") == "lofi playlist"   # NFKC + casefold + 공백 정리
+    assert canonical_title("#shorts") == "#shorts"   # 지우고 나면 빈 제목 → 원래 제목으로 비교
+
+
+def test_exact_variants_merge_and_keep_preferred_representative():
+    titles = ["고양이 영상", "고양이 영상 🔥 #shorts", "고양이 영상!", "강아지 영상"]
+
+    reps, counts = collapse_titles(titles, prefer=lambda t: "shorts" in t.lower())
+
+    assert reps == ["고양이 영상 🔥 #shorts", "강아지 영상"]
+    assert counts == [3, 1]
+
+
+def test_near_duplicates_merge_at_the_jaccard_threshold():
+    a, b = "세상에서 가장 맛있는 라면 끓이는 법", "세상에서 가장 맛있는 라면 끓이는법 ㄷㄷ"
+    similarity = jaccard(a, b)
+    assert MIN_JACCARD <= similarity < 1
+
+    assert collapse_titles([a, b])[1] == [2]
+    assert collapse_titles([a, b], min_similarity=similarity)[1] == [2]
+    assert collapse_titles([a, b], min_similarity=similarity + 0.01)[1] == [1, 1]
+
+
+def test_dissimilar_titles_stay_separate():
+    a, b = "퇴근길에 듣기 좋은 감성 플레이리스트", "퇴근길에 듣기 좋은 잔잔한 플레이리스트"
+    assert jaccard(a, b) < MIN_JACCARD
+
+    assert collapse_titles([a, b])[1] == [1, 1]
+
+
+def test_different_numbers_never_merge():
+    base = "파이썬 기초 강의 변수와 자료형 조건문 반복문 함수까지 한번에 정리"
+    ep1, ep2 = f"{base} ep.1", f"{base} ep.2"
+    assert jaccard(ep1, ep2) >= MIN_JACCARD
+
+    assert collapse_titles([ep1, ep2])[1] == [1, 1]
+    assert collapse_titles([ep1, f"{base}!! ep.1"])[1] == [2]
+
+
+def test_short_titles_merge_only_on_exact_key():
+    a, b = "고양이 모음", "고양이 모음집"
+    assert len(canonical_title(a)) < MIN_NEAR_DUP_CHARS and jaccard(a, b) >= MIN_JACCARD
+
+    assert collapse_titles([a, b])[1] == [1, 1]
+    assert collapse_titles(["먹방 1편", "먹방 1편!"])[1] == [2]
@@ -0,0 +1,21 @@
+import numpy as np
+
+import analysis
+from benchmarks.fake_openai import FakeOpenAI
+from embeddings import OpenAIEmbeddingBackend
+
+
+def test_async_path_embeds_with_the_backend_model(monkeypatch):
+    seen = {}
+
+    def fake_concurrent(texts, make_async_client, model, cache=None, on_progress=None):
+        seen["model"] = model
+        return {}
+
+    monkeypatch.setattr(analysis, "embed_texts_concurrent", fake_concurrent)
+    backend = OpenAIEmbeddingBackend(FakeOpenAI(dim=8), model="text-embedding-3-large")
+
+    analysis.calculate_vector_scores(["아무 키워드도 없는 제목"], backend, anchors=np.eye(4, 8, dtype=np.float32),
+                                     make_async_client=lambda: None)
+
+    assert seen["model"] == "text-embedding-3-large"
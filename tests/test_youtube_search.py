@@ -0,0 +1,118 @@
+import threading
+
+import pytest
+
+import youtube_search
+from youtube_search import SearchCache, get_youtube_client, search_videos
+
+VIDEO = {"title": "빗소리 10시간", "thumbnail": "t", "url": "u", "channel": "c"}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(youtube_search.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def searches(monkeypatch):
+    """_search 대역: 검색어별 결과를 돌려주고 호출을 기록"""
+    calls = []
+    results = {}
+
+    def fake_search(keyword, api_key, base_url, region, language, max_results):
+        calls.append(keyword)
+        return [dict(v) for v in results.get(keyword, [])]
+
+    monkeypatch.setattr(youtube_search, "_search", fake_search)
+    return calls, results
+
+
+def test_results_expire_after_ttl(clock, searches):
+    calls, results = searches
+    results["빗소리"] = [VIDEO]
+    cache = SearchCache(ttl_seconds=60, negative_ttl_seconds=10)
+
+    assert search_videos("빗소리", "key", cache=cache) == [VIDEO]
+    clock[0] += 59
+    assert search_videos(" 빗소리 ", "key", cache=cache) == [VIDEO]   # 정규화된 같은 키
+    clock[0] += 2
+    search_videos("빗소리", "key", cache=cache)
+
+    assert calls == ["빗소리", "빗소리"]
+
+
+def test_empty_results_are_cached_briefly(clock, searches):
+    calls, _ = searches
+    cache = SearchCache(ttl_seconds=60, negative_ttl_seconds=10)
+
+    assert search_videos("없는 검색어", "key", cache=cache) == []
+    clock[0] += 9
+    assert search_videos("없는 검색어", "key", cache=cache) == []
+    clock[0] += 2
+    search_videos("없는 검색어", "key", cache=cache)
+
+    assert len(calls) == 2
+    assert cache.stats["negative_hits"] == 1
+
+
+def test_errors_are_not_cached(monkeypatch):
+    cache = SearchCache()
+    outcomes = iter([RuntimeError("quota"), [VIDEO]])
+
+    def flaky(*args):
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(youtube_search, "_search", flaky)
+    with pytest.raises(RuntimeError):
+        search_videos("빗소리", "key", cache=cache)
+    assert search_videos("빗소리", "key", cache=cache) == [VIDEO]
+
+
+def test_client_is_built_once_per_key_and_url(monkeypatch):
+    import googleapiclient.discovery
+
+    built = []
+    monkeypatch.setattr(googleapiclient.discovery, "build", lambda *args, **kwargs: built.append(kwargs) or object())
+    monkeypatch.setattr(youtube_search, "_clients", {})
+
+    first = get_youtube_client("key-a")
+    assert get_youtube_client("key-a") is first
+    assert get_youtube_client("key-b") is not first
+    assert get_youtube_client("key-a", "http://127.0.0.1:8765") is not first
+
+    assert len(built) == 3
+    assert built[2]["client_options"] == {"api_endpoint": "http://127.0.0.1:8765/"}
+
+
+def test_same_query_waits_for_in_flight_request_only():
+    cache = SearchCache()
+    started, release = threading.Event(), threading.Event()
+    loads = []
+
+    def slow_load():
+        loads.append("slow")
+        started.set()
+        release.wait(5)
+        return [VIDEO]
+
+    results = {}
+    owner = threading.Thread(target=lambda: results.setdefault("owner", cache.fetch("빗소리", slow_load)))
+    waiter = threading.Thread(target=lambda: results.setdefault("waiter", cache.fetch("빗소리", slow_load)))
+    owner.start()
+    started.wait(5)
+    waiter.start()
+
+    # 다른 검색어는 느린 요청이 끝나기를 기다리지 않음
+    assert cache.fetch("다른 검색어", lambda: []) == ([], False)
+
+    release.set()
+    owner.join(5)
+    waiter.join(5)
+    assert loads == ["slow"]
+    assert results["owner"] == ([VIDEO], False)
+    assert results["waiter"] == ([VIDEO], True)
@@ -0,0 +1,107 @@
+"""
+제목 정규화 + 거의 같은 제목 합치기 (임베딩 전)
+같은 영상이 "제목", "제목 Shorts", "제목 🔥 #shorts", OCR 공백 차이 등으로 여러 번 들어오면
+한 번만 임베딩하고, 나온 횟수(multiplicity)는 점수 가중치로 넘겨서 비율이 달라지지 않게 합니다.
+
+- canonical_title: NFKC + 소문자, 해시태그/이모지/'shorts' 표시/문장부호 제거
+- 정규화 결과가 같으면 바로 합치고, 다르면 글자 3-gram MinHash LSH(32개 해시, 4개씩 8밴드)로 후보를 찾은 뒤
+  실제 3-gram Jaccard 유사도가 min_similarity 이상이고 숫자가 모두 같으면 합칩니다. ("1강"/"2강", "10분"/"30분"은 다른 영상)
+  (Jaccard 0.7이면 약 89%, 0.9면 거의 항상 후보가 됨 — 제목 수가 많아도 모든 쌍을 비교하지 않음)
+"""
+import hashlib
+import re
+import unicodedata
+
+import numpy as np
+
+MINHASH_PERMUTATIONS = 32
+MINHASH_BANDS = 8
+MIN_JACCARD = 0.7             # 이 이상이면 같은 영상으로 봄 (3-gram 집합 유사도)
+MIN_NEAR_DUP_CHARS = 8        # 이보다 짧은 제목은 정규화 결과가 완전히 같을 때만 합침 ("1편"/"2편" 오합치기 방지)
+NGRAM = 3
+
+HASHTAG_RE = re.compile(r"#[^\s#]+")
+EMOJI_RE = re.compile(
+    "[\U0001F000-\U0001FAFF\U00002190-\U000021FF\U00002300-\U000027BF\U00002B00-\U00002BFF"
+    "\U0000FE0F\U0000200D\U000020E3]+"
+)
+SHORTS_RE = re.compile(r"\bshorts\b")
+PUNCT_RE = re.compile(r"[^\w\s]|_")
+DIGITS_RE = re.compile(r"\d+")
+
+
+def canonical_title(title):
+    """비교용 키 (표시용 제목은 바꾸지 않음)"""
+    text = unicodedata.normalize("NFKC", title).casefold()
+    text = HASHTAG_RE.sub(" ", text)
+    text = EMOJI_RE.sub(" ", text)
+    text = SHORTS_RE.sub(" ", text)
+    text = PUNCT_RE.sub(" ", text)
+    text = " ".join(text.split())
+    return text or " ".join(unicodedata.normalize("NFKC", title).casefold().split())
+
+
+def ngrams(text, n=NGRAM):
+    text = text.replace(" ", "")
+    if len(text) <= n:
+        return {text}
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240501)   # 프로세스가 달라도 같은 서명이 나오도록 고정
+_PERM_A = _rng.integers(1, _PRIME, MINHASH_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _PRIME, MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+
+def minhash_bands(grams, bands=MINHASH_BANDS):
+    """3-gram 집합 → LSH 밴드 키 리스트 [(밴드 번호, 서명 조각), ...]"""
+    digests = b"".join(hashlib.blake2b(g.encode("utf-8"), digest_size=4).digest() for g in grams)
+    values = np.frombuffer(digests, dtype=np.uint32).astype(np.uint64)
+    signature = ((values[:, None] * _PERM_A + _PERM_B) % _PRIME).min(axis=0)   # a*x < 2^63 이라 넘치지 않음
+    rows = len(signature) // bands
+    return [(i, signature[i * rows:(i + 1) * rows].tobytes()) for i in range(bands)]
+
+
+def collapse_titles(titles, min_similarity=MIN_JACCARD, prefer=None):
+    """
+    제목 리스트(중복 포함, 순서대로) → (대표 제목 리스트, 각 대표가 나온 횟수 리스트)
+    대표는 처음 나온 것이지만, prefer(title)가 True인 변형이 있으면 그중 처음 것을 씁니다. (예: Shorts 표시가 남은 쪽)
+    """
+    groups = []          # [대표 제목, 횟수, 3-gram 집합, 숫자들]
+    by_key = {}          # 정규화 키 → 그룹 번호
+    by_band = {}         # (밴드 번호, 서명 조각) → 그룹 번호 리스트
+
+    for title in titles:
+        title = title.strip()
+        if not title:
+            continue
+        key = canonical_title(title)
+        index = by_key.get(key)
+
+        if index is None and len(key) >= MIN_NEAR_DUP_CHARS:
+            grams = ngrams(key)
+            digits = DIGITS_RE.findall(key)
+            bands = minhash_bands(grams)
+            candidates = dict.fromkeys(i for band in bands for i in by_band.get(band, ()))
+            for candidate in candidates:
+                _, _, other, other_digits = groups[candidate]
+                if other_digits == digits and len(grams & other) / len(grams | other) >= min_similarity:
+                    index = candidate
+                    break
+            if index is None:
+                index = len(groups)
+                groups.append([title, 0, grams, digits])
+                for band in bands:
+                    by_band.setdefault(band, []).append(index)
+        elif index is None:
+            index = len(groups)
+            groups.append([title, 0, set(), None])
+        by_key[key] = index
+
+        group = groups[index]
+        group[1] += 1
+        if prefer is not None and not prefer(group[0]) and prefer(title):
+            group[0] = title
+
+    return [group[0] for group in groups], [group[1] for group in groups]
@@ -0,0 +1,264 @@
+"""
+세션별 파이프라인 추적 (span, OpenTelemetry OTLP/JSON 형식의 JSON lines)
+"분석이 너무 느려요" 문의가 오면 그 세션의 텍스트 정제 / vision OCR / 임베딩 batch / GPT 진단 / YouTube 검색이
+각각 얼마나 걸렸고, 얼마나 보냈고(payload bytes, 제목 수, 토큰), 몇 번 재시도했는지를 파일에서 바로 찾을 수 있게 합니다.
+
+    exporter = JsonlFileExporter(".cache/traces/spans.jsonl")
+    with trace("step3.analyze", exporter, session_id):
+        with span("ocr.vision_group", images=2) as s:
+            ...
+            s.record_usage(response.usage)
+
+- trace()가 루트 span(새 traceId)을 열고, 그 안에서 호출된 span()은 contextvars로 부모를 찾습니다.
+  trace() 밖에서 부른 span()은 아무것도 기록하지 않으므로 분석 모듈은 추적 여부와 상관없이 그대로 쓸 수 있습니다.
+- 스레드 풀에 넘기는 함수는 bind()로 감싸야 부모 span이 이어집니다. (asyncio 태스크는 자동으로 이어짐)
+- 모든 span에 session.id 속성이 붙습니다. (traceId는 분석 실행 1회, session.id는 브라우저 세션)
+- 한 줄 = span 1개를 담은 OTLP ExportTraceServiceRequest. 수집기(collector)가 없어도 파일만으로 보고,
+  나중에 OpenTelemetry Collector의 otlpjsonfile receiver로 그대로 읽어 들일 수 있습니다.
+
+    jq -c '.resourceSpans[].scopeSpans[].spans[] | {name, attributes}' .cache/traces/spans.jsonl
+"""
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import secrets
+import socket
+import threading
+import time
+
+SERVICE_NAME = "youtube-diet"
+SCOPE_NAME = "youtube_diet.tracing"
+DEFAULT_TRACE_PATH = os.path.join(".cache", "traces", "spans.jsonl")
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024   # 넘으면 <파일>.1로 돌리고 새 파일에 씀 (이전 파일은 하나만 유지)
+STATUS_OK = 1                          # OTLP StatusCode
+STATUS_ERROR = 2
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3                   # 외부 API 호출
+
+_current = contextvars.ContextVar("tracing_current_span", default=None)
+
+
+def new_session_id():
+    return secrets.token_hex(16)
+
+
+def _otlp_value(value):
+    """파이썬 값 → OTLP AnyValue (int64는 proto JSON 규칙대로 문자열)"""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(v) for v in value]}}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes):
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+class Span:
+    """구간 하나. set()으로 속성을 넣고 add()로 재시도/토큰 같은 횟수를 누적합니다."""
+
+    def __init__(self, name, trace_id, parent_id, session_id, exporter, kind=SPAN_KIND_INTERNAL, attributes=None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.session_id = session_id
+        self.exporter = exporter
+        self.kind = kind
+        self.attributes = {"session.id": session_id, **(attributes or {})}
+        self.status = {"code": STATUS_OK}
+        self.events = []
+        self._lock = threading.Lock()   # 같은 span에 여러 스레드가 add()할 수 있음
+        self._start_ns = time.time_ns()
+        self._start = time.perf_counter()
+
+    def set(self, key, value):
+        with self._lock:
+            self.attributes[key] = value
+
+    def add(self, key, amount=1):
+        with self._lock:
+            self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def record_usage(self, usage):
+        """OpenAI 응답의 usage → gen_ai.usage.* 토큰 수 (응답에 usage가 없으면 그대로)"""
+        if usage is None:
+            return
+        for key, attr in (("prompt_tokens", "gen_ai.usage.input_tokens"),
+                          ("completion_tokens", "gen_ai.usage.output_tokens")):
+            value = getattr(usage, key, None)
+            if isinstance(value, int):
+                self.add(attr, value)
+
+    def record_exception(self, error):
+        self.status = {"code": STATUS_ERROR, "message": f"{type(error).__name__}: {error}"}
+        self.events.append({
+            "name": "exception",
+            "timeUnixNano": str(time.time_ns()),
+            "attributes": _otlp_attributes({"exception.type": type(error).__name__, "exception.message": str(error)}),
+        })
+
+    def end(self):
+        elapsed = time.perf_counter() - self._start   # 벽시계가 바뀌어도 구간 길이는 단조 시계 기준
+        self.set("duration_ms", round(elapsed * 1000, 3))
+        end_ns = self._start_ns + int(elapsed * 1e9)
+        record = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self._start_ns),
+            "endTimeUnixNano": str(end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": self.status,
+        }
+        if self.parent_id:
+            record["parentSpanId"] = self.parent_id
+        if self.events:
+            record["events"] = self.events
+        try:
+            self.exporter.export(record)
+        except OSError:
+            pass   # 추적 기록 실패로 분석을 멈추지 않음
+
+
+class _NoopSpan:
+    """trace() 밖에서 span()을 부르면 받는 빈 span"""
+
+    def set(self, key, value):
+        pass
+
+    def add(self, key, amount=1):
+        pass
+
+    def record_usage(self, usage):
+        pass
+
+    def record_exception(self, error):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+@contextlib.contextmanager
+def _activate(current):
+    token = _current.set(current)
+    try:
+        yield current
+    except Exception as e:   # st.stop()/st.rerun() 같은 BaseException은 오류로 보지 않음
+        current.record_exception(e)
+        raise
+    finally:
+        _current.reset(token)
+        current.end()
+
+
+@contextlib.contextmanager
+def trace(name, exporter, session_id, **attributes):
+    """새 traceId로 루트 span을 엽니다. exporter가 None이면 아무것도 기록하지 않음"""
+    if exporter is None:
+        yield NOOP_SPAN
+        return
+    with _activate(Span(name, secrets.token_hex(16), None, session_id, exporter, attributes=attributes)) as root:
+        yield root
+
+
+@contextlib.contextmanager
+def span(name, kind=SPAN_KIND_INTERNAL, **attributes):
+    """현재 span의 자식 span (진행 중인 trace가 없으면 NOOP_SPAN)"""
+    parent = _current.get()
+    if parent is None:
+        yield NOOP_SPAN
+        return
+    with _activate(Span(name, parent.trace_id, parent.span_id, parent.session_id, parent.exporter, kind,
+                        attributes)) as child:
+        yield child
+
+
+def current_span():
+    return _current.get() or NOOP_SPAN
+
+
+def bind(fn):
+    """지금의 추적 컨텍스트를 붙잡아 두고 다른 스레드에서 그 안에서 fn을 실행 (ThreadPoolExecutor 용)"""
+    context = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        # 같은 Context는 동시에 두 스레드에서 들어갈 수 없으므로 호출마다 복사본에서 실행
+        return context.copy().run(fn, *args, **kwargs)
+
+    return run
+
+
+class JsonlFileExporter:
+    """
+    span 1개 = OTLP JSON 한 줄로 로컬 파일에 덧붙임 (수집기 없이 동작)
+    줄 단위로 한 번에 append하므로 여러 Streamlit 워커 프로세스가 같은 파일에 써도 줄이 섞이지 않습니다.
+    """
+
+    def __init__(self, path=DEFAULT_TRACE_PATH, max_bytes=DEFAULT_MAX_BYTES, service_name=SERVICE_NAME):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.resource = {"attributes": _otlp_attributes({
+            "service.name": service_name,
+            "host.name": socket.gethostname(),
+            "process.pid": os.getpid(),
+        })}
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, record):
+        line = json.dumps({"resourceSpans": [{
+            "resource": self.resource,
+            "scopeSpans": [{"scope": {"name": SCOPE_NAME}, "spans": [record]}],
+        }]}, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._rotate()
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def _rotate(self):
+        try:
+            if os.path.getsize(self.path) < self.max_bytes:
+                return
+            os.replace(self.path, f"{self.path}.1")
+        except OSError:
+            pass   # 아직 파일이 없거나 다른 프로세스가 먼저 돌린 경우
+
+
+def read_spans(path=DEFAULT_TRACE_PATH, session_id=None):
+    """파일 → span dict 리스트 (속성은 평범한 dict로 풀어서). session_id를 주면 그 세션만 (화면에 보이는 앞 8자리도 됨)"""
+    spans = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            for resource_spans in json.loads(line)["resourceSpans"]:
+                for scope_spans in resource_spans["scopeSpans"]:
+                    for record in scope_spans["spans"]:
+                        attributes = {a["key"]: next(iter(a["value"].values())) for a in record["attributes"]}
+                        if session_id is None or str(attributes.get("session.id", "")).startswith(session_id):
+                            spans.append({**record, "attributes": attributes})
+    return spans
+
+
+if __name__ == "__main__":
+    import sys
+
+    # python tracing.py [세션 ID] [파일] → 세션(없으면 전체)의 span을 시간순으로 출력
+    session = sys.argv[1] if len(sys.argv) > 1 else None
+    path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_TRACE_PATH
+    for s in sorted(read_spans(path, session), key=lambda s: int(s["startTimeUnixNano"])):
+        attributes = s["attributes"]
+        extra = " ".join(f"{k}={v}" for k, v in attributes.items() if k not in ("session.id", "duration_ms"))
+        status = " ERROR " + s["status"].get("message", "") if s["status"]["code"] == STATUS_ERROR else ""
+        print(f"{s['traceId'][:8]} {s['name']:<28} {float(attributes.get('duration_ms', 0)):>9.1f} ms  {extra}{status}")
@@ -0,0 +1,169 @@
+"""
+YouTube 검색 (클라이언트 재사용 + 결과 TTL 캐시)
+- build('youtube', 'v3')는 디스커버리 문서를 파싱하므로 (API 키, 주소)별로 프로세스당 한 번만 만듭니다.
+  httplib2 연결은 스레드 간 공유가 안전하지 않아서, 요청은 스레드(세션)별 Http 객체로 보냅니다.
+- search.list는 호출당 할당량 100을 쓰고 처방 검색어는 같은 진단끼리 자주 겹치므로,
+  (정규화 검색어, 지역, 언어)를 키로 결과를 캐시합니다. 빈 결과도 짧게 캐시(negative caching)하고, 예외는 캐시하지 않습니다.
+- 같은 검색어가 동시에 들어오면 한 세션만 요청하고 나머지는 그 요청(in-flight Future)을 기다립니다.
+  잠금은 캐시 조회/등록 동안만 잡으므로 다른 검색어끼리는 서로 기다리지 않습니다.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from embedding_cache import normalize_title
+import tracing
+
+SEARCH_TTL_SECONDS = 6 * 3600        # 검색 결과 유지 시간
+NEGATIVE_TTL_SECONDS = 10 * 60       # 빈 결과 유지 시간
+MAX_CACHED_QUERIES = 2000
+SEARCH_RETRIES = 2                   # 429/5xx는 백오프 후 재시도
+
+
+def normalize_query(query):
+    """캐시 키용 검색어 정규화 (NFKC + 공백 정리 + 소문자)"""
+    return normalize_title(query).lower()
+
+
+class SearchCache:
+    """(검색어, 지역, 언어) → 영상 리스트. 프로세스 내 LRU + 항목별 만료 시각"""
+
+    def __init__(self, ttl_seconds=SEARCH_TTL_SECONDS, negative_ttl_seconds=NEGATIVE_TTL_SECONDS,
+                 max_entries=MAX_CACHED_QUERIES):
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (만료 시각, 영상 리스트)
+        self._inflight = {}             # key -> 지금 요청 중인 Future
+        self.stats = {"hits": 0, "negative_hits": 0, "misses": 0, "waits": 0}
+
+    def get(self, key):
+        """캐시에 있으면 영상 리스트(빈 리스트일 수 있음), 없거나 만료됐으면 None"""
+        with self._lock:
+            return self._get(key)
+
+    def _get(self, key):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits" if entry[1] else "negative_hits"] += 1
+        return [dict(v) for v in entry[1]]   # 호출한 쪽이 고쳐도 캐시는 그대로
+
+    def fetch(self, key, load):
+        """
+        (영상 리스트, 캐시 적중 여부). 없으면 load()로 채움
+        같은 키를 요청 중인 세션이 있으면 그 결과를 기다리고, 요청이 실패하면 기다리던 쪽도 같은 예외를 받습니다.
+        """
+        with self._lock:
+            videos = self._get(key)
+            if videos is not None:
+                return videos, True
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+            else:
+                self.stats["waits"] += 1
+        if not owner:
+            return [dict(v) for v in future.result()], True
+        try:
+            videos = load()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        self.put(key, videos)
+        with self._lock:
+            del self._inflight[key]
+        future.set_result([dict(v) for v in videos])
+        return videos, False
+
+    def put(self, key, videos):
+        ttl = self.ttl_seconds if videos else self.negative_ttl_seconds
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, [dict(v) for v in videos])
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_default_cache = SearchCache()
+_clients = {}
+_clients_lock = threading.Lock()
+_thread_local = threading.local()
+
+
+def get_youtube_client(api_key, base_url=None):
+    """(API 키, 주소)별로 프로세스당 한 번만 build"""
+    key = (api_key, base_url)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            from googleapiclient.discovery import build
+
+            client_options = {"api_endpoint": f"{base_url.rstrip('/')}/"} if base_url else None
+            client = build('youtube', 'v3', developerKey=api_key, client_options=client_options,
+                           cache_discovery=False)
+            _clients[key] = client
+        return client
+
+
+def _thread_http():
+    http = getattr(_thread_local, "http", None)
+    if http is None:
+        import httplib2
+
+        http = _thread_local.http = httplib2.Http(timeout=30)
+    return http
+
+
+def search_videos(keyword, api_key, base_url=None, region='KR', language='ko', max_results=3, cache=_default_cache):
+    """
+    YouTube 검색 (실패 시 예외를 그대로 올림 — 화면 표시는 호출하는 쪽에서)
+    base_url(없으면 YOUTUBE_BASE_URL 환경변수)을 주면 그 서버로 요청합니다. (로컬 대역 서버 등)
+    cache=None이면 캐시 없이 매번 요청합니다.
+    """
+    if not keyword or not keyword.strip():
+        return []
+    base_url = base_url or os.environ.get("YOUTUBE_BASE_URL")
+    # 재시도(429/5xx)는 googleapiclient 안에서 일어나서 횟수는 남기지 않고 최대 횟수만 기록
+    with tracing.span("youtube.search", tracing.SPAN_KIND_CLIENT, query=keyword, region=region,
+                      max_retries=SEARCH_RETRIES) as span:
+        if cache is None:
+            videos = _search(keyword, api_key, base_url, region, language, max_results)
+        else:
+            cache_key = (normalize_query(keyword), region, language, max_results, base_url)
+            videos, hit = cache.fetch(cache_key, lambda: _search(keyword, api_key, base_url, region, language,
+                                                                 max_results))
+            span.set("cache_hit", hit)
+        span.set("results", len(videos))
+        return videos
+
+
+def _search(keyword, api_key, base_url, region, language, max_results):
+    youtube = get_youtube_client(api_key, base_url)
+    request = youtube.search().list(q=keyword, part='snippet', maxResults=max_results, type='video',
+                                    regionCode=region, relevanceLanguage=language)
+    search_response = request.execute(http=_thread_http(), num_retries=SEARCH_RETRIES)
+    videos = []
+    for item in search_response.get('items', []):
+        if 'id' in item and 'videoId' in item['id']:
+            videos.append({
+                'title': item['snippet']['title'],
+                'thumbnail': item['snippet']['thumbnails']['high']['url'],
+                'url': f"https://www.youtube.com/watch?v={item['id']['videoId']}",
+                'channel': item['snippet']['channelTitle']
+            })
+    return videos